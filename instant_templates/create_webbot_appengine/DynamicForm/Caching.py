@@ -0,0 +1,333 @@
+'''
+    Caching.py
+
+    Defines cache policies that allow the rendered output of page controls to be shared across requests,
+    along with the backends (in-process or memcached) used to store them
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+import hashlib
+import math
+import socket
+import threading
+import time
+from zlib import crc32
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+from WebElements.MultiplePythonSupport import *
+from WebElements.Resources import ScriptContainer
+from WebElements.StringUtils import interpretAsString
+
+
+class LocalCache(object):
+    """
+        An in-process least recently used cache - shared by every request handled by the running process
+    """
+    def __init__(self, maxSize=1024):
+        self.maxSize = maxSize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+            Returns the value stored under key or None if it is not present or has expired
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+
+            expires, value = entry
+            if expires and expires <= time.time():
+                return None
+
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, value, ttl=0):
+        """
+            Stores value under key for ttl seconds (forever if ttl is 0)
+        """
+        with self._lock:
+            self.__store(key, value, ttl)
+        return True
+
+    def add(self, key, value, ttl=0):
+        """
+            Stores value under key only if a value is not already present - returning True if it was stored
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (not entry[0] or entry[0] > time.time()):
+                return False
+
+            self.__store(key, value, ttl)
+        return True
+
+    def delete(self, key):
+        """
+            Removes the value stored under key
+        """
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """
+            Removes all stored values
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __store(self, key, value, ttl):
+        self._entries.pop(key, None)
+        self._entries[key] = (ttl and time.time() + ttl or 0, value)
+        while len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+
+
+class MemcachedCache(object):
+    """
+        A minimal memcached (text protocol) client - allowing cached output to be shared across processes and
+        machines. Keys are distributed across the given servers ("host:port" strings) and values are pickled.
+        Failing to reach a server is treated the same as a cache miss.
+    """
+    PICKLED = 1
+
+    def __init__(self, servers=('127.0.0.1:11211', ), timeout=1.0, prefix=''):
+        self.servers = []
+        for server in servers:
+            host, port = server.rsplit(':', 1)
+            self.servers.append((host, int(port)))
+        self.timeout = timeout
+        self.prefix = prefix
+        self._connections = threading.local()
+
+    def get(self, key):
+        """
+            Returns the value stored under key or None if it is not present
+        """
+        key = self.__key(key)
+        response = self.__command(key, "get " + key)
+        if not response:
+            return None
+
+        server, stream, line = response
+        try:
+            if line.startswith(b"VALUE "):
+                flags, size = line.split()[2:4]
+                data = stream.read(int(size) + 2)[:-2]
+                line = stream.readline()
+                if int(flags) & self.PICKLED:
+                    return pickle.loads(data)
+                return data
+        except (socket.error, IOError, ValueError):
+            self.__disconnect(server)
+
+        return None
+
+    def set(self, key, value, ttl=0):
+        """
+            Stores value under key for ttl seconds (forever if ttl is 0)
+        """
+        return self.__store("set", key, value, ttl)
+
+    def add(self, key, value, ttl=0):
+        """
+            Stores value under key only if a value is not already present - returning True if it was stored
+        """
+        return self.__store("add", key, value, ttl)
+
+    def delete(self, key):
+        """
+            Removes the value stored under key
+        """
+        key = self.__key(key)
+        response = self.__command(key, "delete " + key)
+        return bool(response) and response[2].startswith(b"DELETED")
+
+    def __store(self, command, key, value, ttl):
+        key = self.__key(key)
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        command = "%s %s %d %d %d" % (command, key, self.PICKLED, int(math.ceil(ttl)), len(data))
+        response = self.__command(key, command, data)
+        return bool(response) and response[2].startswith(b"STORED")
+
+    def __key(self, key):
+        return self.prefix + key
+
+    def __command(self, key, command, data=None):
+        """
+            Sends a command to the server responsible for key, returning the server, the response stream and the
+            first line of the response (or None if the server could not be reached)
+        """
+        server = self.servers[(crc32(key.encode('utf8')) & 0xffffffff) % len(self.servers)]
+        for attempt in (0, 1):
+            connection = self.__connect(server)
+            if connection is None:
+                return None
+
+            sock, stream = connection
+            try:
+                message = command.encode('utf8') + b"\r\n"
+                if data is not None:
+                    message += data + b"\r\n"
+                sock.sendall(message)
+                line = stream.readline()
+                if line:
+                    return (server, stream, line)
+            except (socket.error, IOError):
+                pass
+
+            self.__disconnect(server)
+
+        return None
+
+    def __connect(self, server):
+        connections = self._connections.__dict__
+        connection = connections.get(server)
+        if connection is None:
+            try:
+                sock = socket.create_connection(server, self.timeout)
+            except (socket.error, IOError):
+                return None
+
+            connection = connections[server] = (sock, sock.makefile('rb'))
+
+        return connection
+
+    def __disconnect(self, server):
+        connection = self._connections.__dict__.pop(server, None)
+        if connection is not None:
+            try:
+                connection[1].close()
+                connection[0].close()
+            except (socket.error, IOError):
+                pass
+
+
+defaultBackend = LocalCache()
+
+
+class CachePolicy(object):
+    """
+        Defines how the output of a page control is cached across requests, set as the cachePolicy of the control:
+            varyOn - request fields whose values change the rendered output
+            varyOnUser - if True each user gets their own cached copy
+            ttl - the number of seconds the cached output is considered fresh
+            staleWhileRevalidate - the number of seconds after expiring that stale output is still served while a
+                                   single request renders a fresh copy
+            backend - where the output is stored (defaults to an in-process LRU cache shared by all policies)
+            methods - the request methods that can be answered from the cache
+    """
+    def __init__(self, varyOn=(), varyOnUser=False, ttl=300, staleWhileRevalidate=0, backend=None,
+                 methods=('GET', ), revalidationTimeout=30):
+        self.varyOn = tuple(varyOn)
+        self.varyOnUser = varyOnUser
+        self.ttl = ttl
+        self.staleWhileRevalidate = staleWhileRevalidate
+        self.backend = backend or defaultBackend
+        self.methods = methods
+        self.revalidationTimeout = revalidationTimeout
+
+    def caches(self, request):
+        """
+            Returns True if the response to request can be cached
+        """
+        return request.method in self.methods
+
+    def user(self, request):
+        """
+            Returns a unique identifier for the user making the request
+        """
+        user = request.user
+        if not user:
+            return ''
+
+        userId = getattr(user, 'pk', None) or getattr(user, 'user_id', None)
+        if callable(userId):
+            userId = userId()
+        return unicode(userId or user)
+
+    def key(self, control, request):
+        """
+            Returns the key the output of control is stored under for the given request
+        """
+        key = [control.__class__.__module__, control.__class__.__name__, control.fullId(), request.method]
+        key.extend(interpretAsString(request.fields.get(field)) for field in self.varyOn)
+        if self.varyOnUser:
+            key.append(self.user(request))
+
+        return hashlib.md5(u("\x00").join(key).encode('utf8')).hexdigest()
+
+    def render(self, control, request, renderResponse):
+        """
+            Returns the cached output of control if available, otherwise rendering it using renderResponse and
+            storing the result
+        """
+        key = self.key(control, request)
+        entry = self.backend.get(key)
+        if entry is not None:
+            freshUntil, html, scripts, usedObjects = entry
+            if (time.time() < freshUntil or
+                not self.backend.add(key + ":revalidating", True, self.revalidationTimeout)):
+                return self.replay(request, html, scripts, usedObjects)
+
+        html, scripts, usedObjects = self.capture(request, renderResponse)
+        self.backend.set(key, (time.time() + self.ttl, html, scripts, usedObjects),
+                         self.ttl + self.staleWhileRevalidate)
+        if entry is not None:
+            self.backend.delete(key + ":revalidating")
+
+        return self.replay(request, html, scripts, usedObjects)
+
+    def capture(self, request, renderResponse):
+        """
+            Renders the response collecting the scripts it adds separately from the rest of the request
+        """
+        scripts = request.response.scripts
+        capturedScripts = request.response.scripts = ScriptContainer()
+        try:
+            html = renderResponse(request)
+        finally:
+            request.response.scripts = scripts
+
+        return (html, [interpretAsString(script) for script in capturedScripts.scripts()],
+                list(capturedScripts.usedObjects))
+
+    def replay(self, request, html, scripts, usedObjects):
+        """
+            Adds the scripts of cached output to the request - returning the html
+        """
+        createContainer = not request.response.scripts
+        if createContainer:
+            request.response.scripts = ScriptContainer()
+
+        scriptContainer = request.response.scripts
+        for script in scripts:
+            scriptContainer.addScript(script)
+        for objectType in usedObjects:
+            scriptContainer.addJSFunctions(objectType)
+
+        if createContainer:
+            return html + scriptContainer.toHTML(request=request)
+
+        return html
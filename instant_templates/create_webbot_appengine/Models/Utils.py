@@ -1,19 +1,214 @@
+from heapq import heapify, heappop, heapreplace
+
 from WebElements.IteratorUtils import IterableCollectionList
+from WebElements.MultiplePythonSupport import *
+from WebElements.PositionController import PageSource
+
+
+class Descending(object):
+    """
+        Wraps a sort key so that it sorts in reverse
+    """
+    __slots__ = ('value', )
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
 
 class QueryJoin(IterableCollectionList):
     """
         Enables joining two AppEngine queries (with the implied performance penalty)
+
+        If mergeOn is given (a property name or a function returning the sort key of an item) every query is
+        expected to already be sorted by it, and the queries are lazily merged so that items are returned in that
+        order across the whole join. Ordering a join orders each query and merges on the same property.
     """
-    __slots__ = ()
+    __slots__ = ('mergeOn', 'reverse')
 
-    def __init__(self, queries=()):
+    def __init__(self, queries=(), mergeOn=None, reverse=False):
         IterableCollectionList.__init__(self)
+        self.mergeOn = mergeOn
+        self.reverse = reverse
         for query in queries:
             self.extend(query)
 
     def search(self, term):
-        return self.__class__((iterable.search(term) for iterable in self.iterableItems))
+        return self.__class__((iterable.search(term) for iterable in self.iterableItems), self.mergeOn,
+                              self.reverse)
 
     def filter(self, *args, **kwargs):
-        return self.__class__((iterable.filter(*kargs, **kwargs) for iterable in self.iterableItems))
+        return self.__class__((iterable.filter(*args, **kwargs) for iterable in self.iterableItems), self.mergeOn,
+                              self.reverse)
+
+    def order(self, by):
+        """
+            Orders every query by the given property (prefixed with '-' for descending order) and merges them on it
+        """
+        IterableCollectionList.order(self, by)
+        self.reverse = by.startswith('-')
+        self.mergeOn = by.lstrip('-')
+
+    def sortKey(self):
+        """
+            Returns a function that returns the key an item is merged on
+        """
+        mergeOn = self.mergeOn
+        if callable(mergeOn):
+            key = mergeOn
+        else:
+            key = lambda item: getattr(item, mergeOn)
+
+        if self.reverse:
+            return lambda item: Descending(key(item))
+        return key
+
+    def merge(self, sources):
+        """
+            Lazily merges the given (already sorted) iterables yielding (sourceIndex, item) pairs - only requesting
+            the next item of a source once its previous item has been yielded. Items with equal keys keep the order
+            of their sources.
+        """
+        key = self.sortKey()
+        iterators = [iter(source) for source in sources]
+        heap = []
+        for sourceIndex, iterator in enumerate(iterators):
+            for item in iterator:
+                heap.append((key(item), sourceIndex, item))
+                break
+        heapify(heap)
+
+        while heap:
+            sortKey, sourceIndex, item = heap[0]
+            yield (sourceIndex, item)
+            for nextItem in iterators[sourceIndex]:
+                heapreplace(heap, (key(nextItem), sourceIndex, nextItem))
+                break
+            else:
+                heappop(heap)
+
+    def __iter__(self):
+        if not self.mergeOn:
+            return IterableCollectionList.__iter__(self)
+
+        return (item for sourceIndex, item in self.merge(self.iterableItems))
+
+    def iterRange(self, start=0, end=None):
+        """
+            Iterates through the items from start up to (but not including) end - when merging no more than end
+            items are requested from each query
+        """
+        if not self.mergeOn:
+            for item in IterableCollectionList.iterRange(self, start, end):
+                yield item
+            return
+
+        if end is None:
+            end = len(self)
+        start = max(start, 0)
+        if start >= end:
+            return
+
+        sources = [iterable[0:end] for iterable in self.iterableItems]
+        for position, (sourceIndex, item) in enumerate(self.merge(sources)):
+            if position >= end:
+                break
+            if position >= start:
+                yield item
+
+    def __getitem__(self, index):
+        if not self.mergeOn or type(index) == slice:
+            return IterableCollectionList.__getitem__(self, index)
+
+        for item in self.iterRange(index, index + 1):
+            return item
+        raise IndexError(index)
+
+    def pageSource(self):
+        """
+            Returns a PageSource that pages through the join - for use with a PositionController or ItemPager
+        """
+        return QueryJoinPageSource(self)
+
+
+class QueryJoinPageSource(PageSource):
+    """
+        Pages through a QueryJoin. When the join is merged the cursor records how many items of each query have been
+        returned, so that retrieving the next page of N items requests at most N items from each query.
+    """
+    def page(self, offset, limit, cursor=None):
+        join = self.items
+        if not join.mergeOn:
+            return PageSource.page(self, offset, limit, cursor)
+
+        queries = join.iterableItems
+        positions = cursor and [int(position) for position in cursor.split('-')] or ()
+        if len(positions) == len(queries):
+            skip = 0
+        else:
+            positions = [0] * len(queries)
+            skip = offset
+
+        fetch = skip + limit
+        sources = [list(query[position:position + fetch]) for position, query in zip(positions, queries)]
+        used = [0] * len(queries)
+        items = []
+        if limit:
+            for sourceIndex, item in join.merge(sources):
+                used[sourceIndex] += 1
+                if skip:
+                    skip -= 1
+                    continue
+
+                items.append(item)
+                if len(items) >= limit:
+                    break
+
+        nextCursor = "-".join(unicode(position + count) for position, count in zip(positions, used))
+        if any(count < len(source) for count, source in zip(used, sources)):
+            areMore = True
+        elif any(len(source) >= fetch for source in sources):
+            areMore = None
+        else:
+            areMore = False
+
+        return (items, nextCursor, areMore)
+
+    def count(self):
+        """
+            Returns the combined length of the joined queries
+        """
+        return (len(self.items), True)
+
+
+class QueryPageSource(PageSource):
+    """
+        Pages through an AppEngine query using datastore cursors - only fetching the items of the current page and
+        counting no further than countLimit results
+    """
+    def __init__(self, query, countLimit=1000):
+        PageSource.__init__(self, query)
+        self.countLimit = countLimit
+
+    def page(self, offset, limit, cursor=None):
+        query = self.items
+        if cursor:
+            items = query.fetch(limit, start_cursor=cursor) # leaves the query itself starting at the first result
+        else:
+            items = query.fetch(limit, offset)
+        if len(items) < limit:
+            return (items, None, False)
+
+        return (items, query.cursor(), None)
+
+    def count(self):
+        length = self.items.count(self.countLimit + 1)
+        if length > self.countLimit:
+            return (self.countLimit, False)
 
+        return (length, True)
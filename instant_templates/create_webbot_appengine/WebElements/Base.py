@@ -22,6 +22,7 @@
 
 import re
 import cgi
+import copy
 from types import FunctionType
 
 from . import ClientSide, DictUtils, ToClientSide
@@ -36,6 +37,7 @@ from itertools import chain
 class Settings(object):
     STATIC_URL = ""
     INDENTATION = " "
+    STREAM_CHUNK_SIZE = 16384
     BLOCK_TAGS = ('address', 'blockquote', 'center', 'dir', 'div', 'dl', 'fieldset', 'form', 'h1',
                 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'isindex', 'menu', 'noframes', 'noscript', 'ol',
                 'p', 'pre', 'table', 'ul', 'dd', 'dt', 'frameset', 'li', 'tbody', 'td', 'tfoot', 'th',
@@ -83,18 +85,641 @@ class AutoAddScripts(type):
 
 AutoAddScripts = AutoAddScripts('AutoAddScripts', (object, ), {})
 
+RENDER = 0
+CLOSE = 1
+WRITE = 2
+
+_inheritedMethods = {}
+
+def inheritsMethod(element, methodName):
+    """
+        Returns True if the element uses the base WebElement implementation of methodName (as opposed to overriding it)
+    """
+    inherited = _inheritedMethods.get((element.__class__, methodName))
+    if inherited is None:
+        inherited = classInheritsMethod(element.__class__, methodName)
+
+    return inherited
+
+
+def classInheritsMethod(elementClass, methodName):
+    """
+        Returns True if instances of elementClass use the base WebElement implementation of methodName
+    """
+    key = (elementClass, methodName)
+    inherited = _inheritedMethods.get(key)
+    if inherited is None:
+        method = getattr(elementClass, methodName, None)
+        inherited = getattr(method, '__func__', method) is WebElement.__dict__[methodName]
+        _inheritedMethods[key] = inherited
+
+    return inherited
+
+
+def bindsOwnValue(method):
+    """
+        Marks an insertVariables or exportVariables implementation that only binds the element's own value (using
+        _insertValue or _exportValue) on top of binding its children - allowing it to be skipped in favour of a
+        single pass over the whole tree
+    """
+    method.bindsOwnValue = True
+    return method
+
+
+_variableBindings = {}
+
+def variableBinding(element, methodName):
+    """
+        Returns how an element takes part in binding variables using methodName (insertVariables / exportVariables):
+            None - it uses the base WebElement implementation, so only its children are bound
+            True - it binds its own value (as marked by bindsOwnValue) along with its children
+            False - it overrides the method, which has to be called to bind it and all of its children
+    """
+    key = (element.__class__, methodName)
+    binding = _variableBindings.get(key, MISSING)
+    if binding is MISSING:
+        method = getattr(element.__class__, methodName)
+        method = getattr(method, '__func__', method)
+        if method is WebElement.__dict__[methodName]:
+            binding = None
+        else:
+            binding = getattr(method, 'bindsOwnValue', False)
+        _variableBindings[key] = binding
+
+    return binding
+
+
+def toBool(value):
+    """
+        Coerces the string form of a boolean property ('True' / 'False') to a bool - leaving other values as is
+    """
+    if type(value) in (str, unicode):
+        lowerCaseValue = value.lower()
+        if lowerCaseValue == "true":
+            return True
+        elif lowerCaseValue == "false":
+            return False
+
+    return value
+
+
+def toInt(value):
+    """
+        Coerces the string form of an integer property to an int - leaving other values (such as '100%') as is
+    """
+    if type(value) in (str, unicode):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+
+    return value
+
+
+PROPERTY_TYPES = {'bool':toBool, 'int':toInt}
+
+def propertySetter(propertyName, propertyDict):
+    """
+        Returns a setter(element, value) function that applies a single property as defined by its property dict -
+        resolving the action, target attribute path, and type coercion up front
+    """
+    propertyActions = propertyDict['action'].split('.')
+    propertyAction = propertyActions.pop(-1)
+    attributeName = propertyDict.get('name', propertyName)
+    coerce = PROPERTY_TYPES.get(propertyDict.get('type'))
+
+    if propertyAction == "classAttribute":
+        def setProperty(objectWithProperty, value):
+            objectWithProperty.__setattr__(attributeName, value)
+    elif propertyAction == "attribute":
+        def setProperty(objectWithProperty, value):
+            objectWithProperty.attributes[attributeName] = value
+    elif propertyAction == "javascriptEvent":
+        def setProperty(objectWithProperty, value):
+            objectWithProperty.addJavascriptEvent(attributeName, value)
+    elif propertyAction == "call":
+        def setProperty(objectWithProperty, value):
+            if value:
+                objectWithProperty.__getattribute__(attributeName)()
+    elif propertyAction == "send":
+        def setProperty(objectWithProperty, value):
+            objectWithProperty.__getattribute__(attributeName)(propertyName, value)
+    else:
+        def setProperty(objectWithProperty, value):
+            if not hasattr(objectWithProperty, propertyAction):
+                print("Trying to set " + attributeName + " using " + propertyAction + " but no" +
+                        " such method or attribute exists on " + objectWithProperty.__class__.__name__)
+            else:
+                objectWithProperty.__getattribute__(propertyAction)(value)
+
+    if propertyActions or coerce:
+        applyProperty = setProperty
+        def setProperty(objectWithProperty, value):
+            for attributeName in propertyActions:
+                objectWithProperty = objectWithProperty.__getattribute__(attributeName)
+            if coerce:
+                value = coerce(value)
+            applyProperty(objectWithProperty, value)
+
+    return setProperty
+
+
+_propertySetters = {}
+
+def propertySetters(elementClass):
+    """
+        Returns the table of property name to setter(element, value) functions for an element class - built the
+        first time a property is set on an element of that class
+    """
+    setters = _propertySetters.get(elementClass)
+    if setters is None:
+        setters = dict((propertyName, propertySetter(propertyName, propertyDict))
+                       for propertyName, propertyDict in iteritems(elementClass.properties))
+        _propertySetters[elementClass] = setters
+
+    return setters
+
+
+STATIC_TYPES = (str, unicode, int, long, bool, float, type(None))
+MISSING = object()
+
+
+_slotNames = {}
+
+def slotNames(objectClass):
+    """
+        Returns the (mangled) names of every slot defined by objectClass and the classes it inherits from
+    """
+    names = _slotNames.get(objectClass)
+    if names is None:
+        names = []
+        for baseClass in reversed(objectClass.__mro__):
+            slots = baseClass.__dict__.get('__slots__', ())
+            if type(slots) in (str, unicode):
+                slots = (slots, )
+            for name in slots:
+                if name.startswith('__') and not name.endswith('__'):
+                    name = '_' + baseClass.__name__.lstrip('_') + name
+                if name not in ('__dict__', '__weakref__') and name not in names:
+                    names.append(name)
+        names = _slotNames[objectClass] = tuple(names)
+
+    return names
+
+
+def cloneValue(value, memo):
+    """
+        Returns a copy of a value held by an element being cloned - sharing immutable values, remapping anything
+        already cloned (such as parent elements and signal receivers) through memo, and copying the containers
+        elements hold directly instead of going through the generic deepcopy machinery. The attributes, classes, and
+        style of an element are shared with its copy when they only hold plain values - the copy makes its own the
+        first time they are accessed through attributes / classes / style (copy-on-write).
+    """
+    valueType = type(value)
+    if valueType in STATIC_TYPES or valueType in (FunctionType, type):
+        return value
+
+    clone = memo.get(id(value), MISSING)
+    if clone is not MISSING:
+        return clone
+
+    if valueType is list:
+        clone = memo[id(value)] = []
+        clone.extend([cloneValue(item, memo) for item in value])
+    elif valueType is tuple:
+        clone = tuple([cloneValue(item, memo) for item in value])
+    elif valueType in (dict, OrderedDict):
+        clone = memo[id(value)] = valueType()
+        for key, item in iteritems(value):
+            clone[cloneValue(key, memo)] = cloneValue(item, memo)
+    elif valueType is TrackedDict:
+        if id(value.owner) in memo and not [item for item in itervalues(value) if type(item) not in STATIC_TYPES]:
+            return value
+
+        clone = memo[id(value)] = TrackedDict(None, [(key, cloneValue(item, memo)) for key, item in value.items()])
+        clone.owner = cloneValue(value.owner, memo)
+    elif valueType is TrackedSet:
+        if id(value.owner) in memo and not [item for item in value if type(item) not in STATIC_TYPES]:
+            return value
+
+        clone = memo[id(value)] = TrackedSet(None, value._order)
+        clone.owner = cloneValue(value.owner, memo)
+    elif hasattr(valueType, '__deepcopy__'):
+        clone = value.__deepcopy__(memo)
+    else:
+        clone = copy.deepcopy(value, memo)
+
+    return clone
+
+
+_clonePlans = {}
+
+def cloneObject(instance, memo, resets=None):
+    """
+        Returns a shallow copy of a slotted instance with each of its values cloned through cloneValue, and the values
+        of any slots named in resets replaced with the given defaults
+    """
+    objectClass = instance.__class__
+    plan = _clonePlans.get(objectClass)
+    if plan is None:
+        names = slotNames(objectClass)
+        resets = resets or {}
+        plan = _clonePlans[objectClass] = (tuple(name for name in names if name not in resets),
+                                           tuple((name, value) for name, value in iteritems(resets) if name in names))
+    copiedNames, resetValues = plan
+
+    clone = objectClass.__new__(objectClass)
+    memo[id(instance)] = clone
+    setValue = object.__setattr__
+    for name in copiedNames:
+        value = getattr(instance, name, MISSING)
+        if value is MISSING:
+            continue
+        if type(value) not in STATIC_TYPES:
+            value = cloneValue(value, memo)
+        setValue(clone, name, value)
+    for name, value in resetValues:
+        setValue(clone, name, value)
+
+    instanceDict = getattr(instance, '__dict__', None)
+    if instanceDict:
+        cloneDict = clone.__dict__
+        for name, value in iteritems(instanceDict):
+            cloneDict[name] = cloneValue(value, memo)
+
+    return clone
+
+
+class TrackedDict(OrderedDict):
+    """
+        A dictionary that keeps items in the order they were added (so it renders the same way in every process)
+        and lets the element that owns it know whenever it is modified
+    """
+    __slots__ = ('owner', )
+
+    def __init__(self, owner, *args, **kwargs):
+        OrderedDict.__init__(self, *args, **kwargs)
+        self.owner = owner
+
+    def __changed(self):
+        owner = getattr(self, 'owner', None)
+        if owner is not None:
+            owner._markChanged()
+
+    def __setitem__(self, key, value):
+        previous = dict.get(self, key, MISSING)
+        OrderedDict.__setitem__(self, key, value)
+        if previous is not value and (type(previous) != type(value) or type(value) not in STATIC_TYPES or
+                                      previous != value):
+            self.__changed()
+
+    def __delitem__(self, key):
+        OrderedDict.__delitem__(self, key)
+        self.__changed()
+
+    def __reduce__(self):
+        return (self.__class__, (self.owner, list(self.items())))
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self.__changed()
+        return OrderedDict.setdefault(self, key, default)
+
+    def pop(self, *args):
+        self.__changed()
+        return OrderedDict.pop(self, *args)
+
+    def popitem(self, last=True):
+        self.__changed()
+        return OrderedDict.popitem(self, last)
+
+    def update(self, *args, **kwargs):
+        OrderedDict.update(self, *args, **kwargs)
+        self.__changed()
+
+    def clear(self):
+        OrderedDict.clear(self)
+        self.__changed()
+
+
+class TrackedSet(set):
+    """
+        A set that keeps items in the order they were added (so it renders the same way in every process) and lets
+        the element that owns it know whenever it is modified
+    """
+    __slots__ = ('owner', '_order')
+
+    def __init__(self, owner, items=()):
+        set.__init__(self)
+        self.owner = owner
+        self._order = OrderedDict()
+        for item in items:
+            self.__add(item)
+
+    def __changed(self):
+        owner = getattr(self, 'owner', None)
+        if owner is not None:
+            owner._markChanged()
+
+    def __add(self, item):
+        if item in self:
+            return False
+
+        set.add(self, item)
+        self._order[item] = None
+        return True
+
+    def __discard(self, item):
+        if item not in self:
+            return False
+
+        set.discard(self, item)
+        del self._order[item]
+        return True
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self._order))
+
+    def __reduce__(self):
+        return (self.__class__, (self.owner, list(self._order)))
+
+    def copy(self):
+        return self.__class__(None, self._order)
+
+    def add(self, item):
+        if self.__add(item):
+            self.__changed()
+
+    def remove(self, item):
+        set.remove(self, item)
+        del self._order[item]
+        self.__changed()
+
+    def discard(self, item):
+        if self.__discard(item):
+            self.__changed()
+
+    def pop(self):
+        if not self:
+            raise KeyError('pop from an empty set')
+
+        item = self._order.popitem()[0]
+        set.discard(self, item)
+        self.__changed()
+        return item
+
+    def clear(self):
+        set.clear(self)
+        self._order.clear()
+        self.__changed()
+
+    def update(self, *others):
+        for other in others:
+            for item in other:
+                self.__add(item)
+        self.__changed()
+
+    def difference_update(self, *others):
+        for other in others:
+            for item in other:
+                self.__discard(item)
+        self.__changed()
+
+    def intersection_update(self, *others):
+        keep = set(self).intersection(*others)
+        for item in [item for item in self._order if item not in keep]:
+            self.__discard(item)
+        self.__changed()
+
+    def symmetric_difference_update(self, other):
+        for item in set(other):
+            if not self.__discard(item):
+                self.__add(item)
+        self.__changed()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __iand__(self, other):
+        self.intersection_update(other)
+        return self
+
+    def __isub__(self, other):
+        self.difference_update(other)
+        return self
+
+    def __ixor__(self, other):
+        self.symmetric_difference_update(other)
+        return self
+
+
+class ElementIndex(object):
+    """
+        Maps the ids, names, classes, and tag names of every element in a tree to the elements themselves
+        (in the order they were added to the tree) - kept at the root element and updated as elements are added,
+        removed, or modified
+    """
+    __slots__ = ('ids', 'names', 'classes', 'tagNames', 'entries')
+
+    def __init__(self):
+        self.ids = {}
+        self.names = {}
+        self.classes = {}
+        self.tagNames = {}
+        self.entries = {}
+
+    @staticmethod
+    def __entry(element):
+        return (element._id, element._name, frozenset(element._classes or ()), element._tagName)
+
+    @staticmethod
+    def __register(mapping, key, element):
+        if key:
+            bucket = mapping.get(key)
+            if bucket is None:
+                bucket = mapping[key] = OrderedDict()
+            bucket[element] = None
+
+    @staticmethod
+    def __unregister(mapping, key, element):
+        if key:
+            bucket = mapping.get(key)
+            if bucket is not None:
+                bucket.pop(element, None)
+                if not bucket:
+                    del mapping[key]
+
+    def add(self, element):
+        """
+            Adds a single element to the index (or updates it if it is already indexed)
+        """
+        if element in self.entries:
+            return self.update(element)
+
+        entry = self.entries[element] = self.__entry(element)
+        elementId, name, classes, tagName = entry
+        self.__register(self.ids, elementId, element)
+        self.__register(self.names, name, element)
+        for className in classes:
+            self.__register(self.classes, className, element)
+        self.__register(self.tagNames, tagName, element)
+
+    def remove(self, element):
+        """
+            Removes a single element from the index
+        """
+        entry = self.entries.pop(element, None)
+        if entry is not None:
+            elementId, name, classes, tagName = entry
+            self.__unregister(self.ids, elementId, element)
+            self.__unregister(self.names, name, element)
+            for className in classes:
+                self.__unregister(self.classes, className, element)
+            self.__unregister(self.tagNames, tagName, element)
+
+    def update(self, element):
+        """
+            Re-indexes an element whose id, name, or classes may have changed - if it is part of the index.
+            Only the keys that changed are touched, so the element keeps its position under the others.
+        """
+        entry = self.entries.get(element)
+        if entry is None:
+            return
+
+        newEntry = self.__entry(element)
+        if entry == newEntry:
+            return
+
+        self.entries[element] = newEntry
+        for mapping, key, newKey in ((self.ids, entry[0], newEntry[0]), (self.names, entry[1], newEntry[1]),
+                                     (self.tagNames, entry[3], newEntry[3])):
+            if key != newKey:
+                self.__unregister(mapping, key, element)
+                self.__register(mapping, newKey, element)
+        for className in entry[2] - newEntry[2]:
+            self.__unregister(self.classes, className, element)
+        for className in newEntry[2] - entry[2]:
+            self.__register(self.classes, className, element)
+
+    @staticmethod
+    def __walk(element):
+        """
+            Returns element and all of its child elements (excluding text nodes) in document order
+        """
+        stack = [element]
+        while stack:
+            element = stack.pop()
+            if type(element) is not TextNode:
+                yield element
+                if element._childElements:
+                    stack.extend(reversed(element._childElements))
+
+    def addTree(self, element):
+        """
+            Adds an element and all of its child elements to the index
+        """
+        for child in self.__walk(element):
+            self.add(child)
+
+    def removeTree(self, element):
+        """
+            Removes an element and all of its child elements from the index
+        """
+        for child in self.__walk(element):
+            self.remove(child)
+
+
+class HTMLWriter(object):
+    """
+        A single buffer an element tree is rendered into - when formatted, indentation is applied using the depth
+        each piece of html is written at, instead of re-splitting and re-indenting already rendered child html
+    """
+    __slots__ = ('formatted', 'size', '_parts', '_separator', '_indentation')
+
+    def __init__(self, formatted=False):
+        self.formatted = formatted
+        self.size = 0
+        self._parts = []
+        self._separator = ''
+        self._indentation = ['']
+
+    def indentation(self, depth):
+        """
+            Returns the indentation string for the given depth
+        """
+        indentation = self._indentation
+        while len(indentation) <= depth:
+            indentation.append(indentation[-1] + Settings.INDENTATION)
+
+        return indentation[depth]
+
+    def append(self, html):
+        """
+            Appends html to the buffer exactly as given
+        """
+        if html:
+            self._parts.append(html)
+            self.size += len(html)
+
+    def write(self, html, depth=None):
+        """
+            Writes a piece of html into the buffer:
+                html - the html to write
+                depth - the number of tagged elements the html is nested in (None for the html of the rendered root)
+        """
+        if not html:
+            return
+        if not self.formatted:
+            self._parts.append(html)
+            self.size += len(html)
+            return
+
+        if depth is None:
+            lines = (html, )
+        else:
+            indentation = self.indentation(depth)
+            lines = [indentation + line for line in html.split("\n") if line]
+
+        parts = self._parts
+        for line in lines:
+            parts.append(self._separator)
+            parts.append(line)
+            self.size += len(line) + 1
+            self._separator = "\n"
+
+    def flush(self):
+        """
+            Returns all html written since the last flush, emptying the buffer
+        """
+        html = "".join(self._parts)
+        self._parts = []
+        self.size = 0
+        return html
+
 
 class WebElement(Connectable):
     """
         The base WebElement which all custom WebElements should extend.
     """
     __slots__ = ('_tagName', '_prefix', '__scriptTemp__', '__objectTemp__', 'validator', '_editable',
-                 '__scriptContainer__', 'id', 'name', 'parent', '_style', '_classes', '_attributes',
-                 '_childElements', 'addChildElementsTo', 'key', '_tagSelfCloses', '_clientSide')
+                 '__scriptContainer__', '_id', '_name', '_parent', '_style', '_classes', '_attributes',
+                 '_childElements', 'addChildElementsTo', '_key', '_tagSelfCloses', '_clientSide', '_startTagCache',
+                 '_renderCache', '_inheritedPrefix', '_inheritedEditable', '_inheritedScriptContainer',
+                 '_inheritedDepth', '_index', '_inheritedIndex', '_bindings')
     tagSelfCloses = False
     allowsChildren = True
     displayable = True
     signals = ['hidden', 'shown', 'rendering', 'childAdded', 'editableChanged']
+    flushesStream = False
+    renderCaches = 0 # the number of elements that have ever had render caching enabled
+    variableBindingMaps = 0 # the number of variable binding maps that have ever been built
+    cloneResets = {'_dispatch':None, '_clientSide':None, '_startTagCache':None, '_renderCache':None,
+                   '_inheritedPrefix':MISSING, '_inheritedEditable':MISSING, '_inheritedScriptContainer':MISSING,
+                   '_inheritedDepth':MISSING, '_inheritedIndex':MISSING} # caches that are recomputed by each copy
     properties = {}
     properties['style'] = {'action':'setStyleFromString'}
     properties['class'] = {'action':'addClassesFromString'}
@@ -111,6 +736,7 @@ class WebElement(Connectable):
     properties['hidden'] = {'action':'attribute', 'type':'bool'}
     properties['tabindex'] = {'action':'attribute', 'type':'int'}
     properties['accesskey'] = {'action':'attribute'}
+    properties['cacheRender'] = {'action':'call', 'name':'enableRenderCache', 'type':'bool'}
     tagName = ""
 
     class ClientSide(AutoAddScripts):
@@ -678,16 +1304,25 @@ class WebElement(Connectable):
         self._tagName = self.__class__.tagName
         self._tagSelfCloses = self.tagSelfCloses
         self._prefix = None
-
-        self.id = id
-        self.name = name or id
-        self.parent = parent
-        self.key = None
+        self._inheritedPrefix = MISSING
+        self._inheritedEditable = MISSING
+        self._inheritedScriptContainer = MISSING
+        self._inheritedDepth = MISSING
+        self._inheritedIndex = MISSING
+        self._index = None
+
+        self._id = id
+        self._name = name or id
+        self._parent = parent
+        self._key = None
+        self._bindings = None
 
         self._style = None
         self._classes = None
         self._attributes = None
         self._clientSide = None
+        self._startTagCache = None
+        self._renderCache = None
 
         self._childElements = None
         self.addChildElementsTo = self
@@ -698,35 +1333,124 @@ class WebElement(Connectable):
         self._editable = None
         self.validator = None
 
+    @property
+    def id(self):
+        """
+            Returns the id of the element (without any prefix)
+        """
+        return self._id
+
+    @id.setter
+    def id(self, id):
+        """
+            Sets the id of the element
+        """
+        self._id = id
+        self._markChanged()
+        self._clearVariableBindings()
+
+    @property
+    def name(self):
+        """
+            Returns the name of the element (without any prefix)
+        """
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        """
+            Sets the name of the element
+        """
+        self._name = name
+        self._markChanged()
+        self._clearVariableBindings()
+
+    @property
+    def key(self):
+        """
+            Returns the key of the element (the nested variable it is bound to)
+        """
+        return self._key
+
+    @key.setter
+    def key(self, key):
+        """
+            Sets the key of the element
+        """
+        self._key = key
+        self._clearVariableBindings()
+
+    @property
+    def parent(self):
+        """
+            Returns the element that contains this element
+        """
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent):
+        """
+            Sets the element that contains this element - clearing any state inherited from the previous parent
+        """
+        if parent is not getattr(self, '_parent', None):
+            self._parent = parent
+            if parent is not None:
+                self._index = None
+            self._clearInheritedState()
+
+    def _clearInheritedState(self):
+        """
+            Clears the cached prefix, editable state, script container, index, and indentation level of the element
+            and all child elements - child elements can only have these cached if their parent does, so elements that
+            have nothing cached are not walked into
+        """
+        if (self._inheritedPrefix is MISSING and self._inheritedEditable is MISSING and
+            self._inheritedScriptContainer is MISSING and self._inheritedDepth is MISSING and
+            self._inheritedIndex is MISSING):
+            return
+
+        self._inheritedPrefix = MISSING
+        self._inheritedEditable = MISSING
+        self._inheritedScriptContainer = MISSING
+        self._inheritedDepth = MISSING
+        self._inheritedIndex = MISSING
+        if self._childElements:
+            for child in self._childElements:
+                if type(child) is not TextNode:
+                    child._clearInheritedState()
+
     @property
     def attributes(self):
         """
             Returns the element's attributes (creating them on-demand in a lazy fashion)
         """
-        if self._attributes is None:
-            self._attributes = {}
+        attributes = self._attributes
+        if attributes is None or attributes.owner is not self:
+            attributes = self._attributes = TrackedDict(self, attributes and attributes.items() or ())
 
-        return self._attributes
+        return attributes
 
     @property
     def classes(self):
         """
             Returns the element's classes (creating them on-demand in a lazy fashion)
         """
-        if self._classes is None:
-            self._classes = set([])
+        classes = self._classes
+        if classes is None or classes.owner is not self:
+            classes = self._classes = TrackedSet(self, classes or ())
 
-        return self._classes
+        return classes
 
     @property
     def style(self):
         """
             Returns the element's style dictionary (creating it on-demand in a lazy fashion)
         """
-        if self._style is None:
-            self._style = {}
+        style = self._style
+        if style is None or style.owner is not self:
+            style = self._style = TrackedDict(self, style and style.items() or ())
 
-        return self._style
+        return style
 
     @property
     def childElements(self):
@@ -743,10 +1467,13 @@ class WebElement(Connectable):
         """
             Sets the child elements of this element
         """
+        oldChildElements = self._childElements or ()
         if not childElements:
             self._childElements = None
         else:
             self._childElements = childElements
+        self._reindexChildren(oldChildElements, self._childElements or ())
+        self._markDirty()
 
     @property
     def clientSide(self):
@@ -757,11 +1484,28 @@ class WebElement(Connectable):
             self._clientSide = self.ClientSide(self)
         return self._clientSide
 
+    def clone(self, parent=None):
+        """
+            Returns a copy of the element and all of its child elements without re-creating any of them - parent
+            pointers, signal connections, and any other references between elements in the tree are remapped to their
+            copies, while the copy itself is placed under parent. (To copy the same tree repeatedly use a Prototype)
+        """
+        memo = {}
+        if self._parent is not None:
+            memo[id(self._parent)] = parent
+        return cloneObject(self, memo, self.cloneResets)
+
+    def __deepcopy__(self, memo):
+        return cloneObject(self, memo, self.cloneResets)
+
     def reset(self):
         """
             clears the element of all children
         """
+        oldChildElements = self._childElements or ()
         self._childElements = []
+        self._reindexChildren(oldChildElements)
+        self._markDirty()
 
     def hide(self):
         """
@@ -794,8 +1538,9 @@ class WebElement(Connectable):
             make its way to the html output
         """
         if self.name and self.name != '':
-            if self.prefix():
-                returned_name = self.prefix() + self.name
+            prefix = self.prefix()
+            if prefix:
+                returned_name = prefix + self.name
             else:
                 returned_name = self.name
         else:
@@ -810,8 +1555,9 @@ class WebElement(Connectable):
         """
         if self.id and self.id != '':
             returned_id = self.id
-            if self.prefix():
-                returned_id = self.prefix() + returned_id
+            prefix = self.prefix()
+            if prefix:
+                returned_id = prefix + returned_id
         else:
             returned_id = ''
 
@@ -839,6 +1585,10 @@ class WebElement(Connectable):
         """
             Returns all elements with className specified
         """
+        index = self.elementIndex()
+        if index is not None:
+            return self.__indexedChildren(index.classes, className)
+
         childrenWithClass = []
         for child in self.childElements:
             if child.hasClass(className):
@@ -851,6 +1601,10 @@ class WebElement(Connectable):
         """
             Returns all elements with the name specified
         """
+        index = self.elementIndex()
+        if index is not None:
+            return self.__indexedChildren(index.names, name)
+
         childrenWithName = []
         for child in self.childElements:
             if child.name == name:
@@ -863,6 +1617,10 @@ class WebElement(Connectable):
         """
             Returns all elements with the tagName specified
         """
+        index = self.elementIndex()
+        if index is not None:
+            return self.__indexedChildren(index.tagNames, tagName)
+
         childrenWithTagName = []
         for child in self.childElements:
             if child._tagName == tagName:
@@ -875,7 +1633,13 @@ class WebElement(Connectable):
         """
             Returns all elements with the id specified
         """
-        childrenWithId = None
+        index = self.elementIndex()
+        if index is not None:
+            children = self.__indexedChildren(index.ids, elementId)
+            if len(children) > 1:
+                return min(children, key=self.__documentPosition)
+            return children and children[0] or None
+
         for child in self:
             if child.id == elementId:
                 return child
@@ -887,18 +1651,26 @@ class WebElement(Connectable):
         """
             Returns all errors present and visible within this element
         """
+        index = self.elementIndex()
+        if index is not None:
+            return Queryable(element for element in self.__indexedChildren(index.classes, "WError")
+                             if element.shown() == True)
+
         return self.query().filter(classes__contains="WError", shown=True)
 
     def prefix(self):
         """
             Returns the prefix set for this element or the first parent element with one set
         """
-        if self._prefix is None and self.parent:
-            prefix = self.parent.prefix()
-        elif self._prefix == " ":
-            return ''
-        else:
-            prefix = self._prefix or ''
+        prefix = self._inheritedPrefix
+        if prefix is MISSING:
+            if self._prefix is None and self._parent:
+                prefix = self._parent.prefix()
+            elif self._prefix == " ":
+                prefix = ''
+            else:
+                prefix = self._prefix or ''
+            self._inheritedPrefix = prefix
 
         return prefix
 
@@ -909,14 +1681,19 @@ class WebElement(Connectable):
                 prefix - the string that will be placed before all ids/names
         """
         self._prefix = prefix
+        self._clearInheritedState()
+        self._markDirty()
+        self._clearVariableBindings()
 
     def moveElement(self, childElement, putAfter):
         """
             Changes the rendering order of the element, placing it right after 'putAfter'.
         """
         self.childElements.remove(childElement)
-        elementIndex = self.childElements.index(putAfterElement)
-        self.childElements.insert(elementIndex, putAfterElement)
+        elementIndex = self.childElements.index(putAfter)
+        self.childElements.insert(elementIndex + 1, childElement)
+        self._reindexChildren()
+        self._markDirty()
 
     def addChildElement(self, childElement, ensureUnique=True):
         """
@@ -939,6 +1716,8 @@ class WebElement(Connectable):
                 childElement.parent.removeChild(childElement)
             childElement.parent = self.addChildElementsTo
             self.addChildElementsTo.childElements.append(childElement)
+            self.addChildElementsTo._reindexChildren(added=(childElement, ))
+            self.addChildElementsTo._markDirty()
             self.addChildElementsTo.emit('childAdded', childElement)
 
             if not type(childElement) == TextNode:
@@ -960,10 +1739,15 @@ class WebElement(Connectable):
         """
             Returns a number representing the number of parent elements
         """
-        if self.parent:
-            return self.parent.indentationLevel() + 1
-        else:
-            return 0
+        depth = self._inheritedDepth
+        if depth is MISSING:
+            if self._parent:
+                depth = self._parent.indentationLevel() + 1
+            else:
+                depth = 0
+            self._inheritedDepth = depth
+
+        return depth
 
     def replaceWith(self, replacementElement):
         """
@@ -974,6 +1758,8 @@ class WebElement(Connectable):
             index = self.parent.childElements.index(self)
             self.parent.childElements[index] = replacementElement
             replacementElement.parent = self.parent
+            self.parent._reindexChildren((self, ), (replacementElement, ))
+            self.parent._markDirty()
             return replacementElement
         else:
             return Invalid()
@@ -991,25 +1777,35 @@ class WebElement(Connectable):
         """
             Returns a list of all validators associated with this element and all child elements:
                 useFullId - if set to True the validators are set against the prefix + id
+
+            The tree is collected in a single pass - only elements that override validators are called directly
         """
         validatorDict = {}
-        validator = self.validator
-        if self.editable() and validator:
-            if useFullId:
-                validatorId = self.fullId()
-            else:
-                validatorId = self.id
+        stack = [self]
+        while stack:
+            element = stack.pop()
+            if element is not self and not inheritsMethod(element, 'validators'):
+                validatorDict.update(element.validators(useFullId))
+                continue
 
-            if not validatorId and self.name:
+            validator = element.validator
+            if validator and element.editable():
                 if useFullId:
-                    validatorId = self.fullName()
+                    validatorId = element.fullId()
                 else:
-                    validatorId = self.name
+                    validatorId = element.id
+
+                if not validatorId and element.name:
+                    if useFullId:
+                        validatorId = element.fullName()
+                    else:
+                        validatorId = element.name
 
-            validatorDict[validatorId] = validator
+                validatorDict[validatorId] = validator
 
-        for child in (child  for child in self.childElements if type(child) != TextNode):
-            validatorDict.update(child.validators(useFullId))
+            children = element._childElements
+            if children:
+                stack.extend(child for child in reversed(children) if type(child) != TextNode)
 
         return validatorDict
 
@@ -1037,7 +1833,7 @@ class WebElement(Connectable):
 
     def setClasses(self, classes):
         """ Replace all current classes with a list of classes """
-        self._classes = set(classes)
+        self._classes = TrackedSet(self, classes)
         self.attributes['class'] = self.classes
 
     def removeClass(self, className):
@@ -1052,12 +1848,15 @@ class WebElement(Connectable):
         """
             Returns true if the input-type field in the element are editable
         """
-        editable = self._editable
-        if editable is None:
-            if self.parent:
-                return self.parent.editable()
-            else:
-                return True
+        editable = self._inheritedEditable
+        if editable is MISSING:
+            editable = self._editable
+            if editable is None:
+                if self._parent:
+                    editable = self._parent.editable()
+                else:
+                    editable = True
+            self._inheritedEditable = editable
 
         return editable
 
@@ -1067,6 +1866,8 @@ class WebElement(Connectable):
                 editable - setting this to True would allow input fields to be user-editable
         """
         self._editable = editable
+        self._clearInheritedState()
+        self._markDirty()
         self.emit('editableChanged', editable)
 
     def __setUneditable__(self):
@@ -1076,10 +1877,15 @@ class WebElement(Connectable):
         """
             Returns the root script container
         """
-        if self.parent:
-            return self.parent.scriptContainer()
+        scriptContainer = self._inheritedScriptContainer
+        if scriptContainer is MISSING:
+            if self._parent:
+                scriptContainer = self._parent.scriptContainer()
+            else:
+                scriptContainer = self.__scriptContainer__
+            self._inheritedScriptContainer = scriptContainer
 
-        return self.__scriptContainer__
+        return scriptContainer
 
     def setScriptContainer(self, scriptContainer):
         """
@@ -1090,11 +1896,100 @@ class WebElement(Connectable):
             self.parent.setScriptContainer(scriptContainer)
         else:
             self.__scriptContainer__ = scriptContainer
+            self._clearInheritedState()
             if scriptContainer and scriptContainer != []:
                 self.__insertTemporaryScripts()
 
         return scriptContainer
 
+    def elementIndex(self):
+        """
+            Returns the index of the tree the element is part of or None if the tree is not indexed
+        """
+        index = self._inheritedIndex
+        if index is MISSING:
+            if self._parent:
+                index = self._parent.elementIndex()
+            else:
+                index = self._index
+            self._inheritedIndex = index
+
+        return index
+
+    def enableIndex(self):
+        """
+            Indexes the ids, names, classes, and tag names of every element in the tree this element is part of,
+            turning child element lookups (such as getChildElementWithId) into dictionary hits. The index is kept at
+            the root element and is updated as elements are added, removed, replaced, or modified.
+        """
+        root = self
+        while root._parent:
+            root = root._parent
+
+        if root._index is None:
+            root._index = ElementIndex()
+            root._index.addTree(root)
+            root._clearInheritedState()
+
+        return root._index
+
+    def disableIndex(self):
+        """
+            Removes the index from the tree this element is part of
+        """
+        root = self
+        while root._parent:
+            root = root._parent
+
+        root._index = None
+        root._clearInheritedState()
+
+    def _reindexChildren(self, removed=(), added=()):
+        """
+            Updates the tree index (if there is one) after child elements have been removed from or added to this
+            element
+        """
+        self._clearVariableBindings()
+        index = self.elementIndex()
+        if index is not None:
+            for child in removed:
+                index.removeTree(child)
+            for child in added:
+                index.addTree(child)
+
+    @staticmethod
+    def __documentPosition(element):
+        """
+            Returns the position of an element within its tree as a list of child indexes
+        """
+        position = []
+        while element._parent is not None:
+            position.append(element._parent._childElements.index(element))
+            element = element._parent
+        position.reverse()
+        return position
+
+    def __indexedChildren(self, mapping, key):
+        """
+            Returns the indexed elements matching key that are children (at any depth) of this element
+        """
+        bucket = mapping.get(key)
+        if not bucket:
+            return []
+
+        if self._parent is None:
+            return [element for element in bucket if element is not self]
+
+        children = []
+        for element in bucket:
+            parent = element._parent
+            while parent is not None and parent is not self:
+                parent = parent._parent
+            if parent is self:
+                children.append(element)
+
+        return children
+
     def runClientSide(self, python):
         """
             Converts the python code directly to client-side code :: FEATURE STILL IN DEVELOPMENT ::
@@ -1193,6 +2088,7 @@ class WebElement(Connectable):
                 self.attributes.setdefault(eventName, []).append(javascript)
         else:
             self.attributes.setdefault(event, []).append(javascript)
+        self._markDirty()
 
     def removeJavascriptEvent(self, event, javascript=None):
         """
@@ -1204,6 +2100,7 @@ class WebElement(Connectable):
             self.attributes[event].remove(javascript)
         elif event in self.attributes:
             self.attributes.pop(event)
+        self._markDirty()
 
     def javascriptEvent(self, event):
         """
@@ -1217,12 +2114,15 @@ class WebElement(Connectable):
             Removes a child webElement:
                 child - the element to remove
         """
-        if child in self.childElements:
+        try:
             self.childElements.remove(child)
-            child.parent = None
-            return True
+        except ValueError:
+            return False
 
-        return False
+        self._reindexChildren(removed=(child, ))
+        child.parent = None
+        self._markDirty()
+        return True
 
     def startTag(self):
         """
@@ -1232,26 +2132,93 @@ class WebElement(Connectable):
         if not self._tagName:
             return u('')
 
-        nativeAttributes = (('name', self.fullName()),
-                            ('id', self.fullId()),
+        fullName = self.fullName()
+        fullId = self.fullId()
+        cache = self._startTagCache
+        if (cache is None or cache[0] != fullName or cache[1] != fullId or cache[2] != self._tagName or
+            cache[3] != self._tagSelfCloses):
+            cache = self._startTagCache = (fullName, fullId, self._tagName, self._tagSelfCloses,
+                                           self.__compileStartTag(fullName, fullId))
+
+        startTag = cache[4]
+        if type(startTag) != list:
+            return startTag
+
+        html = []
+        for part in startTag:
+            if type(part) == tuple:
+                part = self.__attributeHTML(*part)
+            html.append(part)
+
+        return self.__closeStartTag("".join(html))
+
+    def __compileStartTag(self, fullName, fullId):
+        """
+            Pre-serializes the start tag: returning it as a string if all attributes are static, or otherwise as a
+            list of static html strings and (key, value) tuples that need to be evaluated every time it is rendered
+        """
+        nativeAttributes = (('name', fullName),
+                            ('id', fullId),
                             ('class', self._classes),
                             ('style', self._style),)
-        startTag = "<" + self._tagName + " "
-
         attributes = nativeAttributes
         if self._attributes is not None:
-            attributes = chain(attributes, iteritems(self.attributes))
+            attributes = chain(attributes, iteritems(self._attributes))
+
+        parts = ["<" + self._tagName + " "]
+        dynamic = False
         for key, value in attributes:
-            value = interpretAsString(value)
-            if value:
-                if value == '_BLANK_':
-                    value = ""
+            if self.__isStatic(value):
+                html = self.__attributeHTML(key, value)
+                if html:
+                    if type(parts[-1]) == tuple:
+                        parts.append(html)
+                    else:
+                        parts[-1] += html
+            else:
+                parts.append((key, value))
+                dynamic = True
 
-                if value == '_EMPTY_':
-                    startTag += key + " "
-                else:
-                    startTag += key + '="' + value.replace('"', '&quot;') + '" '
+        if dynamic:
+            return parts
 
+        return self.__closeStartTag(parts[0])
+
+    def __isStatic(self, value):
+        """
+            Returns True if an attribute value can only change through modifying the element itself
+        """
+        valueType = type(value)
+        if valueType in STATIC_TYPES:
+            return True
+        elif valueType == TrackedDict and value.owner is self:
+            return not [item for item in itervalues(value) if type(item) not in STATIC_TYPES]
+        elif valueType == TrackedSet and value.owner is self:
+            return not [item for item in value if type(item) not in STATIC_TYPES]
+
+        return False
+
+    @staticmethod
+    def __attributeHTML(key, value):
+        """
+            Returns the html for a single start tag attribute
+        """
+        value = interpretAsString(value)
+        if value:
+            if value == '_BLANK_':
+                value = ""
+
+            if value == '_EMPTY_':
+                return key + " "
+            else:
+                return key + '="' + value.replace('"', '&quot;') + '" '
+
+        return ''
+
+    def __closeStartTag(self, startTag):
+        """
+            Closes a start tag that has had all of its attributes added
+        """
         if self._tagSelfCloses:
             startTag += '/'
         else:
@@ -1260,6 +2227,49 @@ class WebElement(Connectable):
 
         return unicode(startTag)
 
+    def _markChanged(self):
+        """
+            Called whenever the id, name, attributes, classes, or style of the element are modified
+        """
+        self._startTagCache = None
+        index = self.elementIndex()
+        if index is not None:
+            index.update(self)
+        self._markDirty()
+
+    def _markDirty(self):
+        """
+            Called whenever a change is made that affects the elements html - clearing the render cache of the element
+            and every parent element containing it, so that they are rendered again on next use
+        """
+        if not WebElement.renderCaches:
+            return
+
+        element = self
+        while element is not None:
+            renderCache = getattr(element, '_renderCache', None)
+            if renderCache:
+                renderCache.clear()
+            element = element.parent
+
+    def enableRenderCache(self):
+        """
+            Turns on caching of the elements rendered html: once rendered the element (including all child elements)
+            is returned from the cache until it or one of its children is modified through the WebElement API
+            (adding/removing/replacing children, setting properties, classes, style, attributes, text or values).
+            Note: cached elements are not re-rendered - so rendering time side effects (such as the 'rendering'
+            signal) will not occur while the cache is valid.
+        """
+        if self._renderCache is None:
+            self._renderCache = {}
+            WebElement.renderCaches += 1
+
+    def disableRenderCache(self):
+        """
+            Turns off caching of the elements rendered html
+        """
+        self._renderCache = None
+
     def endTag(self):
         """
             Returns the elements html end tag, for example '</span>'
@@ -1277,37 +2287,177 @@ class WebElement(Connectable):
         if self._childElements is None:
             return ''
 
-        elements = [element.toHTML(formatted=formatted, *args, **kwargs) for element in self.childElements]
-        if formatted:
-            return "\n".join([(self._tagName and Settings.INDENTATION or '') +
-                               line for line in "\n".join(elements).split("\n") if line])
-        else:
-            return ''.join(elements)
+        writer = HTMLWriter(formatted)
+        depth = self._tagName and 1 or 0
+        for chunk in self._writeHTML(writer, [(child, RENDER, depth) for child in reversed(self._childElements)],
+                                     args, kwargs):
+            pass
+
+        return writer.flush()
+
+    def contentFragments(self, formatted=False, *args, **kwargs):
+        """
+            Returns the elements html content as a sequence of strings to write one after another - override along
+            with content to let large content be written straight into the output without being joined first
+        """
+        return (self.content(formatted, *args, **kwargs), )
 
     def insertVariables(self, variableDict=None):
         """
             Populate webElement and child webElements with (id/name/key):value dictionary:
                 variableDict - the dictionary to use to populate the elements
+
+            Only the elements using one of the variables given (or a key, or that override insertVariables) are bound
+            - they are looked up in the elements variableBindings in the order a walk of the tree would reach them
         """
         if variableDict is None:
             variableDict = {}
 
-        for child in self.childElements:
-            child.insertVariables(variableDict)
+        if not self._childElements:
+            return
+
+        insertOrder, exportOrder, fields, always, prefixed = self.variableBindings()
+        positions = set(always)
+        if fields and variableDict:
+            prefixes = set(element.prefix() for element in prefixed)
+            prefixes.add(self.prefix())
+            prefixes.discard('')
+            for variable in variableDict:
+                bound = fields.get(variable)
+                if bound:
+                    positions.update(bound)
+                if prefixes and type(variable) in (str, unicode):
+                    for prefix in prefixes:
+                        if variable.startswith(prefix):
+                            bound = fields.get(variable[len(prefix):])
+                            if bound:
+                                positions.update(bound)
+
+        for position in sorted(positions):
+            element = insertOrder[position]
+            if variableBinding(element, 'insertVariables') is False:
+                element.insertVariables(variableDict)
+            else:
+                element._insertValue(variableDict)
 
     def exportVariables(self, exportedVariables=None, flat=False):
         """
             Export WebElement input field values as a nested key:value dictionary:
                 exportedVariables - the dictionary to add exported variables to
+
+            Only the elements that bind a value (or override exportVariables) are visited - as listed in the elements
+            variableBindings
         """
         if exportedVariables is None:
             exportedVariables = {}
 
-        for child in self.childElements:
-            child.exportVariables(exportedVariables, flat)
+        if self._childElements:
+            for element in self.variableBindings()[1]:
+                if variableBinding(element, 'exportVariables') is False:
+                    element.exportVariables(exportedVariables, flat)
+                else:
+                    element._exportValue(exportedVariables, flat)
 
         return exportedVariables
 
+    def variableBindings(self):
+        """
+            Returns the map of the child elements (at any depth) that take part in binding variables - built on first
+            use and kept until an element is added to or removed from the tree beneath this element, or has its id,
+            name, key, or prefix changed:
+                (insertOrder, exportOrder, fields, always, prefixed)
+
+                insertOrder - the elements insertVariables binds, in the order a walk of the tree binds them
+                exportOrder - the elements exportVariables binds, in the order a walk of the tree binds them
+                fields - every id and name mapped to the positions in insertOrder of the elements using it
+                always - the positions in insertOrder of the elements bound whichever variables are given (elements
+                         with a key, or that override insertVariables)
+                prefixed - the elements that set their own prefix
+        """
+        bindings = self._bindings
+        if bindings is None:
+            insertOrder, fields, always, prefixed = self.__insertBindings()
+            bindings = self._bindings = (insertOrder, self.__exportBindings(), fields, always, prefixed)
+            WebElement.variableBindingMaps += 1
+
+        return bindings
+
+    def __insertBindings(self):
+        """
+            Walks the tree in the order insertVariables binds it - children are bound before the element holding them
+        """
+        insertOrder = []
+        fields = {}
+        always = []
+        prefixed = []
+        stack = self._childElements[::-1]
+        while stack:
+            element = stack.pop()
+            if type(element) is tuple:
+                element = element[0]
+                if element._key:
+                    always.append(len(insertOrder))
+                else:
+                    for identifier in set((element._id, element._name)):
+                        if identifier:
+                            fields.setdefault(identifier, []).append(len(insertOrder))
+                insertOrder.append(element)
+                continue
+            elif type(element) is TextNode:
+                continue
+
+            if element._prefix is not None:
+                prefixed.append(element)
+
+            binding = variableBinding(element, 'insertVariables')
+            if binding is False:
+                always.append(len(insertOrder))
+                insertOrder.append(element)
+                continue
+            elif binding:
+                stack.append((element, ))
+
+            if element._childElements:
+                stack.extend(element._childElements[::-1])
+
+        return (insertOrder, fields, always, prefixed)
+
+    def __exportBindings(self):
+        """
+            Walks the tree in the order exportVariables binds it - elements are bound before the children they hold
+        """
+        exportOrder = []
+        stack = self._childElements[::-1]
+        while stack:
+            element = stack.pop()
+            if type(element) is TextNode:
+                continue
+
+            binding = variableBinding(element, 'exportVariables')
+            if binding is not None:
+                exportOrder.append(element)
+                if binding is False:
+                    continue
+
+            if element._childElements:
+                stack.extend(element._childElements[::-1])
+
+        return exportOrder
+
+    def _clearVariableBindings(self):
+        """
+            Called whenever an element is added to or removed from the tree, or has its id, name, key, or prefix
+            changed - clearing the variable binding maps of the element and every parent element containing it
+        """
+        if not WebElement.variableBindingMaps:
+            return
+
+        element = self
+        while element is not None:
+            if element._bindings is not None:
+                element._bindings = None
+            element = element._parent
+
     def clearFromRequest(self, reqDict):
         """
             Removes variables pointing to this element or child elements from a request dictionary:
@@ -1325,7 +2475,7 @@ class WebElement(Connectable):
 
     @staticmethod
     def __getStyleDictFromString(styleString):
-        styleDict = {}
+        styleDict = OrderedDict()
 
         styleDefinitions = styleString.split(';')
         for definition in styleDefinitions:
@@ -1361,43 +2511,30 @@ class WebElement(Connectable):
         """
             Sets the property of single element - as defined in the elements property dictionary
         """
-        propertyDict = self.properties[name]
-        propertyAction = propertyDict['action']
-        propertyActions = propertyAction.split('.')
-        propertyAction = propertyActions.pop(-1)
-        propertyName = propertyDict.get('name', name)
-
-        objectWithProperty = self
-        for attributeName in propertyActions:
-            objectWithProperty = objectWithProperty.__getattribute__(attributeName)
-
-        if propertyAction == "classAttribute":
-            objectWithProperty.__setattr__(propertyName, value)
-        elif propertyAction == "attribute":
-            objectWithProperty.attributes[propertyName] = value
-        elif propertyAction == "javascriptEvent":
-            objectWithProperty.addJavascriptEvent(propertyName, value)
-        elif propertyAction == "call":
-            if value:
-                objectWithProperty.__getattribute__(propertyName)()
-        elif propertyAction == "send":
-            objectWithProperty.__getattribute__(propertyName)(name, value)
-        elif not hasattr(objectWithProperty, propertyAction):
-            print("Trying to set " + propertyName + " using " + propertyAction + " but no" +
-                    " such method or attribute exists on " + objectWithProperty.__class__.__name__)
-        else:
-            objectWithProperty.__getattribute__(propertyAction)(value)
+        propertySetters(self.__class__)[name](self, value)
+
+        self._markDirty()
 
     def setProperties(self, properties):
         """
             Loads element properties from a list of property name to value tuples
         """
         if isinstance(properties, dict):
-            properties = iteritems(properties)
+            if ORDERED_DICTS or isinstance(properties, OrderedDict):
+                properties = iteritems(properties)
+            else:
+                properties = sorted(iteritems(properties), key=lambda item: item[0])
 
+        setters = propertySetters(self.__class__)
+        changed = False
         for propertyName, propertyValue in properties:
-            if propertyValue is not None and propertyName in self.properties:
-                self.setProperty(propertyName, propertyValue)
+            if propertyValue is not None:
+                setProperty = setters.get(propertyName)
+                if setProperty:
+                    setProperty(self, propertyValue)
+                    changed = True
+        if changed: # setters may change attributes directly - so any cached render can not be trusted
+            self._markDirty()
 
     def _render(self):
         """
@@ -1409,16 +2546,97 @@ class WebElement(Connectable):
         """
            Returns the element(including child elements) as standard html
         """
-        self._render()
+        renderCache = self._renderCache
+        if renderCache is not None:
+            cacheKey = (formatted, self.prefix(), self.editable())
+            html = renderCache.get(cacheKey)
+            if html is None:
+                html = self.__renderHTML(formatted, args, kwargs)
+                renderCache[cacheKey] = html
+            return html
 
-        data = (self.startTag() or '', self.content(formatted, *args, **kwargs), self.endTag() or '')
+        return self.__renderHTML(formatted, args, kwargs)
 
-        if formatted:
-            html = "\n".join([data for data in data if data])
-        else:
-            html = "".join(data)
+    def __renderHTML(self, formatted, args, kwargs):
+        """
+            Renders the element(including child elements) as standard html ignoring any render cache
+        """
+        writer = HTMLWriter(formatted)
+        for chunk in self._writeHTML(writer, [(self, RENDER, None)], args, kwargs):
+            pass
 
-        return html
+        return writer.flush()
+
+    def iterHTML(self, formatted=False, encoding="utf-8", *args, **kwargs):
+        """
+           Returns a generator that yields the element (including child elements) as encoded html chunks in
+           document order - child elements are only rendered once the stream reaches them
+        """
+        if not inheritsMethod(self, 'toHTML'):
+            return iter((self.toHTML(formatted, *args, **kwargs).encode(encoding), ))
+
+        return self._streamHTML(HTMLWriter(formatted), encoding, args, kwargs)
+
+    def _streamHTML(self, writer, encoding, args, kwargs):
+        """
+            Renders the element into writer, yielding the encoded html in chunks of at least
+            Settings.STREAM_CHUNK_SIZE or whenever an element that flushesStream is closed
+        """
+        for html in self._writeHTML(writer, [(self, RENDER, None)], args, kwargs, Settings.STREAM_CHUNK_SIZE):
+            yield html.encode(encoding)
+
+        if writer.size:
+            yield writer.flush().encode(encoding)
+
+    def _renderedChildren(self):
+        """
+            Returns the child elements that should be rendered within the element - override to change what is
+            rendered without modifying the element's actual children
+        """
+        return self._childElements
+
+    def _writeHTML(self, writer, stack, args, kwargs, chunkSize=None):
+        """
+            Renders a stack of (element, action, depth) entries into writer in a single non-recursive pass.
+            Elements that override toHTML or content, or that have a render cache, are rendered by calling them
+            directly, with their output written at the element's depth (unformatted content is written fragment by
+            fragment when the element overrides contentFragments). If a chunkSize is given the buffered html is
+            flushed and yielded whenever it grows past it, or whenever an element that flushesStream is closed.
+        """
+        formatted = writer.formatted
+        write = writer.write
+        while stack:
+            element, action, depth = stack.pop()
+            if action is WRITE:
+                write(element, depth)
+            elif action is CLOSE:
+                write(element.endTag(), depth)
+                if chunkSize and element.flushesStream and writer.size:
+                    yield writer.flush()
+                    continue
+            elif type(element) is TextNode:
+                write(unicode(element._text), depth)
+            elif element is not self and (getattr(element, '_renderCache', None) is not None or
+                                          not inheritsMethod(element, 'toHTML')):
+                write(element.toHTML(formatted, *args, **kwargs), depth)
+            else:
+                element._render()
+                write(element.startTag(), depth)
+                stack.append((element, CLOSE, depth))
+                if not inheritsMethod(element, 'content'):
+                    if formatted or inheritsMethod(element, 'contentFragments'):
+                        stack.append((element.content(formatted, *args, **kwargs), WRITE, depth))
+                    else:
+                        for fragment in element.contentFragments(formatted, *args, **kwargs):
+                            write(fragment)
+                else:
+                    children = element._renderedChildren()
+                    if children:
+                        childDepth = (depth or 0) + (element._tagName and 1 or 0)
+                        stack.extend([(child, RENDER, childDepth) for child in reversed(children)])
+
+            if chunkSize and writer.size >= chunkSize:
+                yield writer.flush()
 
     def isBlockElement(self):
         """
@@ -1447,10 +2665,19 @@ class WebElement(Connectable):
         return self.childElements.__getitem__(index)
 
     def __setitem__(self, index, value):
-        return self.childElements.__setitem__(index, value)
+        removed = self.childElements[index]
+        self.childElements.__setitem__(index, value)
+        if type(index) == slice:
+            self._reindexChildren(removed, value)
+        else:
+            self._reindexChildren((removed, ), (value, ))
+        self._markDirty()
 
     def __delitem__(self, index):
-        return self.childElements.__delitem__(index)
+        removed = self.childElements[index]
+        self.childElements.__delitem__(index)
+        self._reindexChildren(type(index) == slice and removed or (removed, ))
+        self._markDirty()
 
     def count(self):
         """
@@ -1527,11 +2754,17 @@ class TextNode(object):
         self.setText(text)
         self.parent = parent
 
+    def __deepcopy__(self, memo):
+        return cloneObject(self, memo)
+
     def setText(self, text):
         """
             Sets the text associated with the text node.
         """
         self._text = text
+        parent = getattr(self, 'parent', None)
+        if parent is not None:
+            parent._markDirty()
 
     def text(self):
         """
@@ -1568,11 +2801,36 @@ class TextNode(object):
             index = self.parent.childElements.index(self)
             self.parent.childElements[index] = replacementElement
             replacementElement.parent = self.parent
+            self.parent._reindexChildren((self, ), (replacementElement, ))
+            self.parent._markDirty()
             return replacementElement
         else:
             return Invalid()
 
 
+class StaticHTML(WebElement):
+    """
+        Html rendered ahead of time from a part of a template that can never change (see Factory.builder) - standing
+        in for the tree of elements it was rendered from
+    """
+    __slots__ = ('html', 'formattedHTML')
+    allowsChildren = False
+
+    def __init__(self, html="", formattedHTML="", parent=None):
+        WebElement.__init__(self, None, None, parent)
+        self.html = html
+        self.formattedHTML = formattedHTML
+
+    def toHTML(self, formatted=False, *args, **kwargs):
+        """
+            Overrides toHTML to return the pre-rendered html
+        """
+        if formatted:
+            return self.formattedHTML
+
+        return self.html
+
+
 class TemplateElement(WebElement):
     """
         A template WebElement is a web element that uses a template for its presentation and
@@ -1580,8 +2838,9 @@ class TemplateElement(WebElement):
     """
     factory = None
     template = None
+    hoistStatic = False # set to True to pre-render the parts of the template that can never change
 
-    def __init__(self, id=None, name=None, parent=None, template=None, factory=None, **kwargs):
+    def __init__(self, id=None, name=None, parent=None, template=None, factory=None, hoistStatic=None, **kwargs):
         WebElement.__init__(self, id, name, parent, **kwargs)
 
         if template:
@@ -1590,8 +2849,12 @@ class TemplateElement(WebElement):
         if factory:
             self.factory = factory
 
+        if hoistStatic is not None:
+            self.hoistStatic = hoistStatic
+
         accessors = {}
-        instance = self.factory.buildFromTemplate(self.template, accessors=accessors, parent=self)
+        instance = self.factory.buildFromTemplate(self.template, accessors=accessors, parent=self,
+                                                  hoistStatic=self.hoistStatic)
         for accessor, element in iteritems(accessors):
             if hasattr(self, accessor):
                 raise ValueError("The accessor name or id of the element has to be unique and can not be the same as a"
@@ -1602,3 +2865,119 @@ class TemplateElement(WebElement):
 
         self.addChildElement(instance)
 
+
+class Prototype(object):
+    """
+        An element tree that is built once and then copied every time it is needed, instead of being built again. The
+        tree is compiled into a single function that creates every element of the copy and sets each of their slots
+        directly - plain values are written in as constants and references between elements in the tree (parents,
+        children, signal receivers) point to their copies, so copying never re-runs _create or looks at the original.
+        The attributes, classes, and style of each element are shared with every copy until it modifies them.
+        NOTE: the element tree must not be modified once it has been made into a prototype.
+    """
+    __slots__ = ('element', '_clone')
+
+    def __init__(self, element):
+        self.element = element
+        self._clone = self.__compile(element)
+
+    def clone(self):
+        """
+            Returns a new copy of the prototype element tree
+        """
+        return self._clone()
+
+    @staticmethod
+    def __slotValues(instance):
+        """
+            Returns the (slot name, value) pairs of an element or text node - with cached state reset - followed by
+            the (name, value) pairs of its instance dictionary (if it has one)
+        """
+        resets = getattr(instance, 'cloneResets', None) or {}
+        values = []
+        for name in slotNames(instance.__class__):
+            if name in resets:
+                value = resets[name]
+            else:
+                value = getattr(instance, name, MISSING)
+                if value is MISSING:
+                    continue
+            values.append((name, value))
+
+        return values, list(iteritems(getattr(instance, '__dict__', None) or {}))
+
+    @classmethod
+    def __compile(cls, element):
+        """
+            Generates the function that creates a copy of the element tree
+        """
+        nodeTypes = (WebElement, TextNode)
+        nodes = [element]
+        nodeIndexes = {id(element):0}
+        if element._parent is not None:
+            nodeIndexes[id(element._parent)] = None
+
+        listReferences = {}
+        for node in nodes:
+            slots, attributes = cls.__slotValues(node)
+            for name, value in slots + attributes:
+                if type(value) is list:
+                    listReferences[id(value)] = listReferences.get(id(value), 0) + 1
+                for item in (type(value) in (list, tuple) and value or (value, )):
+                    if isinstance(item, nodeTypes) and id(item) not in nodeIndexes:
+                        nodeIndexes[id(item)] = len(nodes)
+                        nodes.append(item)
+
+        namespace = {'MISSING':MISSING, 'cloneValue':cloneValue, 'prototypeIds':tuple(nodeIndexes.keys())}
+        constants = []
+
+        def constant(value):
+            namespace['constant%d' % len(constants)] = value
+            constants.append(value)
+            return 'constant%d' % (len(constants) - 1)
+
+        def reference(value, dynamic):
+            valueType = type(value)
+            if value is None or valueType in (bool, int):
+                return repr(value)
+            elif value is MISSING:
+                return 'MISSING'
+            elif valueType in STATIC_TYPES:
+                return constant(value)
+            elif id(value) in nodeIndexes:
+                index = nodeIndexes[id(value)]
+                return index is None and 'None' or 'node%d' % index
+            elif (valueType is list and listReferences[id(value)] == 1 and
+                  not [item for item in value if type(item) not in STATIC_TYPES and id(item) not in nodeIndexes]):
+                return '[' + ', '.join(reference(item, dynamic) for item in value) + ']'
+            elif (valueType in (TrackedDict, TrackedSet) and id(value.owner) in nodeIndexes and
+                  not [item for item in (valueType is TrackedSet and value or itervalues(value))
+                       if type(item) not in STATIC_TYPES]):
+                return constant(value)
+
+            dynamic.append(True)
+            return 'cloneValue(%s, memo)' % constant(value)
+
+        lines = ["def clone():"]
+        for index, node in enumerate(nodes):
+            namespace['class%d' % index] = node.__class__
+            lines.append("    node%d = class%d.__new__(class%d)" % (index, index, index))
+
+        assignments = []
+        dynamic = []
+        for index, node in enumerate(nodes):
+            slots, attributes = cls.__slotValues(node)
+            for name, value in slots:
+                assignments.append("    node%d.%s = %s" % (index, name, reference(value, dynamic)))
+            for name, value in attributes:
+                assignments.append("    node%d.__dict__[%r] = %s" % (index, name, reference(value, dynamic)))
+
+        if dynamic:
+            references = ', '.join(nodeIndexes[nodeId] is None and 'None' or 'node%d' % nodeIndexes[nodeId]
+                                   for nodeId in namespace['prototypeIds'])
+            lines.append("    memo = dict(zip(prototypeIds, (%s, )))" % references)
+        lines.extend(assignments)
+        lines.append("    return node0")
+
+        exec(compile("\n".join(lines), "<prototype %s>" % element.__class__.__name__, "exec"), namespace)
+        return namespace['clone']
@@ -35,8 +35,13 @@ class Table(Base.WebElement):
     """
         Defines a table webelement - which is designed to be used as an actual table of data (not for alignment of
         child elements), you can quickly fill it with data, and it will take care of the display for you.
+
+        When columnar is set rows added using addRows are stored as plain tuples of values (in column order) and
+        rendered straight from the data - the row and cell elements are only created for rows whose cells are
+        accessed using rows, row, cell, setCell or actualCell.
     """
-    __slots__ = ('alignHeaders', 'header', 'rows', '_columns', 'columnMap', 'uniformStyle')
+    __slots__ = ('alignHeaders', 'header', '_rows', '_columns', 'columnMap', 'uniformStyle', 'columnar',
+                 '_columnIndexes', '_separators')
     tagName = "table"
     signals = Base.WebElement.signals + ['rowAdded', 'columnAdded']
     properties = Base.WebElement.properties.copy()
@@ -46,6 +51,7 @@ class Table(Base.WebElement):
     properties['rules'] = {'action':'attribute'}
     properties['alignHeaders'] = {'action':'classAttribute'}
     properties['uniformStyle'] = {'action':'classAttribute'}
+    properties['columnar'] = {'action':'classAttribute', 'type':'bool'}
 
     class Header(Base.WebElement):
         """
@@ -103,22 +109,22 @@ class Table(Base.WebElement):
             """
                 Returns the actual element that is placed within a cell
             """
-            if columnName in self.parent.columns:
-                columnIndex = self.parent.columns.index(columnName)
+            columnIndex = self.parent.columnIndex(columnName)
+            if columnIndex is not None:
                 return self.childElements[columnIndex]
 
         def expandColumn(self, columnName, additionalColumns=1):
             """
                 Will this column of this row act like more then 1 column (removing the next column)
             """
-            if columnName in self.parent.columns:
-                columnIndex = self.parent.columns.index(columnName)
+            columnIndex = self.parent.columnIndex(columnName)
+            if columnIndex is not None:
                 self.childElements[columnIndex].attributes['colspan'] = 1 + additionalColumns
                 for index in xrange(1, additionalColumns + 1):
                     self.childElements[columnIndex + index].replaceWith(Display.Empty())
 
         def __ensureColumn__(self, columnName):
-            if not columnName in self.parent.columns:
+            if self.parent.columnIndex(columnName) is None:
                 self.parent.addColumn(columnName)
 
         def cell(self, columnName):
@@ -142,20 +148,87 @@ class Table(Base.WebElement):
 
             return False
 
+    class DataRow(object):
+        """
+            Renders a row of a columnar table directly from its values, using the start and end tags of a single
+            prototype row and cell per column (see Table.rowTemplate)
+        """
+        __slots__ = ('template', 'values', 'rowNumber')
+
+        def __init__(self, template, values, rowNumber):
+            self.template = template
+            self.values = values
+            self.rowNumber = rowNumber
+
+        def toHTML(self, formatted=False, *args, **kwargs):
+            """
+                Returns the row as html - identical to the html of the equivalent row element
+            """
+            sanitize, rowTags, rowEndTag, cellTags = self.template
+            values = self.values
+            valueCount = len(values)
+            writer = Base.HTMLWriter(formatted)
+            write = writer.write
+            write(rowTags[self.rowNumber % 2])
+            for index, (startTag, endTag) in enumerate(cellTags):
+                write(startTag, 1)
+                if index < valueCount:
+                    value = values[index]
+                    if value != '':
+                        write(unicode(sanitize(value)), 2)
+                write(endTag, 1)
+            write(rowEndTag)
+            return writer.flush()
+
+    class Rows(object):
+        """
+            The rows of a table as a read only sequence of row elements - creating the elements of columnar rows
+            only as they are accessed
+        """
+        __slots__ = ('table', )
+
+        def __init__(self, table):
+            self.table = table
+
+        def __len__(self):
+            return len(self.table._rows)
+
+        def __iter__(self):
+            row = self.table.row
+            for index in range(len(self.table._rows)):
+                yield row(index)
+
+        def __getitem__(self, index):
+            if isinstance(index, slice):
+                row = self.table.row
+                return [row(rowIndex) for rowIndex in range(*index.indices(len(self.table._rows)))]
+
+            return self.table.row(index)
+
     def _create(self, id=None, name=None, parent=None, **kwargs):
         Base.WebElement._create(self, id, name, parent, **kwargs)
 
         header = self.Row('WTableHeader', parent=self)
         self.alignHeaders = ""
         self.header = self.addChildElement(header)
-        self.rows = []
+        self._rows = []
         self._columns = []
+        self._columnIndexes = {}
+        self._separators = []
         self.columnMap = {}
         self.uniformStyle = ""
+        self.columnar = False
         self.addClass('GlobalTable')
 
         self.connect('columnAdded', None, header, 'addChildElement')
 
+    @property
+    def rows(self):
+        """
+            Returns the rows added to the table - always as row elements
+        """
+        return self.Rows(self)
+
     @property
     def columns(self):
         """
@@ -171,12 +244,23 @@ class Table(Base.WebElement):
         if set(columns) != set(self._columns):
             raise ValueError("Setting columns should only be used for reordering.")
 
-        indexes = [self._columns.index(column) for column in columns]
+        indexes = [self._columnIndexes[column] for column in columns]
         self._columns = columns
+        self._columnIndexes = dict((column, index) for index, column in enumerate(columns))
 
         self.header.childElements = [self.header.childElements[index] for index in indexes]
-        for row in self.rows:
-            row.childElements = [row.childElements[index] for index in indexes]
+        for rowNumber, row in enumerate(self._rows):
+            if type(row) == tuple:
+                self._rows[rowNumber] = tuple(row[index] if index < len(row) else '' for index in indexes)
+            else:
+                row.childElements = [row.childElements[index] for index in indexes]
+        self._markDirty()
+
+    def columnIndex(self, columnName):
+        """
+            Returns the position of the given column within each row or None if the table has no such column
+        """
+        return self._columnIndexes.get(columnName)
 
     def addSeparator(self, separatorName=""):
         """
@@ -187,13 +271,24 @@ class Table(Base.WebElement):
         column.attributes['colspan'] = len(self._columns)
         column.addClass("WSeparator")
         column.setText(separatorName)
+        if self.columnar:
+            self._separators.append((len(self._rows), row))
         return column
 
     def addRow(self):
         """
             Adds a new row and then returns it for manipulation
         """
-        rowNumber = len(self.rows)
+        row = self.__createRow(len(self._rows))
+        self._rows.append(row)
+
+        self.emit('rowAdded', row)
+        return row
+
+    def __createRow(self, rowNumber, values=()):
+        """
+            Creates the row element (and its cells) displayed at rowNumber, filling in the cell text from values
+        """
         row = self.addChildElement(self.Row())
         if rowNumber % 2:
             row.addClass('rowlight')
@@ -201,19 +296,31 @@ class Table(Base.WebElement):
             row.addClass('rowdark')
 
         self.connect('columnAdded', None, row, 'addChildElement', self.Column)
-        self.rows.append(row)
 
         for column in self._columns:
             row.addChildElement(self.Column(parent=row, id=column))
+        for column, value in zip(row.childElements, values):
+            column.element.setText(value)
 
-        self.emit('rowAdded', row)
         return row
 
+    def row(self, row):
+        """
+            Returns the row element at the given index - creating it from the stored values for columnar rows
+        """
+        if row < 0:
+            row += len(self._rows)
+        rowElement = self._rows[row]
+        if type(rowElement) == tuple:
+            rowElement = self._rows[row] = self.__createRow(row, rowElement)
+
+        return rowElement
+
     def addColumn(self, columnName, showName=True):
         """
             Adds a column to table (and therefore everyone within it)
         """
-        if not columnName in self._columns:
+        if not columnName in self._columnIndexes:
             column = Table.Header(columnName)
             if self.fullId():
                 column.addClass(self.fullId()[0].upper() + self.fullId()[1:] + columnName.replace(" ", "") + "Header")
@@ -221,6 +328,7 @@ class Table(Base.WebElement):
                 column.attributes['align'] = self.alignHeaders
 
             column.addChildElement(Base.TextNode((showName and (columnName or '')) or ''))
+            self._columnIndexes[columnName] = len(self._columns)
             self._columns.append(columnName)
 
             self.emit('columnAdded', column)
@@ -233,22 +341,22 @@ class Table(Base.WebElement):
         """
             Returns the actual cell element at row/column
         """
-        if len(self.rows) >= row:
-            return self.rows[row].actualCell(column)
+        if len(self._rows) >= row:
+            return self.row(row).actualCell(column)
 
     def cell(self, row, column):
         """
             Returns the element set at row/column
         """
-        if len(self.rows) > row:
-            return self.rows[row].cell(column)
+        if len(self._rows) > row:
+            return self.row(row).cell(column)
 
     def setCell(self, row, column, element):
         """
             Sets a cell at row/column
         """
-        if len(self.rows) > row:
-            return self.rows[row].setCell(column, element)
+        if len(self._rows) > row:
+            return self.row(row).setCell(column, element)
 
         return False
 
@@ -261,20 +369,87 @@ class Table(Base.WebElement):
 
     def addRows(self, rows):
         """
-            adds multiple rows, where the column data is defined in nested tuples
+            adds multiple rows, where the column data is defined in nested tuples (or a dictionary per row).
+            rows can be any iterable - including a generator - and is consumed a row at a time.
         """
+        if not self.columnar or 'rowAdded' in (self.connections or ()):
+            for row in rows:
+                newRow = self.addRow()
+                if type(row) in (list, tuple):
+                    for col, value in row:
+                        newRow.cell(col).setText(value)
+                else:
+                    for col, value in iteritems(row):
+                        newRow.cell(col).setText(value)
+            return
+
+        columnIndexes = self._columnIndexes
+        addRow = self._rows.append
         for row in rows:
-            newRow = self.addRow()
-            if type(row) in (list, tuple):
-                for col, value in row:
-                    newRow.cell(col).setText(value)
-            else:
-                for col, value in iteritems(row):
-                    newRow.cell(col).setText(value)
+            values = [''] * len(self._columns)
+            if type(row) not in (list, tuple):
+                row = iteritems(row)
+            for col, value in row:
+                index = columnIndexes.get(col)
+                if index is None:
+                    self.addColumn(col)
+                    index = columnIndexes[col]
+                    values.extend([''] * (index + 1 - len(values)))
+                values[index] = value
+            addRow(tuple(values))
+        self._markDirty()
+
+    def rowTemplate(self):
+        """
+            Returns what is needed to render a columnar row without creating its elements: the sanitize method,
+            the start tags of even and odd rows, the row end tag, and the start and end tag of each cell
+        """
+        rowTags = []
+        for rowClass in ('rowdark', 'rowlight'):
+            row = self.Row(parent=self)
+            row.addClass(rowClass)
+            row._render()
+            rowTags.append(row.startTag())
+
+        cellTags = []
+        for column in self._columns:
+            cell = self.Column(parent=row, id=column)
+            cell._render()
+            cellTags.append((cell.startTag(), cell.endTag()))
+
+        return (self.sanitize, tuple(rowTags), row.endTag(), cellTags)
+
+    def _renderedChildren(self):
+        """
+            Renders columnar rows straight from their values - in the order they were added along with any
+            separators and rows whose elements were created
+        """
+        if not self.columnar or not self._rows:
+            return self._childElements
+
+        separators = self._separators
+        body = set(id(separator) for position, separator in separators)
+        body.update(id(row) for row in self._rows if type(row) != tuple)
+        children = [child for child in self._childElements if id(child) not in body]
+
+        template = None
+        separatorIndex = 0
+        for rowNumber, row in enumerate(self._rows):
+            while separatorIndex < len(separators) and separators[separatorIndex][0] <= rowNumber:
+                children.append(separators[separatorIndex][1])
+                separatorIndex += 1
+            if type(row) == tuple:
+                if template is None:
+                    template = self.rowTemplate()
+                row = self.DataRow(template, row, rowNumber)
+            children.append(row)
+        children.extend(separator for position, separator in separators[separatorIndex:])
+
+        return children
 
     def joinRows(self, columnName, rows):
         """
-            Will join a column across the given rows
+            Will join a column across the given rows (row elements - for a columnar table use table.row(index))
         """
         row = rows.pop(0)
         row.actualCell(columnName).attributes['rowspan'] = len(rows) + 1
@@ -286,6 +461,8 @@ Factory.addProduct(Table)
 Column = Table.Column
 Row = Table.Row
 Header = Table.Header
+DataRow = Table.DataRow
+Rows = Table.Rows
 
 
 class StoredValue(Layout.Box):
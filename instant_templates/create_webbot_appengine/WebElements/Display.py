@@ -576,20 +576,12 @@ Factory.addProduct(StatusIndicator)
 
 class CacheElement(Base.WebElement):
     """
-        Renders an element once caches the result and returns the cache every time after
+        Renders an element once caches the result and returns the cache until it or one of its children is modified
     """
-    __slots__ = ('__cachedHTML__')
+    __slots__ = ()
 
     def _create(self, id=None, name=None, parent=None, **kwargs):
         Base.WebElement._create(self, id, name, parent, **kwargs)
-        self.__cachedHTML__ = None
-
-    def toHTML(self, formatted=False, *args, **kwargs):
-        """
-            Overrides toHTML to only render itself once, and return a cached copy on subsequent calls.
-        """
-        if self.__cachedHTML__ is None:
-            self.__cachedHTML__ = Base.WebElement.toHTML(self, formatted, *args, **kwargs)
-        return self.__cachedHTML__
+        self.enableRenderCache()
 
 Factory.addProduct(CacheElement)
@@ -41,7 +41,7 @@ class ValueElement(DOM.Input):
     tagName = ""
     tagSelfCloses = False
     allowsChildren = True
-    __slots__ = ('key', '_value')
+    __slots__ = ('_value')
     signals = DOM.Input.signals + ['valueChanged']
     properties = DOM.Input.properties.copy()
     properties['text'] = {'action':'setValue'}
@@ -91,6 +91,7 @@ class ValueElement(DOM.Input):
         self._value = ''
         self.attributes['value'] = CallBack(self, 'value')
 
+    @Base.bindsOwnValue
     def insertVariables(self, variableDict=None):
         """
             Updates the value based on a dictionary, popping it out afterwards
@@ -99,27 +100,35 @@ class ValueElement(DOM.Input):
             variableDict = {}
 
         DOM.Input.insertVariables(self, variableDict)
+        self._insertValue(variableDict)
+
+    def _insertValue(self, variableDict):
+        """
+            Updates the value (but not that of child elements) based on a dictionary, popping it out afterwards
+        """
+        id = self._id
+        name = self._name
+        fullId = self.fullId()
+        fullName = self.fullName()
+        if not (self.key or fullId in variableDict or id in variableDict or fullName in variableDict or
+                name in variableDict):
+            return
 
         value = None
         removeFromDictionary = True
         if self.key:
             value = DictUtils.getNestedValue(variableDict, self.key)
-        if self.fullId() and value is None:
-            value = variableDict.get(self.fullId(), None)
-            if value and type(value) in (list, tuple):
-                if len(value) > 1:
-                    removeFromDictionary = False
-                value = value.pop(0)
-        if self.id and value is None:
-            value = variableDict.get(self.id, None)
-            if value and type(value) in (list, tuple):
-                if len(value) > 1:
-                    removeFromDictionary = False
-                value = value.pop(0)
-        if self.name and value is None:
-            value = variableDict.get(self.fullName(), None)
+        for identifier in (fullId, id):
+            if identifier and value is None:
+                value = variableDict.get(identifier, None)
+                if value and type(value) in (list, tuple):
+                    if len(value) > 1:
+                        removeFromDictionary = False
+                    value = value.pop(0)
+        if name and value is None:
+            value = variableDict.get(fullName, None)
             if value is None:
-                value = variableDict.get(self.name, None)
+                value = variableDict.get(name, None)
 
             if value and type(value) in (list, tuple):
                 if len(value) > 1:
@@ -129,12 +138,14 @@ class ValueElement(DOM.Input):
             self.setValue(value)
 
         if removeFromDictionary:
-            self._removeFromDictionary(variableDict)
+            for key in (id, name, fullId, fullName):
+                variableDict.pop(key, False)
 
     def _removeFromDictionary(self, dictionary):
         for key in [self.id, self.name, self.fullId(), self.fullName()]:
             dictionary.pop(key, False)
 
+    @Base.bindsOwnValue
     def exportVariables(self, exportedVariables=None, flat=False):
         """
             return the used webelements variables as a dictionary
@@ -142,11 +153,19 @@ class ValueElement(DOM.Input):
         if exportedVariables is None:
             exportedVariables = {}
 
+        self._exportValue(exportedVariables, flat)
+        DOM.Input.exportVariables(self, exportedVariables, flat)
+        return exportedVariables
+
+    def _exportValue(self, exportedVariables, flat=False):
+        """
+            Adds the value (but not that of child elements) to the exported variables
+        """
         if flat:
             if self.name:
                 prevValue = exportedVariables.get(self.name, None)
                 if type(prevValue) == list:
-                    prevValue.append(self.value)
+                    prevValue.append(self.value())
                 elif prevValue is not None:
                     exportedVariables[self.name] = [prevValue, self.value()]
                 else:
@@ -157,9 +176,6 @@ class ValueElement(DOM.Input):
             if self.key:
                 DictUtils.setNestedValue(exportedVariables, self.key, self.value())
 
-        DOM.Input.exportVariables(self, exportedVariables, flat)
-        return exportedVariables
-
     def setValue(self, value, safe=False):
         """
             Sets the value associated with the element
@@ -168,6 +184,7 @@ class ValueElement(DOM.Input):
             value = self.sanitize(value)
         if value != self._value:
             self._value = value
+            self._markDirty()
             self.emit('valueChanged', value)
 
     def value(self):
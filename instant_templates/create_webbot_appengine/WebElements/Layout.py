@@ -48,9 +48,9 @@ class Stack(Base.WebElement):
     def __setChildren__(self):
         visibleElement = self.visibleElement()
         if visibleElement:
-            self._childElements = [self.visibleElement()]
+            self.childElements = [visibleElement]
         else:
-            self._childElements = None
+            self.childElements = None
 
     def setVisibleElement(self, element):
         """
@@ -102,6 +102,15 @@ class Box(DOM.Div):
     """
     __slots__ = ()
 
+    def _addRenderedContainer(self, container):
+        """
+            Places a container created at render time within the element - without emitting childAdded or
+            indexing it, as it is only part of the rendered html
+        """
+        container.parent = self
+        self.childElements.append(container)
+        return container
+
 Factory.addProduct(Box)
 
 
@@ -130,8 +139,9 @@ class Horizontal(Box):
             self.childElements.append(childElement)
             return
         if not childElement._tagName:
-            container = Box.addChildElement(self, Box())
+            container = Box()
             container.addChildElement(childElement)
+            self._addRenderedContainer(container)
         else:
             if not childElement.isBlockElement():
                 childElement.addClass("WBlock")
@@ -142,17 +152,19 @@ class Horizontal(Box):
                (container._style and container.style.get("float", None)):
             container.addClass("WLeft")
 
-    def toHTML(self, formatted=False, *args, **kwargs):
+    def _renderedChildren(self):
         """
-            Overrides toHTML to modify each child and force it into a horizontal layout.
+            Overrides _renderedChildren to modify each child and force it into a horizontal layout.
         """
         oldChildElements = self.childElements
-        self.reset()
+        self._childElements = []
         for childElement in oldChildElements:
             self.__modifyChild__(childElement)
-        returnValue = Box.toHTML(self, formatted=formatted, *args, **kwargs)
+        renderedChildren = self._childElements
         self._childElements = oldChildElements
-        return returnValue
+        for childElement in oldChildElements:
+            childElement.parent = self
+        return renderedChildren
 
 Factory.addProduct(Horizontal)
 
@@ -179,19 +191,21 @@ class Vertical(Box):
             container = Box()
             container.addClass("WClear")
             container.addChildElement(childElement)
-            return Box.addChildElement(self, container)
+            return self._addRenderedContainer(container)
 
-    def toHTML(self, formatted=False, *args, **kwargs):
+    def _renderedChildren(self):
         """
-            Overrides toHTML to modify each child and force it into a vertical layout.
+            Overrides _renderedChildren to modify each child and force it into a vertical layout.
         """
         oldChildElements = self.childElements
-        self.reset()
+        self._childElements = []
         for childElement in oldChildElements:
             self.__modifyChild__(childElement)
-        returnValue = Box.toHTML(self, formatted=formatted, *args, **kwargs)
+        renderedChildren = self._childElements
         self._childElements = oldChildElements
-        return returnValue
+        for childElement in oldChildElements:
+            childElement.parent = self
+        return renderedChildren
 
 Factory.addProduct(Vertical)
 
@@ -296,9 +310,8 @@ class Field(Horizontal):
         if self._required:
             self.label.addChildElement(self._required) # Ensures the symbol is farthest element right
 
-        if not self.manualValidate:
-            for validator in self.validation:
-                self.validation.validate()
+        if not self.manualValidate and self.validation.childElements:
+            self.validation.validate()
 
     def insertVariables(self, variableDict=None):
         """
@@ -306,9 +319,8 @@ class Field(Horizontal):
         """
         Horizontal.insertVariables(self, variableDict)
 
-        if not self.manualValidate:
-            for validator in self.validation:
-                self.validation.validate()
+        if not self.manualValidate and self.validation.childElements:
+            self.validation.validate()
 
     def setText(self, text):
         """
@@ -27,6 +27,9 @@
 
 import sys
 
+# True when the built-in dict (and therefore keyword arguments) keeps the order items are added in
+ORDERED_DICTS = sys.version_info >= (3, 7)
+
 if sys.version > '3':
     import urllib
     from urllib import parse
@@ -23,6 +23,38 @@
 from .IteratorUtils import iterableLength
 from .MultiplePythonSupport import *
 
+
+class PageSource(object):
+    """
+        Defines the protocol used by the PositionController to retrieve items a page at a time - allowing very large
+        data sources (such as datastore or sql queries) to be paged through while only fetching the current page.
+
+        Data sources implement:
+            page(offset, limit, cursor=None) - returning (items, nextCursor, areMore) for up to limit items starting
+                                               at offset, where cursor (if given) is the nextCursor that was returned
+                                               for the page that ended at offset. nextCursor and areMore may be None
+                                               if not supported or not known.
+            count() - returning (length, exact), length being None if it is not known and exact False if it is only
+                      an approximation (such as a count limited to the first thousand results).
+
+        This base implementation pages through anything that supports slicing and iterableLength (lists, queries)
+    """
+    def __init__(self, items):
+        self.items = items
+
+    def page(self, offset, limit, cursor=None):
+        """
+            Returns the slice of items starting at offset
+        """
+        return (self.items[offset:offset + limit], None, None)
+
+    def count(self):
+        """
+            Returns the exact number of items
+        """
+        return (iterableLength(self.items), True)
+
+
 class PositionController(object):
     """A simple way to control paging and positon within lists
 
@@ -35,48 +67,97 @@ class PositionController(object):
 
             moreResults = positionController.areMore
             lessResults = positionController.arePrev
+
+        items can also be a PageSource - in which case only the current page of items is fetched and the list of pages
+        is computed on demand.
+
+        numberOfPages counts a partly filled last page as a page (95 items at 10 per page are 10 pages, the last
+        starting at lastPageIndex 90) - exactly itemsPerPage * n items are n pages.
     """
 
-    def __init__(self, items=[], startIndex=0, itemsPerPage=25, pagesShownAtOnce=15):
+    def __init__(self, items=[], startIndex=0, itemsPerPage=25, pagesShownAtOnce=15, cursor=None):
         """
             Constructs a new Position Controller Object:
 
             allItems = a python list, you are trying to retrieve sections from
             startIndex = where to start getting list elements from
             itemsPerPage = How many list elements to get on each page
+            cursor = the cursor returned by the data source for the page ending at startIndex (if any)
 
             usage:
                 positionController = PositionController(databaseQueryResults, startIndex, )
         """
         self.pagesShownAtOnce = pagesShownAtOnce
         self.allItems = items
-        self.length = iterableLength(self.allItems)
-        self.empty = not self.length
         self.itemsPerPage = itemsPerPage
+        if isinstance(items, PageSource):
+            self.source = items
+        else:
+            self.source = PageSource(items)
+
+        self.length, self.exactLength = self.source.count()
+        self.setIndex(startIndex, cursor)
 
+    @property
+    def allPages(self):
+        """
+            Returns the start index of every page - built on demand, as data sources can span a great many pages
+        """
+        return [self.pageIndex(page) for page in range(self.numberOfPages)]
+
+    def __countPages(self):
+        """
+            Sets numberOfPages and lastPageIndex from the number of items (known of)
+        """
         self.numberOfPages = self.length // self.itemsPerPage
-        if self.numberOfPages < (float(self.length) // float(self.itemsPerPage)):
+        if self.length % self.itemsPerPage:
             self.numberOfPages += 1
 
-        self.allPages = []
-        for count in range(self.numberOfPages):
-            self.allPages.append(self.pageIndex(count))
-
         self.lastPageIndex = 0
         if self.length > self.itemsPerPage:
-            self.lastPageIndex = self.allPages[-1]
-
-        self.setIndex(startIndex)
+            self.lastPageIndex = self.itemsPerPage * (self.numberOfPages - 1)
 
-    def setIndex(self, index):
+    def setIndex(self, index, cursor=None):
         """
             Sets the index to start returning results from:
                 index - the offset to start at
+                cursor - the data sources cursor for the page ending at index (if known)
         """
+        if self.exactLength and index > self.length:
+            index = 0
+            cursor = None
+
+        items, self.nextCursor, areMore = self.source.page(index, self.itemsPerPage, cursor)
+        if not self.exactLength:
+            items = list(items)
+            if index and not items:
+                # the items end before index - so the last page that is not empty holds the last of them
+                while index and not items:
+                    self.length = index
+                    self.__countPages()
+                    index = self.lastPageIndex
+                    items, self.nextCursor, areMore = self.source.page(index, self.itemsPerPage)
+                    items = list(items)
+                cursor = None
+                areMore = False
+
+        self.cursor = cursor
         self.startIndex = index
-        if self.startIndex > self.length:
-            self.startIndex = 0
+        itemsThrough = index + len(items)
+        if areMore is None:
+            if self.exactLength:
+                areMore = itemsThrough < self.length
+            else:
+                areMore = itemsThrough - index >= self.itemsPerPage
+
+        if not areMore:
+            self.length = itemsThrough
+            self.exactLength = True
+        elif not self.exactLength and (self.length is None or self.length <= itemsThrough):
+            self.length = itemsThrough + 1
 
+        self.__countPages()
+        self.empty = not self.length
         self.startPosition = self.startIndex + 1
         self.arePrev = bool(self.startPosition > 1)
 
@@ -86,14 +167,13 @@ class PositionController(object):
         else:
             self.pageNumber = self.page + 1
 
-        self.nextPageIndex = self.startIndex + self.itemsPerPage
-        if self.nextPageIndex >= self.length:
-            self.nextPageIndex = self.length
-            self.areMore = False
+        self.areMore = areMore
+        if areMore:
+            self.nextPageIndex = self.startIndex + self.itemsPerPage
         else:
-            self.areMore = True
+            self.nextPageIndex = self.length
 
-        self.currentPageItems = self.allItems[self.startIndex : self.startIndex + self.itemsPerPage]
+        self.currentPageItems = items
 
         self.prevPageIndex = self.startPosition - (self.itemsPerPage + 1)
         if self.prevPageIndex < 0:
@@ -103,7 +183,7 @@ class PositionController(object):
         """
             Selects the next available page
         """
-        self.setIndex(self.nextPageIndex)
+        self.setIndex(self.nextPageIndex, self.nextCursor)
 
     def prevPage(self):
         """
@@ -128,7 +208,7 @@ class PositionController(object):
         """
         pageIndex = self.itemsPerPage * page
         if pageIndex > self.length:
-            pageIndex = self.last()
+            pageIndex = self.lastPageIndex
 
         return pageIndex
 
@@ -149,4 +229,4 @@ class PositionController(object):
                 pageStart -= pageEnd - self.numberOfPages
             pageEnd = self.numberOfPages
 
-        return self.allPages[pageStart:pageEnd]
+        return [self.pageIndex(page) for page in range(pageStart, pageEnd)]
@@ -20,6 +20,10 @@
     Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 '''
 
+import hashlib
+import os
+import sys
+import threading
 import types
 
 from . import DOM
@@ -90,33 +94,154 @@ class ResourceFile(Base.WebElement):
 Factory.addProduct(ResourceFile)
 
 
+class ScriptBundle(object):
+    """
+        A javascript file made up of the jsFunctions of a set of element classes - named after the classes it contains
+        and a hash of its content, so that it can be served with a long cache lifetime instead of being repeated inline
+        on every page. As the name lists its classes any process that has them imported can rebuild the bundle
+        from it (see fromFileName) - alternatively bundles can be written to a static directory using write.
+    """
+    __slots__ = ('objectTypes', 'content', 'hash', 'fileName')
+    bundles = {}
+    maxBundles = 256
+    _lock = threading.Lock()
+
+    def __init__(self, objectTypes):
+        self.objectTypes = tuple(sorted(objectTypes, key=self.typeName))
+        self.content = "".join(ScriptContainer.classFunctions(objectType) for objectType in self.objectTypes)
+        self.hash = hashlib.md5(self.content.encode('utf8')).hexdigest()[:16]
+        self.fileName = "%s-%s.js" % (self.hash, ",".join(self.typeName(objectType) for objectType in self.objectTypes))
+
+    @staticmethod
+    def typeName(objectType):
+        """
+            Returns the name a class is listed under in the file name of a bundle (module:class)
+        """
+        return "%s:%s" % (objectType.__module__, getattr(objectType, '__qualname__', objectType.__name__))
+
+    @classmethod
+    def register(cls, objectTypes):
+        """
+            Returns the bundle containing the jsFunctions of objectTypes - built once for each tuple of classes
+        """
+        key = (tuple(objectTypes), Base.Settings.STATIC_URL)
+        bundle = cls.bundles.get(key)
+        if bundle is None:
+            bundle = cls([objectType for objectType in objectTypes if getattr(objectType, 'jsFunctions', None)])
+            with cls._lock:
+                if len(cls.bundles) >= cls.maxBundles:
+                    cls.bundles.clear()
+                cls.bundles[key] = bundle
+
+        return bundle
+
+    @classmethod
+    def fromFileName(cls, fileName):
+        """
+            Rebuilds the bundle with the given file name - returning None if the name is not one of a bundle, lists a
+            class that is not loaded by this process, or the content of the bundle has changed since it was named
+        """
+        if fileName.endswith(".js"):
+            fileName = fileName[:-3]
+        bundleHash, separator, typeNames = fileName.partition("-")
+        if not typeNames:
+            return None
+
+        objectTypes = []
+        for typeName in typeNames.split(","):
+            moduleName, separator, className = typeName.partition(":")
+            objectType = sys.modules.get(moduleName) # only classes already imported are looked up
+            for name in className.split("."):
+                objectType = getattr(objectType, name, None)
+            if not isinstance(objectType, type) or not getattr(objectType, 'jsFunctions', None):
+                return None
+            objectTypes.append(objectType)
+
+        bundle = cls.register(objectTypes)
+        if bundle.hash != bundleHash:
+            return None
+
+        return bundle
+
+    def write(self, directory):
+        """
+            Writes the bundle into directory (if it is not already there) - returning the path of the file
+        """
+        path = os.path.join(directory, self.fileName)
+        if not os.path.exists(path):
+            with open(path, 'wb') as bundleFile:
+                bundleFile.write(self.content.encode('utf8'))
+
+        return path
+
+
 class ScriptContainer(DOM.Script):
     """
         All scripts should be stored in a Script Box object
     """
-    __slots__ = ('_scripts', 'usedObjects')
+    __slots__ = ('_scripts', 'usedObjects', 'bundleURL')
     displayable = False
     properties = DOM.Script.properties.copy()
     properties['script'] = {'action':'addScript'}
+    properties['bundleURL'] = {'action':'classAttribute'}
+    _classFunctions = {}
 
     def _create(self, id=None, name=None, parent=None, **kwargs):
         Base.WebElement._create(self)
         self.attributes['language'] = 'javascript'
         self.attributes['type']  = 'text/javascript'
-        self._scripts = []
+        self._scripts = OrderedDict()
         self.usedObjects = []
+        self.bundleURL = None
 
     def content(self, formatted=False, *args, **kwargs):
         """
             Overrides the base content method to return the javascript associated with the scriptcontainer
         """
-        scriptContent = ";".join([interpretAsString(script) for script in self.scripts()])
+        return "".join(self.contentFragments(formatted, *args, **kwargs))
 
-        for objectType in self.usedObjects:
-            for function in objectType.jsFunctions:
-                scriptContent += self.jsFunctionAsString(getattr(objectType, function))
+    def contentFragments(self, formatted=False, *args, **kwargs):
+        """
+            Overrides contentFragments to yield the fragments of each script without joining them
+        """
+        separator = ""
+        for script in self._scripts:
+            if separator:
+                yield separator
+            separator = ";"
+            if isinstance(script, ClientSide.Script):
+                for fragment in script.fragments():
+                    yield fragment
+            else:
+                yield interpretAsString(script)
+
+        if not self.bundleURL:
+            for objectType in self.usedObjects:
+                yield self.classFunctions(objectType)
+
+    def startTag(self):
+        """
+            Overrides startTag to reference the bundle of used jsFunctions before the inline scripts, if a bundleURL
+            (a url with a %s placeholder for the bundle's file name) is set
+        """
+        startTag = DOM.Script.startTag(self)
+        bundle = self.bundle()
+        if bundle:
+            return ('<script src="%s" type="text/javascript"></script>' % (self.bundleURL % bundle.fileName, ) +
+                    startTag)
+
+        return startTag
 
-        return scriptContent
+    def bundle(self):
+        """
+            Returns the ScriptBundle of the jsFunctions used within the container, or None if it is not bundling them
+            (no bundleURL is set) or none are used
+        """
+        if not self.bundleURL or not self.usedObjects:
+            return None
+
+        bundle = ScriptBundle.register(self.usedObjects)
+        return bundle.objectTypes and bundle or None
 
     def addJSFunctions(self, objectType):
         """
@@ -125,7 +250,23 @@ class ScriptContainer(DOM.Script):
         if not objectType in self.usedObjects:
             self.usedObjects.append(objectType)
 
-    def jsFunctionAsString(self, jsFunction):
+    @classmethod
+    def classFunctions(cls, objectType):
+        """
+            Returns the javascript implementation of all the jsFunctions of a class - generated once per class
+            (and static url, which the functions may reference)
+        """
+        key = (objectType, Base.Settings.STATIC_URL)
+        functions = cls._classFunctions.get(key)
+        if functions is None:
+            functions = "".join([cls.jsFunctionAsString(getattr(objectType, function))
+                                 for function in objectType.jsFunctions])
+            cls._classFunctions[key] = functions
+
+        return functions
+
+    @staticmethod
+    def jsFunctionAsString(jsFunction):
         """
             Creates and returns a jsFunction implementation based on a pased in python function representation
         """
@@ -170,17 +311,16 @@ class ScriptContainer(DOM.Script):
 
     def addScript(self, script):
         """
-            Adds a script to the container
+            Adds a script to the container (scripts already in the container keep their original position)
         """
         if not script in self._scripts:
-            self._scripts.append(script)
+            self._scripts[script] = True
 
     def removeScript(self, script):
         """
             Removes a script that has been passed into the container
         """
-        if script in self._scripts:
-            self._scripts.remove(script)
+        self._scripts.pop(script, None)
 
     def shown(self):
         """
@@ -192,6 +332,6 @@ class ScriptContainer(DOM.Script):
         """
             Returns a list of all passed in scripts
         """
-        return self._scripts
+        return list(self._scripts)
 
 Factory.addProduct(ScriptContainer)
@@ -121,6 +121,8 @@ def interpretAsString(value):
     call = getTypeDict(type(value), None)
     if call:
         return call(value)
+    elif isinstance(value, (list, tuple, set)):
+        return convertIterableToString(value)
     elif not value:
         return None
     elif isinstance(value, dict):
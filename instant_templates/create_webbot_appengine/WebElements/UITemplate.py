@@ -20,8 +20,17 @@
     Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 '''
 
+import hashlib
+import os
+import sys
+import threading
 from xml.dom import minidom
 
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
 from . import shpaml
 from .StringUtils import interpretFromString
 from .MultiplePythonSupport import *
@@ -30,11 +39,14 @@ from .MultiplePythonSupport import *
 XML = 0
 SHPAML = 1
 
+VERSION = 1 # increase whenever the templates produced for the same source change (invalidates the disk cache)
+cacheDirectory = os.environ.get('WEBBOT_TEMPLATE_CACHE') # where compiled templates are persisted (if set)
+
 class Template(object):
     """
         A very memory efficient representation of a user interface template
     """
-    __slots__ = ('create', 'accessor', 'id', 'name', 'childElements', 'properties')
+    __slots__ = ('create', 'accessor', 'id', 'name', 'childElements', 'properties', 'builders')
 
     def __init__(self, create, accessor="", id="", name="", childElements=None, properties=()):
         self.create = create
@@ -43,12 +55,20 @@ class Template(object):
         self.name = name
         self.childElements = childElements
         self.properties = properties
+        self.builders = None # the functions factories compiled this template into (see Factory.builder)
 
     def __getstate__(self):
         return (self.create, self.accessor, self.id, self.name, self.childElements, self.properties)
 
     def __setstate__(self, state):
         (self.create, self.accessor, self.id, self.name, self.childElements, self.properties) = state
+        self.builders = None
+
+    def __deepcopy__(self, memo):
+        """
+            Templates are never modified once created - so copies of the elements built from them share it
+        """
+        return self
 
     def __eq__(self, other):
         if (self.create != other.create or self.accessor != other.accessor or self.id != other.id or
@@ -71,27 +91,94 @@ def fromFile(templateFile, formatType=SHPAML):
         Returns a parsable dictionary representation of the interface:
             templateFile - a file containing an xml representation of the interface
     """
-    if formatType == XML:
-        return __createTemplateFromXML(minidom.parse(templateFile).childNodes[0])
-    elif formatType == SHPAML:
-        with open(templateFile) as openFile:
-            return fromSHPAML(openFile.read())
+    with open(templateFile, formatType == XML and 'rb' or 'r') as openFile:
+        source = openFile.read()
+
+    return __cached(formatType, source)
 
 def fromXML(xml):
     """
         Returns a parsable dictionary representation of the interface:
             xml - a string containing an xml representation of the interface
     """
-    xmlStructure = minidom.parseString(xml)
-    return __createTemplateFromXML(xmlStructure.childNodes[0])
+    return __cached(XML, xml)
 
 def fromSHPAML(shpamlTemplate):
     """
         Returns a parsable dictionary representation of the interface:
             shpaml - a string containing a shpaml representation of the interface
     """
-    xmlStructure = minidom.parseString(shpaml.convert_text(shpamlTemplate))
-    return __createTemplateFromXML(xmlStructure.childNodes[0])
+    return __cached(SHPAML, shpamlTemplate)
+
+def compileTemplate(source, formatType=SHPAML):
+    """
+        Compiles the source of a template into its Template representation without using the disk cache
+    """
+    if formatType == SHPAML:
+        source = shpaml.convert_text(source)
+
+    return __createTemplateFromXML(minidom.parseString(source).childNodes[0])
+
+def cacheKey(*parts):
+    """
+        Returns the name a compiled template is stored under in the disk cache - based on the template VERSION,
+        the python version (pickles are not shared between major versions) and parts
+    """
+    key = hashlib.sha1(("%s %s" % (VERSION, sys.version_info[0])).encode('utf8'))
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = unicode(part).encode('utf8')
+        key.update(b"\x00" + part)
+    return key.hexdigest()
+
+def __cached(formatType, source):
+    """
+        Returns the compiled template for source from the disk cache - compiling and storing it if it is not there.
+        Entries are keyed on the content alone so that copies of a template (or checkouts that reset the mtime)
+        share them.
+    """
+    if not cacheDirectory:
+        return compileTemplate(source, formatType)
+
+    path = os.path.join(cacheDirectory, cacheKey(formatType, source) + ".template")
+    try:
+        with open(path, 'rb') as cacheFile:
+            return pickle.load(cacheFile)
+    except Exception: # a missing, truncated or incompatible entry is simply compiled again
+        pass
+
+    template = compileTemplate(source, formatType)
+    temporaryPath = "%s.%d.%d" % (path, os.getpid(), threading.current_thread().ident)
+    try:
+        if not os.path.isdir(cacheDirectory):
+            os.makedirs(cacheDirectory)
+        with open(temporaryPath, 'wb') as cacheFile:
+            pickle.dump(template, cacheFile, pickle.HIGHEST_PROTOCOL)
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temporaryPath, path)
+    except (IOError, OSError):
+        pass
+
+    return template
+
+def build(directory, appDirectories=(".", ), extensions={'.wui':SHPAML}):
+    """
+        Compiles every template (files with one of the given extensions) found within appDirectories into the disk
+        cache at directory, so that processes sharing that cache never parse a template. Returns the number compiled.
+    """
+    global cacheDirectory
+    cacheDirectory = directory
+    compiled = 0
+    for appDirectory in appDirectories:
+        for root, directories, files in os.walk(appDirectory):
+            for fileName in files:
+                formatType = extensions.get(os.path.splitext(fileName)[1])
+                if formatType is not None:
+                    fromFile(os.path.join(root, fileName), formatType)
+                    compiled += 1
+
+    return compiled
 
 def __createTemplateFromXML(xml):
     """
@@ -115,7 +202,10 @@ def __createTemplateFromXML(xml):
         name = name.value
         attributes.removeNamedItem('name')
 
-    properties = tuple(((attribute[0], interpretFromString(attribute[1])) for attribute in attributes.items()))
+    attributes = attributes.items()
+    if not ORDERED_DICTS:
+        attributes = sorted(attributes)
+    properties = tuple(((attribute[0], interpretFromString(attribute[1])) for attribute in attributes))
     if children:
         childNodes = (__createTemplateFromXML(node) for node in children if
                       node.__class__ in (minidom.Element, minidom.Text))
@@ -125,3 +215,12 @@ def __createTemplateFromXML(xml):
 
     return Template(create, accessor, id, name, childElements, properties)
 
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m WebElements.UITemplate cacheDirectory [appDirectory ...]")
+        sys.exit(1)
+
+    from . import UITemplate # the imported module (not __main__) is the one the application uses
+    compiled = UITemplate.build(sys.argv[1], sys.argv[2:] or (".", ))
+    print("Compiled %d templates into %s" % (compiled, sys.argv[1]))
@@ -26,9 +26,11 @@ from itertools import chain
 from WebElements.All import Factory
 from WebElements import UITemplate
 from WebElements.HiddenInputs import HiddenValue
+from WebElements.IteratorUtils import SortedSet
+from . import HTTP
 from . import PageControls
 from .RequestHandler import RequestHandler
-from WebElements.Resources import ResourceFile, ScriptContainer
+from WebElements.Resources import ResourceFile, ScriptBundle, ScriptContainer
 
 try:
     from django.core.context_processors import csrf
@@ -43,7 +45,12 @@ class DynamicForm(RequestHandler):
     template = UITemplate.fromSHPAML("> document")
     elementFactory = Factory
     formatted = False
+    streamed = False # when True the page is returned as a stream of encoded chunks, sending the head right away
+                     # NOTE: the status, headers and cookies are sent with the head - changing them while the rest of
+                     #       the page renders has no effect
     resourceFiles = ('js/WebBot.js', 'stylesheets/Site.css')
+    scriptBundleURL = None # when set (ex: "?scriptBundle=%s") class level javascript is served as a cached file
+    scriptBundleMaxAge = 31536000
     if csrf:
         sharedFields = ('csrfmiddlewaretoken', )
 
@@ -51,13 +58,18 @@ class DynamicForm(RequestHandler):
         """
             Override the response rendering to render the main document structure of the page
         """
+        bundleName = self.scriptBundleURL and request.fields.get('scriptBundle')
+        if bundleName:
+            return self.renderScriptBundle(request, bundleName)
+
         document = self.elementFactory.buildFromTemplate(self.template)
         request.response.scripts =  ScriptContainer()
+        request.response.scripts.bundleURL = self.scriptBundleURL
         request.response.scripts.addScript("\n".join(self.initScripts))
         document.setScriptContainer(request.response.scripts)
         document.setProperty('title', self.title(request))
         document.addChildElement(ResourceFile()).setProperty("file", self.favicon(request))
-        for resourceFile in set(self.requestResourceFiles(request) + self.resourceFiles):
+        for resourceFile in SortedSet(self.requestResourceFiles(request) + self.resourceFiles):
             document.addChildElement(ResourceFile()).setProperty("file", resourceFile)
 
         if csrf:
@@ -68,8 +80,29 @@ class DynamicForm(RequestHandler):
 
         self.modifyDocument(document, request)
 
+        if self.streamed:
+            chunks = document.iterHTML(formatted=self.formatted, encoding=request.response.charset, request=request)
+            head = next(chunks, b"") # rendered before the response is committed so errors still give an error status
+            return self.protectStream(request, chain((head, ), chunks))
+
         return document.toHTML(formatted=self.formatted, request=request)
 
+    def renderScriptBundle(self, request, bundleName):
+        """
+            Returns the content of a script bundle (rebuilt from its name) - with headers allowing it to be cached
+            indefinitely (its name changes whenever its content does)
+        """
+        bundle = ScriptBundle.fromFileName(bundleName)
+        if not bundle:
+            request.response.status = HTTP.Response.Status.NOT_FOUND
+            return self.renderNotFound(request, bundleName)
+
+        request.response.contentType = HTTP.Response.ContentType.JAVASCRIPT
+        request.response['Cache-Control'] = 'public, max-age=%d' % self.scriptBundleMaxAge
+        del request.response['Pragma']
+        del request.response['Expires']
+        return bundle.content
+
     def modifyDocument(self, document, request):
         """
             Override to change the structure of the base document
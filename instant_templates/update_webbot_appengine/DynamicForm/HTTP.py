@@ -22,6 +22,10 @@
 
 import urllib
 from collections import namedtuple
+try:
+    from collections.abc import Iterator
+except ImportError:
+    from collections import Iterator
 from WebElements.MultiplePythonSupport import *
 
 try:
@@ -29,6 +33,11 @@ try:
 except ImportError as e:
     djangoResponse = None
 
+try:
+    from django.http import StreamingHttpResponse as djangoStreamingResponse
+except ImportError as e:
+    djangoStreamingResponse = None
+
 try:
     from google.appengine.api import users as appEngineUsers
 except ImportError as e:
@@ -292,17 +301,34 @@ class Response(object):
         """
         return self._headers[header]
 
+    def isStreamed(self):
+        """
+            Returns True if the content is an iterator of encoded chunks (such as WebElement.iterHTML produces)
+            instead of a single string.
+            NOTE: the status, headers and cookies of a streamed response are sent before its content is produced -
+                  so changes made to them while the stream is consumed are lost
+        """
+        return isinstance(self.content, Iterator)
+
+    def fullContent(self):
+        """
+            Returns the content as a single string - joining (and therefore consuming) the content stream if one is set.
+        """
+        if self.isStreamed():
+            self.content = b"".join(self.content).decode(self.charset)
+
+        return self.content
+
     def serialize(self):
         """
             Returns a plain dictionary of the response for serialization purposes.
         """
-        return {'responseText':self.content, 'status':self.status, 'contentType':self.contentType}
+        return {'responseText':self.fullContent(), 'status':self.status, 'contentType':self.contentType}
 
     def toAppEngineResponse(self, response):
         """
             Passes the contents of this response into the given app engine response object
         """
-        response.out.write(self.content)
         response.set_status(self.status)
         response.headers.add('Content-Type', self.contentType + ";charset=" + self.charset)
 
@@ -312,12 +338,22 @@ class Response(object):
         for cookie in itervalues(self.cookies):
             response.headers.add('Set-Cookie', cookie.toHeader())
 
-    def toDjangoResponse(self, cls=djangoResponse):
+        if self.isStreamed():
+            for chunk in self.content:
+                response.out.write(chunk)
+        else:
+            response.out.write(self.content)
+
+    def toDjangoResponse(self, cls=djangoResponse, streamingCls=djangoStreamingResponse):
         """
             Converts the given response to the Django HTTPResponse object
             cls - the django HTTPResponse class or compatible object type
+            streamingCls - the django StreamingHttpResponse class (or compatible) used when the content is streamed
         """
-        djangoResponse = cls(self.content, self.contentType + ";charset=" + self.charset, self.status)
+        if self.isStreamed() and streamingCls:
+            djangoResponse = streamingCls(self.content, self.contentType + ";charset=" + self.charset, self.status)
+        else:
+            djangoResponse = cls(self.fullContent(), self.contentType + ";charset=" + self.charset, self.status)
         for header, value in iteritems(self._headers):
             djangoResponse[header] = value
 
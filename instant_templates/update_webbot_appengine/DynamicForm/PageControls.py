@@ -28,10 +28,11 @@ from .RequestHandler import RequestHandler
 from WebElements import UITemplate
 from WebElements.All import Factory
 from WebElements import Base
-from WebElements.Base import WebElement, TemplateElement
+from WebElements.Base import WebElement, TemplateElement, Prototype
 from WebElements.Layout import Center, Horizontal, Flow
 from WebElements.Display import Image, Label, FormError
 from WebElements.Resources import ScriptContainer
+from WebElements.Validators import ValidationPlan
 from WebElements.StringUtils import scriptURL
 from WebElements import ClientSide
 
@@ -47,6 +48,7 @@ class PageControl(RequestHandler, WebElement):
     autoReload = False
     silentReload = True
     elementFactory = Factory
+    cachePolicy = None # set to a Caching.CachePolicy to share the rendered output across requests
 
     class ClientSide(WebElement.ClientSide):
 
@@ -167,7 +169,15 @@ class PageControl(RequestHandler, WebElement):
 
     def renderResponse(self, request):
         request = self.request or request
+        if self.cachePolicy and self.cachePolicy.caches(request):
+            return self.cachePolicy.render(self, request, self._renderResponse)
 
+        return self._renderResponse(request)
+
+    def _renderResponse(self, request):
+        """
+            Builds and renders the user interface of the control in response to request
+        """
         ui = self.buildUI(request)
         self.initUI(ui, request)
         if self.autoReload:
@@ -199,6 +209,8 @@ class ElementControl(PageControl):
     """
         Defines a PageControl that is rendered using WebElements
     """
+    validateFields = False # set to True to only process requests when every field validation within the ui passes
+
     def buildUI(self, request):
         return Flow()
 
@@ -210,10 +222,20 @@ class ElementControl(PageControl):
 
     def valid(self, ui, request):
         """
-            The default validation method for all non get requests if validate(requestType) is not defined
+            The default validation method for all non get requests if validate(requestType) is not defined - when
+            validateFields is set every field validation within ui has to pass
         """
+        if self.validateFields:
+            return self.validationPlan(ui).valid()
+
         return True
 
+    def validationPlan(self, ui):
+        """
+            Returns a plan of every field validation within ui - used by valid() when validateFields is set
+        """
+        return ValidationPlan.fromElement(ui)
+
     def validPost(self, ui, request):
         """
             Returns true if the post data is valid
@@ -269,6 +291,12 @@ class TemplateControl(ElementControl):
         NOTE: When subclassing set the template attribute - aka template = UITemplate.fromFile("myFile.wui")
     """
     template = UITemplate.Template("empty")
+    cloneUI = False # set to True to build the template once and copy it on each request
+    hoistStatic = False # set to True to pre-render the static parts of the template (which then can not be changed)
+    cacheValidationPlan = False # set to True to locate the validations within the ui only once per class - only when
+                                # they are in the same place on every request (see invalidateValidationPlan)
+    _prototypes = {}
+    _validationPositions = {}
 
     def __init__(self, id=None, name=None, parent=None, parentHandler=None, initScripts=None, **kwargs):
         ElementControl.__init__(self, id, name, parent, parentHandler, initScripts, **kwargs)
@@ -280,4 +308,54 @@ class TemplateControl(ElementControl):
                 self.registerControl(control.__class__)
 
     def buildUI(self, request):
-        return TemplateElement(template=self.template, factory=self.elementFactory)
+        prototype = self.cloneUI and self.prototype()
+        if not prototype:
+            return TemplateElement(template=self.template, factory=self.elementFactory, hoistStatic=self.hoistStatic)
+
+        return prototype.clone()
+
+    def prototype(self):
+        """
+            Returns the tree built from the template that is copied on each request when cloneUI is set, or None if
+            the template contains page controls (which handle requests of their own, so can not be shared)
+        """
+        key = (self.__class__, self.elementFactory)
+        prototype = self._prototypes.get(key)
+        if prototype is None:
+            element = TemplateElement(template=self.template, factory=self.elementFactory, hoistStatic=self.hoistStatic)
+            prototype = False
+            if not any(isinstance(child, PageControl) for child in element.allChildren()):
+                prototype = Prototype(element)
+            self._prototypes[key] = prototype
+
+        return prototype or None
+
+    def validationPlan(self, ui):
+        """
+            Overrides validationPlan to locate the validations within the ui once per control class (and template)
+            when cacheValidationPlan is set - later requests look them up by position, only walking the ui again if
+            a validation is no longer found at one of them
+        """
+        if not self.cacheValidationPlan:
+            return ElementControl.validationPlan(self, ui)
+
+        plan = None
+        cached = self._validationPositions.get(self.__class__)
+        if cached and cached[0] is self.template:
+            plan = ValidationPlan.fromPositions(ui, cached[1])
+
+        if plan is None:
+            plan = ValidationPlan.fromElement(ui)
+            self._validationPositions[self.__class__] = (self.template, plan.positions(ui))
+
+        return plan
+
+    @classmethod
+    def invalidateValidationPlan(cls):
+        """
+            Forgets where the validations within the ui of the control class (and its subclasses) are - call whenever
+            validations are added, removed, or moved to different positions than on previous requests
+        """
+        for controlClass in list(cls._validationPositions):
+            if issubclass(controlClass, cls):
+                cls._validationPositions.pop(controlClass, None)
@@ -218,6 +218,21 @@ class RequestHandler(object):
         """
         return "Internal Server Error: %s\n%s" % (str(exception), str(traceback.format_exc()))
 
+    def protectStream(self, request, chunks):
+        """
+            Returns a stream of the given encoded chunks that ends with the output of renderInternalError if producing
+            them raises an exception - once a stream has started its status and headers have already been sent,
+            so errors can only be reported within the content
+        """
+        try:
+            for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            error = self.renderInternalError(request, e)
+            if not isinstance(error, bytes):
+                error = error.encode(request.response.charset)
+            yield error
+
     def renderUnauthorized(self, request):
         """
             Defines the response when the user is not authorized to view a section
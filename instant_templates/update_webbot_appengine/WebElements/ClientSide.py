@@ -25,16 +25,62 @@
 '''
 
 import json
+from copy import deepcopy
 
 from .MultiplePythonSupport import *
 
 class Script(object):
-    __slots__ = ('content', 'container')
+    """
+        A piece of client-side javascript - stored as a list of fragments that is only joined into a single string
+        when the content is first used as one, so that building long scripts stays linear
+    """
+    __slots__ = ('_fragments', 'container')
 
     def __init__(self, content, container=None):
-        self.content = content
+        self._fragments = [content]
         self.container = container
 
+    @classmethod
+    def fromFragments(cls, fragments, container=None):
+        """
+            Creates a script made up of the given list of fragments (without joining them)
+        """
+        script = cls("", container)
+        script._fragments = fragments
+        return script
+
+    @property
+    def content(self):
+        fragments = self._fragments
+        if len(fragments) != 1:
+            fragments[:] = ["".join(fragments)]
+        return fragments[0]
+
+    @content.setter
+    def content(self, content):
+        self._fragments = [content]
+
+    def fragments(self):
+        """
+            Returns the list of strings that make up the script
+        """
+        return self._fragments
+
+    def __deepcopy__(self, memo):
+        script = memo[id(self)] = self.fromFragments(list(self._fragments))
+        script.container = deepcopy(self.container, memo) # (copy is redefined below as a client side binding)
+        return script
+
+    def _append(self, fragment):
+        if fragment:
+            self._fragments.append(fragment)
+
+    def _lastCharacter(self):
+        for fragment in reversed(self._fragments):
+            if fragment:
+                return fragment[-1]
+        return ""
+
     def check(self):
         return Block(self)
 
@@ -49,13 +95,13 @@ class Script(object):
         return Script("%s.length" % var(self))
 
     def __enter__(self):
-        self.content += "{"
+        self._append("{")
         return self
 
     def __exit__(self, type, value, traceback):
-        if self.content[-1] != "{":
-            self.content += ";"
-        self.content += "}"
+        if self._lastCharacter() != "{":
+            self._append(";")
+        self._append("}")
 
     def push(self, value):
         return call(self.claim() + "." + push, value)
@@ -70,7 +116,7 @@ class Script(object):
         return Script("%s.%s" % (var(self), name))
 
     def __setattr__(self, name, value):
-        if name in self.__class__.__slots__:
+        if name in self.__class__.__slots__ or name == 'content':
             return object.__setattr__(self, name, value)
         self.content = "%s.%s = %s" % (var(self), name, var(value))
 
@@ -81,9 +127,13 @@ class Script(object):
         if not other:
             return str(self)
 
-        if self.content and self.content[-1] != "{":
-            self.content += ";"
-        self.content += var(other)
+        lastCharacter = self._lastCharacter()
+        if lastCharacter and lastCharacter != "{":
+            self._append(";")
+        if isinstance(other, Script):
+            self._fragments.extend(other.claimFragments())
+        else:
+            self._append(var(other))
         return self
 
     def do(self, name=None, *args):
@@ -92,7 +142,7 @@ class Script(object):
     def RETURN(self, data=None):
         if data is not None:
             return self(Script("return %s" % var(data)))
-        return Script("return %s" % var(self))
+        return Script.fromFragments(["return "] + self.claimFragments())
 
     @property
     def IF(self):
@@ -103,6 +153,14 @@ class Script(object):
             self.container.removeScript(self)
         return self.content
 
+    def claimFragments(self):
+        """
+            Claims the script (as claim does) returning its fragments instead of joining them into a single string
+        """
+        if self.container:
+            self.container.removeScript(self)
+        return self._fragments
+
     def copy(self):
         return self.__class__(self.claim())
 
@@ -214,6 +272,8 @@ def inlineFunction(script, accepts=()):
     """
         returns a javascript inline function
     """
+    if isinstance(script, Script):
+        return Script.fromFragments(["function(%s){" % ",".join(accepts)] + script.claimFragments() + ["}"])
     return Script("function(%s){%s}" % (",".join(accepts), var(script)))
 
 def check(script):
@@ -25,12 +25,14 @@ from . import MethodUtils
 from .MultiplePythonSupport import *
 
 class Connectable(object):
-    __slots__ = ("connections")
+    __slots__ = ("connections", "_dispatch")
 
     signals = []
+    hasListeners = False # set on a class the first time one of its instances is connected to
 
     def __init__(self):
         self.connections = None
+        self._dispatch = None
 
     def emit(self, signal, value=None):
         """
@@ -40,39 +42,88 @@ class Connectable(object):
             signal - the name of the signal to emit, must be defined in the classes 'signals' list.
             value - the value to pass to all connected slot methods.
         """
+        if not self.hasListeners:
+            return []
+
+        connections = self.connections
+        if not connections or signal not in connections:
+            return []
+
+        dispatch = self._dispatch
+        if dispatch is None:
+            dispatch = self._dispatch = {}
+        slots = dispatch.get(signal)
+        if slots is None:
+            slots = dispatch[signal] = self.__compile(connections[signal])
+
         results = []
-        if self.connections and signal in self.connections:
-            for obj, conditions in iteritems(self.connections[signal]):
-                for condition, values in iteritems(conditions):
-                    if condition is None or condition == value:
-                        for overrideValue, slots in iteritems(values):
-                            if overrideValue is not None:
-                                usedValue = overrideValue
-                                if type(overrideValue) in (str, unicode):
-                                    usedValue = usedValue.replace('${value}', str(value))
-                            else:
-                                usedValue = value
-
-                            for slot in slots:
-                                if not hasattr(obj, slot):
-                                    print(obj.__class__.__name__ +
-                                            " slot not defined: " + slot)
-                                    return False
-
-                                slotMethod = getattr(obj, slot)
-                                if usedValue is not None:
-                                    if(MethodUtils.acceptsArguments(slotMethod, 1)):
-                                        results.append(slotMethod(usedValue))
-                                    elif(MethodUtils.acceptsArguments(slotMethod, 0)):
-                                        results.append(slotMethod())
-                                    else:
-                                        results.append('')
-
-                                else:
-                                    results.append(slotMethod())
+        for connection in slots:
+            condition, overrideValue, obj, slot, slotMethod, arguments = connection
+            if condition is None or condition == value:
+                if overrideValue is not None:
+                    usedValue = overrideValue
+                    if type(overrideValue) in (str, unicode):
+                        usedValue = usedValue.replace('${value}', str(value))
+                else:
+                    usedValue = value
+
+                if slotMethod is None:
+                    slotMethod = getattr(obj, slot, None)
+                    if slotMethod is None:
+                        print(obj.__class__.__name__ +
+                                " slot not defined: " + slot)
+                        return False
+                    connection[4] = slotMethod
+                    connection[5] = arguments = None
+
+                if usedValue is not None:
+                    if arguments is None:
+                        arguments = connection[5] = self.__arguments(slotMethod)
+                    if arguments == 1:
+                        results.append(slotMethod(usedValue))
+                    elif arguments == 0:
+                        results.append(slotMethod())
+                    else:
+                        results.append('')
+                else:
+                    results.append(slotMethod())
 
         return results
 
+    @staticmethod
+    def __arguments(slotMethod):
+        """
+            Returns the number of arguments (1 or 0) a slot method will be called with, or -1 if it accepts neither
+        """
+        if MethodUtils.acceptsArguments(slotMethod, 1):
+            return 1
+        elif MethodUtils.acceptsArguments(slotMethod, 0):
+            return 0
+        return -1
+
+    def __compile(self, connections):
+        """
+            Flattens the connections of a single signal into a list of
+            [condition, overrideValue, receiver, slotName, slotMethod, arguments] entries - binding each slot method
+            once, so emitting never looks them up again. Slots not yet defined on the receiver stay unbound and are
+            looked for on each emit until they are.
+        """
+        slots = []
+        for obj, conditions in iteritems(connections):
+            for condition, values in iteritems(conditions):
+                for overrideValue, slotNames in iteritems(values):
+                    for slot in slotNames:
+                        slots.append([condition, overrideValue, obj, slot, getattr(obj, slot, None), None])
+
+        return slots
+
+    def rebindSlots(self):
+        """
+            Binds every connected slot method again on the next emit - needed only when a slot method is replaced on
+            a receiver after this object has emitted the signal it is connected to
+        """
+        self._dispatch = None
+
     def connect(self, signal, condition, receiver, slot, value=None):
         """
             Defines a connection between this objects signal
@@ -91,12 +142,18 @@ class Connectable(object):
 
         if self.connections is None:
             self.connections = {}
-        connections = self.connections.setdefault(signal, {})
-        connection = connections.setdefault(receiver, {})
-        connection = connection.setdefault(condition, {})
+            if not self.hasListeners:
+                self.__class__.hasListeners = True
+        connection = self.connections
+        for key in (signal, receiver, condition):
+            nextConnection = connection.get(key)
+            if nextConnection is None:
+                nextConnection = connection[key] = OrderedDict()
+            connection = nextConnection
         connection = connection.setdefault(value, [])
         if not slot in connection:
             connection.append(slot)
+            self._dispatch = None
 
     def disconnect(self, signal=None, condition=None,
                    obj=None, slot=None, value=None):
@@ -119,3 +176,4 @@ class Connectable(object):
             self.connections.pop(signal, None)
         else:
             self.connections = None
+        self._dispatch = None
@@ -127,6 +127,7 @@ class Document(Base.WebElement):
             Documents Head
         """
         tagName = "head"
+        flushesStream = True
 
     class Body(Base.WebElement):
         """
@@ -189,6 +190,14 @@ class Document(Base.WebElement):
         """
         return self.doctype + "\n" + Base.WebElement.toHTML(self, formatted, *args, **kwargs)
 
+    def iterHTML(self, formatted=False, encoding="utf-8", *args, **kwargs):
+        """
+            Overrides iterHTML to stream the doctype definition followed by the document itself.
+        """
+        writer = Base.HTMLWriter(formatted)
+        writer.append(self.doctype + "\n")
+        return self._streamHTML(writer, encoding, args, kwargs)
+
     def addChildElement(self, childElement, ensureUnique=True):
         """
             Overrides addChildElement to place header elements and resources in the head
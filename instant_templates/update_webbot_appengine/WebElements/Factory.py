@@ -24,13 +24,27 @@
 
 import types
 
-from .Base import Invalid, TextNode
+from .Base import (STATIC_TYPES, Invalid, StaticHTML, TextNode, TrackedDict, WebElement, classInheritsMethod,
+                   inheritsMethod, propertySetters)
 from .MultiplePythonSupport import *
 
 class Factory(object):
+    # Methods an element must not override to be pre-rendered - or for its child elements to be pre-rendered
+    renderingMethods = ('_render', 'toHTML', 'content', '_renderedChildren', 'startTag', 'endTag')
+    childRenderingMethods = ('_render', 'toHTML', 'content', '_renderedChildren', 'addChildElement')
+    _rendersChildren = {}
+
     def __init__(self, name=""):
-        self.products = {}
+        self.products = TrackedDict(self)
         self.name = name
+        self._productsVersion = 0
+
+    def _markChanged(self):
+        """
+            Called whenever products is modified - so templates compiled against the previous products are
+            compiled again
+        """
+        self._productsVersion += 1
 
     def addProduct(self, productClass):
         """
@@ -39,6 +53,12 @@ class Factory(object):
         """
         self.products[productClass.__name__.lower()] = productClass
 
+    def __deepcopy__(self, memo):
+        """
+            Factories are shared registries of element classes - so copies of the elements built by one share it
+        """
+        return self
+
     def build(self, className, id=None, name=None, parent=None):
         """
             Builds a WebElement instance from the className:
@@ -56,7 +76,7 @@ class Factory(object):
             return Invalid()
 
     def buildFromTemplate(self, template, variableDict=None, idPrefix=None, parent=None,
-                            scriptContainer=None, accessors=None):
+                            scriptContainer=None, accessors=None, hoistStatic=False):
         """
             Builds an WebElement or a tree of web elements from a dictionary definition:
                 template - the WebElement template node definition tree
@@ -68,6 +88,10 @@ class Factory(object):
                 scriptContainer - a container (AJAXScriptContainer/ScriptContainer) to throw scripts
                                   in
                 accessors - pass in a dictionary to have it updated with element accessors
+                hoistStatic - set to True to pre-render the parts of the template that can never change (see builder)
+
+            idPrefix and scriptContainer are only set on the root element (child elements find them through
+            their parents) - so the returned element keeps scriptContainer as its own script container
         """
         if not template:
             return Invalid()
@@ -75,32 +99,184 @@ class Factory(object):
         if type(template) in (str, unicode):
             return TextNode(template)
 
-        ID = template.id
-        accessor = template.accessor
-
-        elementObject = self.build(template.create, ID, template.name, parent)
-        if idPrefix and not elementObject._prefix:
-            elementObject.setPrefix(idPrefix)
-        elementObject.setScriptContainer(scriptContainer)
-        elementObject.setProperties(template.properties)
-        if accessors is not None:
-            if accessor:
-                accessors[accessor] = elementObject
-            elif ID:
-                accessors[ID] = elementObject
-
-        if elementObject.allowsChildren:
-            addChildElement = elementObject.addChildElement
-            buildFromTemplate = self.buildFromTemplate
-            addChildElementsTo = elementObject.addChildElementsTo
-            for child in template.childElements or ():
-                childElement = buildFromTemplate(child, parent=addChildElementsTo, accessors=accessors)
-                addChildElement(childElement)
+        elementObject = self.builder(template, hoistStatic)(parent, accessors, idPrefix, scriptContainer, True)
         if variableDict:
             elementObject.insertVariables(variableDict)
 
         return elementObject
 
+    def builder(self, template, hoistStatic=False):
+        """
+            Returns a function that builds the tree of web elements defined by template - the template is compiled
+            into nested builder functions (with its products and properties already resolved) the first time it is
+            built, so building it again does not interpret the template:
+                builder(parent, accessors, idPrefix=None, scriptContainer=None, root=False)
+
+            If hoistStatic is set, parts of the template that can never change (no id, name, accessor, key, events,
+            scripts, or elements that render themselves) are rendered once when compiled and built as a single
+            StaticHTML element.
+            NOTE: hoisted parts are not built as elements - so they can not be changed once built (for instance
+            by allChildren() or getChildElements()), only set hoistStatic for templates that are not modified.
+
+            The compiled functions are kept on the template itself (so they are freed along with it) and are
+            compiled again whenever the products of the factory change.
+        """
+        hoistStatic = bool(hoistStatic)
+        builders = template.builders
+        if builders is None:
+            builders = template.builders = {}
+        cached = builders.get((self, hoistStatic))
+        if cached and cached[0] == self._productsVersion:
+            return cached[1]
+
+        build = self.__compile(template, hoistStatic)
+        builders[(self, hoistStatic)] = (self._productsVersion, build)
+        return build
+
+    def __overridesBuild(self):
+        """
+            Returns True if the factory builds elements in a different way than creating its products
+        """
+        build = type(self).build
+        return getattr(build, '__func__', build) is not Factory.__dict__['build']
+
+    def __compile(self, template, hoistStatic=False, hoist=False):
+        """
+            Compiles a single template node (and all of its child nodes) into a builder function - if hoist is set
+            and the node is static it is rendered ahead of time, hoistStatic sets hoist for every child node
+        """
+        if not template:
+            return lambda parent, accessors, idPrefix=None, scriptContainer=None, root=False: Invalid()
+
+        if type(template) in (str, unicode):
+            return lambda parent, accessors, idPrefix=None, scriptContainer=None, root=False: TextNode(template)
+
+        create = template.create
+        ID = template.id
+        name = template.name
+        accessor = template.accessor or ID
+        product = self.products.get(create and create.lower() or "", None)
+        if not product or self.__overridesBuild():
+            build = self.build
+            product = lambda id, name, parent: build(create, id, name, parent)
+            properties = template.properties
+            setProperties = True
+        else:
+            setProperties = getattr(product.setProperties, '__func__', product.setProperties)
+            setProperties = setProperties is not WebElement.__dict__['setProperties']
+            if setProperties:
+                properties = template.properties
+            else:
+                setters = propertySetters(product)
+                properties = tuple((setters[propertyName], propertyValue)
+                                   for propertyName, propertyValue in template.properties
+                                   if propertyValue is not None and propertyName in setters)
+        children = tuple(self.__compile(child, hoistStatic, hoistStatic) for child in template.childElements or ())
+
+        def buildElement(parent, accessors, idPrefix=None, scriptContainer=None, root=False):
+            elementObject = product(ID, name, parent)
+            if root:
+                if idPrefix and not elementObject._prefix:
+                    elementObject.setPrefix(idPrefix)
+                elementObject.setScriptContainer(scriptContainer)
+            if setProperties:
+                elementObject.setProperties(properties)
+            else:
+                for setProperty, propertyValue in properties:
+                    setProperty(elementObject, propertyValue)
+                if properties:
+                    elementObject._markDirty()
+            if accessors is not None and accessor:
+                accessors[accessor] = elementObject
+
+            if elementObject.allowsChildren:
+                addChildElement = elementObject.addChildElement
+                addChildElementsTo = elementObject.addChildElementsTo
+                for child in children:
+                    addChildElement(child(addChildElementsTo, accessors))
+
+            return elementObject
+
+        if hoist and self.__isStatic(template):
+            return self.__hoist(buildElement) or buildElement
+
+        return buildElement
+
+    def __isStatic(self, template):
+        """
+            Returns True if nothing in the template node (or any of its child nodes) can be bound to, or looked up
+        """
+        if type(template) in (str, unicode):
+            return True
+
+        if template.id or template.name or template.accessor:
+            return False
+
+        product = self.products.get(template.create and template.create.lower() or "", None)
+        if not product or self.__overridesBuild():
+            return False
+
+        for propertyName, propertyValue in template.properties:
+            if propertyName in ('key', 'javascriptEvents') or \
+               product.properties.get(propertyName, {}).get('action') == 'javascriptEvent':
+                return False
+
+        for child in template.childElements or ():
+            if not self.__isStatic(child):
+                return False
+
+        return True
+
+    def __hoist(self, buildElement):
+        """
+            Builds the element tree once and returns a builder of its pre-rendered html - or None if the built
+            elements could render differently depending on where, or when, they are rendered. The html is only used
+            within parents that render their child elements as they are - others get the built element tree
+        """
+        element = buildElement(None, None)
+        stack = [element]
+        while stack:
+            child = stack.pop()
+            if type(child) in (TextNode, StaticHTML):
+                continue
+
+            if (child._id or child._name or child.key is not None or child.connections or child.validator or
+                child.__scriptTemp__ or child.__objectTemp__ or child._editable is not None or
+                child._prefix or child.addChildElementsTo is not child):
+                return None
+
+            for methodName in self.renderingMethods:
+                if not inheritsMethod(child, methodName):
+                    return None
+
+            for values in (child._attributes and tuple(child._attributes.values()), child._style and
+                           tuple(child._style.values()), child._classes):
+                if values and [value for value in values if type(value) not in STATIC_TYPES]:
+                    return None
+
+            if child._childElements:
+                stack.extend(child._childElements)
+
+        html = element.toHTML()
+        formattedHTML = element.toHTML(True)
+        rendersChildren = self._rendersChildren
+        childRenderingMethods = self.childRenderingMethods
+
+        def buildStaticHTML(parent, accessors, idPrefix=None, scriptContainer=None, root=False):
+            if parent is not None and not root:
+                parentClass = parent.__class__
+                rendersAsIs = rendersChildren.get(parentClass)
+                if rendersAsIs is None:
+                    rendersAsIs = rendersChildren[parentClass] = not [methodName for methodName in
+                                                                      childRenderingMethods if not
+                                                                      classInheritsMethod(parentClass, methodName)]
+                if rendersAsIs:
+                    return StaticHTML(html, formattedHTML, parent)
+
+            return buildElement(parent, accessors, idPrefix, scriptContainer, root)
+
+        return buildStaticHTML
+
 class Composite(Factory):
     """
         Allows you to combine one or more web elements factories to build a composite factory.
@@ -22,9 +22,10 @@
 '''
 
 import types
+from bisect import bisect_right
+from itertools import chain
 from types import GeneratorType
 
-from .DictUtils import OrderedDict
 from .MultiplePythonSupport import *
 
 ITERATOR_TYPES = (GeneratorType, list, tuple, set, range)
@@ -118,12 +119,17 @@ class IteratorSlice(object):
 class IterableCollection(object):
     """
         Provides a way to iterate through a collection of lists as if it where one really big list
+
+        The length of each contained iterable is only requested once - then cached (as running totals) until the
+        collection is changed using extend, append, remove, pop or del. If the contained iterables are modified
+        directly call invalidateLengths.
     """
-    __slots__ = ('iterableItems', 'identifiers')
+    __slots__ = ('iterableItems', 'identifiers', '_offsets')
 
     def __init__(self, iterableDictionary=None):
         self.iterableItems = []
         self.identifiers = []
+        self._offsets = None
         if iterableDictionary:
             for identifier, iterableItem in iteritems(iterableDictionary):
                 self.iterableItems.append(iterableItem)
@@ -146,48 +152,93 @@ class IterableCollection(object):
         return IteratorSlice(self)
 
     def __iter__(self):
-        return IndexIterator(self, 0, len(self))
+        for identifier, iterable in zip(self.identifiers, self.iterableItems):
+            for item in iterable:
+                yield (identifier, item)
 
     def __len__(self):
-        length = 0
-        for iterable in self.iterableItems:
-            length += iterableLength(iterable)
-        return length
+        return self.offsets()[-1]
 
-    def __getitem__(self, index):
-        if type(index) == slice:
-            results = []
-            (start, end) = (index.start or 0, index.stop or len(self))
-            if start < 0:
-                start = 0
-            if end > len(self):
-                end = len(self)
+    def offsets(self):
+        """
+            Returns the index within the collection that each contained iterable starts at - followed by the
+            length of the collection
+        """
+        offsets = self._offsets
+        if offsets is None:
+            offsets = [0]
+            for iterable in self.iterableItems:
+                offsets.append(offsets[-1] + iterableLength(iterable))
+            self._offsets = offsets
 
-            for num in range(start, end):
-                results.append(self[num])
+        return offsets
 
-            return results
+    def invalidateLengths(self):
+        """
+            Causes the length of each contained iterable to be requested again the next time it is needed
+        """
+        self._offsets = None
+
+    def locate(self, index):
+        """
+            Returns the position of the iterable containing index and the index within that iterable - or
+            (None, None) if the index is not within the collection
+        """
+        offsets = self.offsets()
+        if index < 0 or index >= offsets[-1]:
+            return (None, None)
+
+        iterableIndex = bisect_right(offsets, index) - 1
+        return (iterableIndex, index - offsets[iterableIndex])
+
+    def iterRange(self, start=0, end=None):
+        """
+            Iterates through the (identifier, item) pairs from start up to (but not including) end - slicing each
+            contained iterable that falls within the range, instead of retrieving items one index at a time
+        """
+        offsets = self.offsets()
+        if end is None or end > offsets[-1]:
+            end = offsets[-1]
+        if start < 0:
+            start = 0
+        if start >= end:
+            return
+
+        iterableIndex = bisect_right(offsets, start) - 1
+        while iterableIndex < len(self.iterableItems) and offsets[iterableIndex] < end:
+            iterableStart = offsets[iterableIndex]
+            identifier = self.identifiers[iterableIndex]
+            iterable = self.iterableItems[iterableIndex]
+            for item in iterable[max(start - iterableStart, 0):end - iterableStart]:
+                yield (identifier, item)
+            iterableIndex += 1
+
+    def lazySlice(self, start=0, end=None):
+        """
+            Returns a lazy view of the items from start up to (but not including) end - or up to the end of the
+            collection (even as it grows) if end is not given. Unlike slicing, no items are retrieved until the view
+            is iterated over or indexed.
+        """
+        return IterableCollectionSlice(self, start, end)
+
+    def __getitem__(self, index):
+        if type(index) == slice:
+            return list(self.iterRange(index.start or 0, index.stop or len(self)))
         else:
-            currentSize = 0
-            for iterableIndex, iterable in enumerate(self.iterableItems):
-                if index >= currentSize and index < currentSize + iterableLength(iterable):
-                    identifier = self.identifiers[iterableIndex]
-                    return (identifier, iterable[index - currentSize])
-                currentSize += iterableLength(iterable)
+            iterableIndex, iterableIndexAt = self.locate(index)
+            if iterableIndex is not None:
+                return (self.identifiers[iterableIndex], self.iterableItems[iterableIndex][iterableIndexAt])
 
     def __setitem__(self, index, value):
-        currentSize = 0
-        for iterable in self.iterableItems:
-            if index >= currentSize and index < currentSize + self.iterableLength(iterable):
-                iterable[index - currentSize] = value
-            currentSize += iterableLength(iterable)
+        iterableIndex, iterableIndexAt = self.locate(index)
+        if iterableIndex is not None:
+            self.iterableItems[iterableIndex][iterableIndexAt] = value
 
     def __delitem__(self, index):
-        currentSize = 0
-        for iterable in self.iterableItems:
-            if index >= currentSize and index < currentSize + iterableLength(iterable):
-                del iterable[index - currentSize]
-            currentSize += iterableLength(iterable)
+        iterableIndex, iterableIndexAt = self.locate(index)
+        if iterableIndex is not None:
+            del self.iterableItems[iterableIndex][iterableIndexAt]
+            self._offsets = None
 
     def pop(self, index=False):
         """
@@ -197,22 +248,20 @@ class IterableCollection(object):
         for index in indexes:
             iterable = self.iterableItems[index]
             if iterableLength(iterable):
+                self._offsets = None
                 return (self.identifiers[index], iterable.pop())
 
     def getIterableIndex(self, index):
         """
             Returns the index within the combined iterator length.
         """
-        currentSize = 0
-        for index, iterable in enumerate(self.iterableItems):
-            if index >= currentSize and index < currentSize + iterableLength(iterable):
-                return index
-            currentSize += iterableLength(iterable)
+        return self.locate(index)[0]
 
     def remove(self, value):
         """
             Removes value from all iterables in the collection.
         """
+        self._offsets = None
         for iterable in self.iterableItems:
             iterable.remove(value)
 
@@ -228,6 +277,7 @@ class IterableCollection(object):
         """
         self.iterableItems.append(valueList)
         self.identifiers.append(identifier)
+        self._offsets = None
         return valueList
 
     def count(self, value):
@@ -240,25 +290,26 @@ class IterableCollection(object):
 
         return count
 
+
 class IterableCollectionList(IterableCollection):
     """
         Makes an IterableCollection operate in exactly the same manor as a list.
     """
     __slots__ = ()
 
-    def __getitem__(self, index):
-        if type(index) == slice:
-            results = []
-            (start, end) = (index.start or 0, index.stop or len(self))
-            if start < 0:
-                start = 0
-            if end > len(self):
-                end = len(self)
+    def __iter__(self):
+        return chain.from_iterable(self.iterableItems)
 
-            for num in range(start, end):
-                results.append(self[num])
+    def iterRange(self, start=0, end=None):
+        """
+            Iterates through the items from start up to (but not including) end
+        """
+        for identifier, item in IterableCollection.iterRange(self, start, end):
+            yield item
 
-            return results
+    def __getitem__(self, index):
+        if type(index) == slice:
+            return IterableCollection.__getitem__(self, index)
         else:
             return IterableCollection.__getitem__(self, index)[1]
 
@@ -276,6 +327,61 @@ class IterableCollectionList(IterableCollection):
         return len(self)
 
 
+class IterableCollectionSlice(object):
+    """
+        A lazy view of a section of an IterableCollection (see IterableCollection.lazySlice) - items are only
+        retrieved when iterated over or indexed
+    """
+    __slots__ = ('collection', 'start', 'end')
+
+    def __init__(self, collection, start=0, end=None):
+        self.collection = collection
+        self.start = max(start, 0)
+        self.end = end
+
+    def __iter__(self):
+        return self.collection.iterRange(self.start, self.end)
+
+    def __len__(self):
+        end = len(self.collection)
+        if self.end is not None and self.end < end:
+            end = self.end
+        return max(end - self.start, 0)
+
+    def __nonzero__(self):
+        return bool(self.__len__())
+
+    def __getitem__(self, index):
+        length = len(self)
+        if type(index) == slice:
+            if index.step not in (None, 1):
+                return list(self)[index]
+
+            start, end, step = index.indices(length)
+            return self.__class__(self.collection, self.start + start, self.start + max(end, start))
+
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError(index)
+        return self.collection[self.start + index]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def count(self):
+        """
+            Returns the number of items within the slice
+        """
+        return len(self)
+
+
 class SortedSet(set):
     """
         A set that maintains order
@@ -313,6 +419,106 @@ class SortedSet(set):
         return self.items.remove(item)
 
 
+LOOKUP_TYPES = ('icontains', 'gte', 'gt', 'lte', 'lt', 'contains', 'iexact', 'exact', 'istartswith', 'startswith',
+                'className')
+
+COMPARISONS = {'in':lambda matchAgainst, value: matchAgainst in value,
+               'contains':lambda matchAgainst, value: value in matchAgainst,
+               'gte':lambda matchAgainst, value: matchAgainst >= value,
+               'lte':lambda matchAgainst, value: matchAgainst <= value,
+               'gt':lambda matchAgainst, value: matchAgainst > value,
+               'lt':lambda matchAgainst, value: matchAgainst < value,
+               'exact':lambda matchAgainst, value: value == matchAgainst,
+               'startswith':lambda matchAgainst, value: matchAgainst.startswith(value),
+               'className':lambda matchAgainst, value: matchAgainst.__class__.__name__.lower() == value}
+
+_parsedLookups = {}
+
+def parseLookup(lookup):
+    """
+        Parses a django style field__lookup key into a (path, attribute, filterType, caseInsensitive) tuple -
+        caching the result so each distinct key is only parsed once
+    """
+    parsed = _parsedLookups.get(lookup)
+    if parsed is None:
+        keys = lookup.split("__")
+        filterType = "exact"
+        caseInsensitive = False
+        if keys[-1] in LOOKUP_TYPES:
+            filterType = keys.pop(-1)
+            if filterType.startswith('i'):
+                caseInsensitive = True
+                filterType = filterType[1:]
+
+        attribute = None
+        if keys:
+            attribute = keys.pop(-1)
+        if attribute == "in":
+            filterType = "in"
+            attribute = None
+
+        parsed = _parsedLookups[lookup] = (tuple(keys), attribute, filterType, caseInsensitive)
+
+    return parsed
+
+def lookupValue(model, path, attribute):
+    """
+        Returns the value a lookup is matched against for a single model
+    """
+    for modelName in path:
+        if isinstance(model, dict):
+            model = model.get(modelName, None)
+        else:
+            model = model.__getattribute__(modelName)
+
+    if attribute:
+        if isinstance(model, dict):
+            model = model.get(attribute, None)
+        else:
+            model = getattr(model, attribute, None)
+
+    if type(model) in (types.FunctionType, types.MethodType):
+        model = model()
+
+    return model or ""
+
+def compileLookup(lookup, value):
+    """
+        Compiles a single django style lookup and value into a predicate that returns True for matching models
+    """
+    path, attribute, filterType, caseInsensitive = parseLookup(lookup)
+    compare = COMPARISONS[filterType]
+    if caseInsensitive:
+        value = value.lower()
+    if filterType == "className":
+        value = value.lower()
+
+    if caseInsensitive:
+        return lambda model: compare(lookupValue(model, path, attribute).lower(), value) == True
+    return lambda model: compare(lookupValue(model, path, attribute), value) == True
+
+def dropsIndexes(method):
+    """
+        Wraps a list method that modifies the list so that it also drops any indexes built on a Queryable
+    """
+    def modify(self, *args, **kwargs):
+        self._indexes = None
+        return method(self, *args, **kwargs)
+    modify.__name__ = method.__name__
+    modify.__doc__ = method.__doc__
+    return modify
+
+def membership(items):
+    """
+        Returns a container that can efficiently check if a model is within items (falling back to items itself if
+        they are unhashable)
+    """
+    try:
+        return frozenset(items)
+    except TypeError:
+        return items
+
+
 class Queryable(list):
     """
         Lets you interact with a list as you would a django queryset - very useful for tests
@@ -320,9 +526,11 @@ class Queryable(list):
     def __init__(self, *kargs):
         list.__init__(self, *kargs)
         self.objects = self
+        self._indexes = None
 
     def __or__(self, other):
         inThisOnly = Queryable(other)
+        other = membership(other)
         for model in self:
             if model not in other:
                 inThisOnly.append(model)
@@ -330,12 +538,8 @@ class Queryable(list):
         return inThisOnly
 
     def __and__(self, other):
-        inBoth = Queryable()
-        for model in self:
-            if model in other:
-                inBoth.append(model)
-
-        return inBoth
+        other = membership(other)
+        return Queryable(model for model in self if model in other)
 
     def objects(self):
         """
@@ -353,54 +557,158 @@ class Queryable(list):
         """
             Gets the object that matches the specified args.
         """
-        results = self.filter(**args)
-        if results:
-            return results[0]
+        for model in self.iterMatches(args):
+            return model
         return None
 
     def filter(self, **args):
         """
             Returns a queryable of items that match the specified args.
         """
-        return self.getMatches(args)[0]
+        return Queryable(self.iterMatches(args))
 
     def exclude(self, **args):
         """
             Returns a queryable of items that don't match the specified args.
         """
-        return self.getMatches(args)[1]
+        return Queryable(self.iterMatches(args, matching=False))
+
+    def indexBy(self, *fieldNames):
+        """
+            Builds an index of the items by the value of each of fieldNames, used to answer exact lookups
+            against those fields without checking every item.
+            NOTE: the index reflects the field values at the time it is built - call again after modifying items.
+        """
+        self._indexes = self._indexes or {}
+        for fieldName in fieldNames:
+            index = {}
+            try:
+                for model in self:
+                    index.setdefault(lookupValue(model, (), fieldName), []).append(model)
+            except TypeError:
+                continue
+            self._indexes[fieldName] = index
+
+        return self
+
+    append = dropsIndexes(list.append)
+    extend = dropsIndexes(list.extend)
+    insert = dropsIndexes(list.insert)
+    remove = dropsIndexes(list.remove)
+    pop = dropsIndexes(list.pop)
+    sort = dropsIndexes(list.sort)
+    reverse = dropsIndexes(list.reverse)
+    __setitem__ = dropsIndexes(list.__setitem__)
+    __delitem__ = dropsIndexes(list.__delitem__)
+    __iadd__ = dropsIndexes(list.__iadd__)
+    if hasattr(list, '__setslice__'):
+        __setslice__ = dropsIndexes(list.__setslice__)
+        __delslice__ = dropsIndexes(list.__delslice__)
+
+    def __candidates(self, queryDict):
+        """
+            Returns the items that need to be checked against queryDict - using an index when one applies
+        """
+        indexes = self._indexes
+        if not indexes:
+            return self
+
+        candidates = self
+        for lookup, value in iteritems(queryDict):
+            path, attribute, filterType, caseInsensitive = parseLookup(lookup)
+            index = indexes.get(attribute)
+            if index is not None and not path and filterType == "exact" and not caseInsensitive:
+                try:
+                    matches = index.get(value, ())
+                except TypeError:
+                    continue
+                if len(matches) < len(candidates):
+                    candidates = matches
+
+        return candidates
+
+    def iterMatches(self, queryDict, matching=True):
+        """
+            Lazily yields the items that match (or if matching is False, don't match) every lookup in queryDict -
+            each lookup is compiled once into a predicate before any item is checked.
+        """
+        if not queryDict:
+            return
+
+        predicates = [compileLookup(lookup, value) for lookup, value in iteritems(queryDict)]
+        candidates = self
+        if matching:
+            candidates = self.__candidates(queryDict)
+        seen = set()
+        for model in candidates:
+            if id(model) in seen:
+                continue
+            seen.add(id(model))
+
+            matched = True
+            for predicate in predicates:
+                if not predicate(model):
+                    matched = False
+                    break
+
+            if matched == matching:
+                yield model
+
+    def getMatches(self, queryDict):
+        """
+            Returns all matches of the specified query dict.
+        """
+        if not queryDict:
+            return (Queryable(), Queryable())
+
+        predicates = [compileLookup(lookup, value) for lookup, value in iteritems(queryDict)]
+        matches = Queryable()
+        nonMatches = Queryable()
+        seen = set()
+        for model in self:
+            if id(model) in seen:
+                continue
+            seen.add(id(model))
+
+            for predicate in predicates:
+                if not predicate(model):
+                    nonMatches.append(model)
+                    break
+            else:
+                matches.append(model)
+
+        return (matches, nonMatches)
 
     @staticmethod
-    def __lowerStrings__(value):
-        if type(value) in (str, unicode):
-            return value.lower()
-        else:
-            return value
+    def __orderValue(value):
+        """
+            Returns a sort key for a single value: numbers (including strings of digits) sort numerically before
+            all other values, which sort case insensitively
+        """
+        if type(value) in (types.FunctionType, types.MethodType):
+            value = value()
+        if type(value) in (int, long, float):
+            return (0, value)
+        if type(value) not in (str, unicode):
+            value = unicode(value)
+        elif value.isdigit():
+            return (0, int(value))
+        return (1, value.lower())
 
     def order_by(self, *fieldNames):
         """
-            Returns a queryable that is ordered by the specified fieldNames.
+            Returns a queryable that is ordered by the specified fieldNames (prefixing a field name with '-' reverses
+            the order for that field).
         """
-        order = OrderedDict()
-        reverseSort = False
-        for index, fieldName in enumerate(fieldNames):
-            if fieldName.startswith("-"):
-                reverseSort = True
-                fieldNames[index] = fieldName[1:]
-        for model in self:
-            key = []
-            for fieldName in fieldNames:
-                value = str(model.__getattribute__(fieldName))
-                if value.isdigit():
-                    value = "%04d" % int(value)
-                key.append(value)
-            key += str(model.id)
-            order["_".join(key)] = model
-        order.orderedKeys.sort(key=self.__lowerStrings__)
-        if reverseSort:
-            order.orderedKeys.reverse()
-
-        return Queryable(order.values())
+        ordered = list(self)
+        orderValue = self.__orderValue
+        for fieldName in reversed(fieldNames):
+            reverseSort = fieldName.startswith("-")
+            if reverseSort:
+                fieldName = fieldName[1:]
+            ordered.sort(key=lambda model: orderValue(getattr(model, fieldName)), reverse=reverseSort)
+
+        return Queryable(ordered)
 
     def values_list(self, columns, flat=False):
         """
@@ -430,88 +738,6 @@ class Queryable(list):
             resultDict[key] = 0
         return resultDict
 
-    def getMatches(self, queryDict):
-        """
-            Returns all matches of the specified query dict.
-        """
-        matches = Queryable()
-        nonMatches = Queryable()
-        for key, value in iteritems(queryDict):
-            keys = key.split("__")
-            filterType = "exact"
-            caseInsensitive = False
-            if keys[-1] in ['icontains', 'gte', 'gt', 'lte', 'lt', 'contains',
-                            'iexact', 'exact', 'istartswith', 'startswith',
-                            'className']:
-                filterType = keys.pop(-1)
-                if filterType.startswith('i'):
-                    caseInsensitive = True
-                    filterType = filterType[1:]
-
-            key = None
-            if keys:
-                key = keys.pop(-1)
-
-            for model in self:
-                currentModel = model
-                for modelName in keys:
-                    if isinstance(currentModel, dict):
-                        currentModel = currentModel.get(modelName, None)
-                    else:
-                        currentModel = currentModel.__getattribute__(modelName)
-
-                if key == "in":
-                    filterType = "in"
-                    matchAgainst = currentModel
-                elif key:
-                    if isinstance(currentModel, dict):
-                        matchAgainst = currentModel.get(key, None)
-                    else:
-                        matchAgainst = getattr(currentModel, key, None)
-                else:
-                    matchAgainst = currentModel
-
-                if type(matchAgainst) in (types.FunctionType, types.MethodType):
-                    matchAgainst = matchAgainst()
-
-                if not matchAgainst:
-                        matchAgainst = ""
-
-                if caseInsensitive:
-                    value = value.lower()
-                    matchAgainst = matchAgainst.lower()
-
-                matched = False
-                if filterType == "in":
-                    matched = matchAgainst in value
-                elif filterType == "contains":
-                    matched = value in matchAgainst
-                elif filterType == "gte":
-                    matched = matchAgainst >= value
-                elif filterType == "lte":
-                    matched = matchAgainst <= value
-                elif filterType == "gt":
-                    matched = matchAgainst > value
-                elif filterType == "lt":
-                    matched = matchAgainst < value
-                elif filterType == "exact":
-                    matched = value == matchAgainst
-                elif filterType == "startswith":
-                    matched = matchAgainst.startswith(value)
-                elif filterType == "className":
-                    matched = matchAgainst.__class__.__name__.lower() == value.lower()
-
-                if matched == True:
-                    if not model in nonMatches and not model in matches:
-                        matches.append(model)
-                else:
-                    if not model in nonMatches:
-                        nonMatches.append(model)
-                    if model in matches:
-                        matches.remove(model)
-
-        return (matches, nonMatches)
-
     def count(self):
         """
             Returns the number of items in the Queryable.
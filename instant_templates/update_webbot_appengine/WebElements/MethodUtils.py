@@ -20,6 +20,8 @@
     Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 '''
 
+import copy
+
 from .MultiplePythonSupport import *
 
 def acceptsArguments(method, numberOfArguments):
@@ -58,6 +60,11 @@ class CallBack(object):
         self.obj = obj
         self.argumentDict = argumentDict
 
+    def __deepcopy__(self, memo):
+        callBack = memo[id(self)] = self.__class__(copy.deepcopy(self.obj, memo), self.toCall)
+        callBack.argumentDict = copy.deepcopy(self.argumentDict, memo)
+        return callBack
+
     def __call__(self):
         return self.call()
 
@@ -30,7 +30,6 @@ from . import Inputs
 from . import Layout
 from . import UITemplate
 from .Factory import Factory
-from .IteratorUtils import iterableLength
 from .MethodUtils import CallBack
 from .PositionController import PositionController
 from .StringUtils import interpretAsString
@@ -43,10 +42,12 @@ class ItemPager(Layout.Vertical):
     """
         Paged Results:
         Encapsulates the UI logic for paging multiple item from a database or other source.
+        Items can be given as a PageSource, in which case only the current page of items is ever fetched - and
+        the data sources cursor (if it provides one) is used to move to the next page.
     """
     __slots__ = ('resultsStartAt', 'numberOfResults', 'showAllButton', 'startButton', 'backButton', 'pageLinks',
                  'nextButton', 'lastButton', 'pagesShownAtOnce', 'itemsPerPage', '_index_', '_pages_',
-                 'resultsEndAt')
+                 'resultsEndAt', '_cursor_')
     signals = Base.TemplateElement.signals + ['jsIndexChanged']
     properties = Base.TemplateElement.properties.copy()
     properties['itemsPerPage'] = {'action':'classAttribute', 'type':'int'}
@@ -112,6 +113,7 @@ class ItemPager(Layout.Vertical):
         self.pagesShownAtOnce = 15
         self.itemsPerPage = 25
         self._index_ = self.addChildElement(HiddenInputs.HiddenIntValue(id + 'Index'))
+        self._cursor_ = self.addChildElement(HiddenInputs.HiddenValue(id + 'Cursor'))
         self._pages_ = None
 
         self.showAllButton.addJavascriptEvent('onclick', "WebElements.replace(this, WebElements.buildThrobber());")
@@ -123,16 +125,18 @@ class ItemPager(Layout.Vertical):
         """
             Set a list of items for the item pager to page-through
         """
-        itemsPerPage = int(self.itemsPerPage)
-        if iterableLength(items) <= itemsPerPage:
+        pages = PositionController(items=items or [], startIndex=self._index_.value(),
+                                   itemsPerPage=int(self.itemsPerPage), pagesShownAtOnce=int(self.pagesShownAtOnce),
+                                   cursor=self._cursor_.value() or None)
+        if pages.length <= pages.itemsPerPage or not pages.exactLength:
             self.showAllButton.remove()
         elif self.showAllButton.toggled():
-            itemsPerPage = iterableLength(items)
+            pages = PositionController(items=items, startIndex=self._index_.value(), itemsPerPage=pages.length,
+                                       pagesShownAtOnce=int(self.pagesShownAtOnce))
 
-        self._pages_ = PositionController(items=items or [], startIndex=self._index_.value(),
-                                          itemsPerPage=itemsPerPage,
-                                          pagesShownAtOnce=int(self.pagesShownAtOnce))
-        self._index_.setValue(self._pages_.startIndex)
+        self._pages_ = pages
+        self._index_.setValue(pages.startIndex)
+        self._cursor_.setValue(pages.cursor or '')
 
     def currentPageItems(self, allItems=None, requestFields=None):
         """
@@ -147,14 +151,16 @@ class ItemPager(Layout.Vertical):
             self.setItems(allItems)
         return self._pages_ and self._pages_.currentPageItems or ()
 
-    def jsSetNavigationIndex(self, index):
+    def jsSetNavigationIndex(self, index, cursor=None):
         """
             Creates the javascript to switch to a different position within the items:
             index - the first item you want to appear in your pages results
+            cursor - the data sources cursor for the page ending at index (if known)
         """
-        return ("WebElements.get('%(id)sIndex').value = '%(index)d';%(handlers)s;" %
-                {'id':self.fullId(), 'index':index, 'handlers':"\n".join([ClientSide.var(result) for result in
-                                                                          self.emit('jsIndexChanged')])})
+        return ("WebElements.get('%(id)sIndex').value = '%(index)d';"
+                "WebElements.get('%(id)sCursor').value = %(cursor)s;%(handlers)s;" %
+                {'id':self.fullId(), 'index':index, 'cursor':ClientSide.var(cursor or ''),
+                 'handlers':"\n".join([ClientSide.var(result) for result in self.emit('jsIndexChanged')])})
 
     def _render(self):
         """
@@ -169,13 +175,20 @@ class ItemPager(Layout.Vertical):
 
         self.resultsStartAt.setText(self._pages_.startPosition)
         self.resultsEndAt.setText(self._pages_.nextPageIndex)
-        self.numberOfResults.setText(self._pages_.length)
+        if self._pages_.exactLength:
+            self.numberOfResults.setText(self._pages_.length)
+        else:
+            self.numberOfResults.setText("%d+" % self._pages_.length)
 
         if self._pages_.areMore:
             self.nextButton.show()
-            self.lastButton.show()
-            self.nextButton.addJavascriptEvent('onclick', self.jsSetNavigationIndex(self._pages_.nextPageIndex))
-            self.lastButton.addJavascriptEvent('onclick', self.jsSetNavigationIndex(self._pages_.lastPageIndex))
+            self.nextButton.addJavascriptEvent('onclick', self.jsSetNavigationIndex(self._pages_.nextPageIndex,
+                                                                                    self._pages_.nextCursor))
+            if self._pages_.exactLength:
+                self.lastButton.show()
+                self.lastButton.addJavascriptEvent('onclick', self.jsSetNavigationIndex(self._pages_.lastPageIndex))
+            else:
+                self.lastButton.hide()
         else:
             self.nextButton.hide()
             self.lastButton.hide()
@@ -444,7 +457,7 @@ class UnrolledSelect(Display.List):
         self.addChildElement(Display.Label()).addClass('first')
         self.addClass('WUnrolledSelect')
         self.userInput = HiddenInputs.HiddenValue(id, parent=self)
-        self.childElements.append(self.userInput)
+        Base.WebElement.addChildElement(self, self.userInput, ensureUnique=False)
         self.userInput.addClass("Value")
         self.optionList = []
 
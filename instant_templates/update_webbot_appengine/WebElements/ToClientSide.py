@@ -21,9 +21,20 @@
 '''
 
 import ast
+import hashlib
 import inspect
+import os
+import sys
+import threading
 from .MultiplePythonSupport import *
 
+VERSION = 1 # increase whenever the javascript produced for the same python changes (invalidates the disk cache)
+MEMO_SIZE = 512
+cacheDirectory = os.environ.get('WEBBOT_JS_CACHE') # where translations are persisted across processes (if set)
+
+_memo = OrderedDict()
+_memoLock = threading.Lock()
+
 class Formater(object):
     """
     A very simple code formater that handles efficient concatenation and indentation of lines.
@@ -747,12 +758,84 @@ def convert(s):
     >>> convert_py2js("x[3:]")
     'x.__getitem__(slice(3, null));'
 
+    """
+    with _memoLock:
+        javascript = _memo.pop(s, None)
+        if javascript is not None:
+            _memo[s] = javascript
+            return javascript
+
+    key = cacheKey(s)
+    javascript = readCache(key)
+    if javascript is None:
+        javascript = translate(s)
+        writeCache(key, javascript)
+
+    with _memoLock:
+        _memo[s] = javascript
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+    return javascript
+
+def translate(s):
+    """
+    Converts Python code to JavaScript without using any of the caches.
     """
     t = ast.parse(s)
     v = JS()
     v.visit(t)
     return v.read()
 
+def cacheKey(*parts):
+    """
+    Returns the name a translation is stored under in the disk cache - based on the translator version and parts.
+    """
+    key = hashlib.sha1(str(VERSION).encode('utf8'))
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = unicode(part).encode('utf8')
+        key.update(b"\x00" + part)
+    return key.hexdigest()
+
+def readCache(key):
+    """
+    Returns the translation stored under key in the disk cache or None if it is not present.
+    """
+    if not cacheDirectory:
+        return None
+
+    try:
+        with open(os.path.join(cacheDirectory, key + ".js"), 'rb') as cacheFile:
+            javascript = cacheFile.read()
+    except (IOError, OSError):
+        return None
+
+    if str is bytes:
+        return javascript
+    return javascript.decode('utf8')
+
+def writeCache(key, javascript):
+    """
+    Stores a translation under key in the disk cache - silently doing nothing if it can not be written
+    (for instance on a read-only file system).
+    """
+    if not cacheDirectory:
+        return
+
+    path = os.path.join(cacheDirectory, key + ".js")
+    temporaryPath = "%s.%d.%d" % (path, os.getpid(), threading.current_thread().ident)
+    try:
+        if not os.path.isdir(cacheDirectory):
+            os.makedirs(cacheDirectory)
+        with open(temporaryPath, 'wb') as cacheFile:
+            cacheFile.write(javascript if type(javascript) == bytes else javascript.encode('utf8'))
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(temporaryPath, path)
+    except (IOError, OSError):
+        pass
+
 
 class Convert(object):
     """
@@ -822,13 +905,71 @@ class Convert(object):
 
     """
 
+    converted = []
+
     def __init__(self, obj):
         self._obj = obj
-        obj_source = inspect.getsource(obj)
-        self._js = convert(obj_source)
+        self._js = None
+        self.converted.append(self)
 
     def __str__(self):
+        if self._js is None:
+            self._js = self.translate()
         return self._js
 
+    def sourceKey(self):
+        """
+        Returns the disk cache key of the object, based on the module and name it is defined under and the contents of
+        its source file - allowing a translation to be found without parsing the source, wherever the file is deployed.
+        """
+        fileName = inspect.getsourcefile(self._obj) or ""
+        try:
+            with open(fileName, 'rb') as sourceFile:
+                sourceHash = hashlib.sha1(sourceFile.read()).hexdigest()
+        except (IOError, OSError):
+            return None
+
+        name = getattr(self._obj, '__qualname__', self._obj.__name__)
+        return cacheKey(self._obj.__module__, name, sourceHash)
+
+    def translate(self):
+        """
+        Returns the JavaScript translation of the object - from the disk cache if it was translated ahead of time.
+        """
+        sourceKey = cacheDirectory and self.sourceKey()
+        javascript = sourceKey and readCache(sourceKey)
+        if javascript is None:
+            javascript = convert(inspect.getsource(self._obj))
+            if sourceKey:
+                writeCache(sourceKey, javascript)
+
+        return javascript
+
     def __call__(self, *args, **kwargs):
         return self._obj(*args, **kwargs)
+
+
+def build(directory, modules=("WebElements.All", )):
+    """
+    Translates every Convert decorated class and function within modules into the disk cache at directory, so that
+    processes sharing that cache never have to parse Python to produce JavaScript. Returns the number translated.
+    """
+    global cacheDirectory
+    cacheDirectory = directory
+    for module in modules:
+        __import__(module)
+
+    for obj in Convert.converted:
+        str(obj)
+
+    return len(Convert.converted)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m WebElements.ToClientSide cacheDirectory [module ...]")
+        sys.exit(1)
+
+    from . import ToClientSide # the imported module (not __main__) is the one Convert registers objects with
+    translated = ToClientSide.build(sys.argv[1], sys.argv[2:] or ("WebElements.All", ))
+    print("Translated %d objects into %s" % (translated, sys.argv[1]))
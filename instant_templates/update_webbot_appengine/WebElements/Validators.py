@@ -20,8 +20,10 @@
     Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
 """
 
+import json
 import re
 import string
+import uuid
 
 from . import Factory
 from . import Base
@@ -33,11 +35,16 @@ from .MultiplePythonSupport import *
 
 Factory = Factory.Factory("Validators")
 
+# ids given to elements while generating cached validation scripts - random so they can not occur in generated code
+SENTINEL_IDS = tuple("wbValidation%s%s" % (role, uuid.uuid4().hex) for role in ("Field", "Message"))
+
 class Validation(Display.Message):
     """
         Processes child validators to render validation results
     """
-    __slots__ = ('_lastScript')
+    __slots__ = ('_lastScript', '_chain')
+    _scriptTemplates = {}
+    maxScriptTemplates = 1024
 
     class ClientSide(Display.Message.ClientSide):
         """
@@ -50,14 +57,13 @@ class Validation(Display.Message):
             """
             stack = self.assign('value', self.serverSide.forElement.clientSide.value())
             stack(self.hide())
-            for validator in self.serverSide:
-                if isinstance(validator, Validator):
-                    if not validator.required:
-                        with self.value.IF.exists as condition:
-                            condition(validator.clientSide.validate())
-                        stack(condition)
-                    else:
-                        stack = stack(validator.clientSide.validate())
+            for validator in self.serverSide.chain():
+                if not validator.required:
+                    with self.value.IF.exists as condition:
+                        condition(validator.clientSide.validate())
+                    stack(condition)
+                else:
+                    stack = stack(validator.clientSide.validate())
 
             stack = self.assign('result', stack.inlineFunction().do())
             with self.result.IF.exists as context:
@@ -69,16 +75,58 @@ class Validation(Display.Message):
     def _create(self, id=None, name=None, parent=None, **kwargs):
         Display.Message._create(self, id=id, name=name, parent=parent, **kwargs)
         self._lastScript = None
+        self._chain = None
 
     def _render(self):
         Display.Message._render(self)
-        if not self.forElement or not [match for match in self if isinstance(match, Validator)]:
+        if not self.forElement or not self.chain():
             return
 
         if self._lastScript:
             self.removeScript(self._lastScript)
-        self._lastScript = self.forElement.clientSide.on(self.forElement.ClientSide.CHANGE_EVENT,
-                                                         self.clientSide.validate())
+        self._lastScript = self.forElement.clientSide(Script(self.clientScript()))
+
+    def clientScript(self):
+        """
+            Returns the javascript that validates the element client-side every time it changes - generated once for
+            each element class and validator chain, with only the ids substituted for each validation
+        """
+        ids = (self.forElement.fullId(), self.fullId())
+        if not ids[0] or not ids[1] or ids[0] == ids[1]:
+            return self.__generateScript()
+
+        key = (self.__class__, self.forElement.__class__, tuple(validator.signature() for validator in self.chain()))
+        template = self._scriptTemplates.get(key)
+        if template is None:
+            template = []
+            for part in re.split("(%s|%s)" % SENTINEL_IDS, self.__generateScript(SENTINEL_IDS)):
+                if part in SENTINEL_IDS:
+                    template.append(SENTINEL_IDS.index(part))
+                elif part:
+                    template.append(part)
+
+            if len(self._scriptTemplates) >= self.maxScriptTemplates:
+                self._scriptTemplates.clear()
+            self._scriptTemplates[key] = template = tuple(template)
+
+        ids = (json.dumps(ids[0])[1:-1], json.dumps(ids[1])[1:-1])
+        return "".join([type(part) == int and ids[part] or part for part in template])
+
+    def __generateScript(self, ids=None):
+        """
+            Generates the client-side validation script - if ids are given the validated element and the validation
+            are given them as their full ids while generating it (so they can be told apart from the rest of the script)
+        """
+        forElement = self.forElement
+        if ids is None:
+            return forElement.clientSide.on(forElement.ClientSide.CHANGE_EVENT, self.clientSide.validate()).claim()
+
+        state = (forElement._id, forElement._inheritedPrefix, self._id, self._inheritedPrefix)
+        forElement._id, forElement._inheritedPrefix, self._id, self._inheritedPrefix = (ids[0], '', ids[1], '')
+        try:
+            return forElement.clientSide.on(forElement.ClientSide.CHANGE_EVENT, self.clientSide.validate()).claim()
+        finally:
+            forElement._id, forElement._inheritedPrefix, self._id, self._inheritedPrefix = state
 
     def value(self):
         """
@@ -94,18 +142,35 @@ class Validation(Display.Message):
             childElement.control = self
         return Display.Message.addChildElement(self, childElement, ensureUnique)
 
+    def _reindexChildren(self, removed=(), added=()):
+        self._chain = None
+        Display.Message._reindexChildren(self, removed, added)
+
+    def chain(self):
+        """
+            Returns the validators that make up the validation in the order they are applied - collected once and kept
+            until a child element is added, removed or replaced
+        """
+        chain = self._chain
+        if chain is None:
+            chain = self._chain = tuple(element for element in self.childElements if isinstance(element, Validator))
+
+        return chain
+
     def validate(self):
         """
-            Defines how validation should be handled.
+            Defines how validation should be handled - returning the message of the first validator that fails
+            (or None if they all pass)
         """
         self.hide()
-        for validator in (element for element in self if isinstance(element, Validator)):
-            if validator.required or self.forElement.value():
+        forElement = self.forElement
+        for validator in self.chain():
+            if validator.required or forElement.value():
                 message = validator.validate()
                 if message:
                     self.showMessage(*message)
                     self.show()
-                    break
+                    return message
 
 
 class Validator(Base.WebElement):
@@ -176,6 +241,13 @@ class Validator(Base.WebElement):
         """
         pass
 
+    def signature(self):
+        """
+            Returns a hashable description of the client-side script the validator generates - validators whose
+            script depends on more than their class, messages and whether they are required should extend it
+        """
+        return (self.__class__, self.required, tuple(sorted(iteritems(self.messages))))
+
     def error(self, message):
         """
             Returns an error message.
@@ -266,6 +338,9 @@ class Or(Validator):
             element.control = self
         return self.validateAll()
 
+    def signature(self):
+        return Validator.signature(self) + tuple(validator.signature() for validator in self)
+
     def validateAll(self):
         message = None
         for validator in self:
@@ -354,12 +429,27 @@ class PatternValidator(Validator):
 
     class ClientSide(Validator.ClientSide):
         def validate(self):
-            with regexp(self.serverSide.pattern).do('test', self.value).IF != True as context:
+            with regexp(self.serverSide.compiledPattern()).do('test', self.value).IF != True as context:
                 context(self.error("format").RETURN())
             return context
 
+    @classmethod
+    def compiledPattern(cls):
+        """
+            Returns the pattern as a compiled regular expression - patterns defined as strings are compiled once
+            and stored back on the class
+        """
+        pattern = cls.pattern
+        if isinstance(pattern, (str, unicode)):
+            pattern = cls.pattern = re.compile(pattern)
+
+        return pattern
+
+    def signature(self):
+        return Validator.signature(self) + (self.compiledPattern().pattern, )
+
     def validate(self):
-        if not self.pattern.match(self.forElement.value()):
+        if not self.compiledPattern().match(self.forElement.value()):
             return self.error("format")
 
 
@@ -386,3 +476,99 @@ class PhoneNumber(PatternValidator):
 Factory.addProduct(PhoneNumber)
 
 
+
+class ValidationPlan(object):
+    """
+        A flat list of every validation within an element tree as (field id, validation, required) entries - allowing
+        all the fields of a large form to be validated server-side in a single loop
+    """
+    __slots__ = ('entries', )
+
+    def __init__(self, entries=()):
+        self.entries = list(entries)
+
+    @classmethod
+    def fromElement(cls, element):
+        """
+            Builds a plan by walking the element tree, collecting every validation that is associated with a field
+        """
+        return cls(cls.__entry(validation) for validation in cls.__validations(element))
+
+    @classmethod
+    def fromPositions(cls, element, positions):
+        """
+            Builds a plan from the positions (as returned by positions()) of validations within a tree of the same
+            structure as the one the positions were taken from - returning None if the structure no longer matches
+        """
+        entries = []
+        for position in positions:
+            validation = element
+            try:
+                for index in position:
+                    validation = validation.childElements[index]
+            except (IndexError, AttributeError):
+                return None
+
+            if not isinstance(validation, Validation) or not validation.forElement:
+                return None
+            entries.append(cls.__entry(validation))
+
+        return cls(entries)
+
+    @staticmethod
+    def __validations(element):
+        stack = [element]
+        while stack:
+            element = stack.pop()
+            if isinstance(element, Validation) and element.forElement:
+                yield element
+
+            children = getattr(element, 'childElements', None)
+            if children:
+                stack.extend(reversed(children))
+
+    @staticmethod
+    def __entry(validation):
+        return (validation.forElement.fullId(), validation,
+                bool([validator for validator in validation.chain() if validator.required]))
+
+    def positions(self, element):
+        """
+            Returns the position of each validation within element as a list of child indexes - allowing the plan to
+            be rebuilt for other trees built from the same template using fromPositions
+        """
+        positions = []
+        for fieldId, validation, required in self.entries:
+            position = []
+            while validation is not element:
+                parent = validation.parent
+                position.append(parent.childElements.index(validation))
+                validation = parent
+            position.reverse()
+            positions.append(tuple(position))
+
+        return positions
+
+    def validate(self):
+        """
+            Validates every field in the plan - returning a dictionary of field id:message for each one that failed
+        """
+        failed = {}
+        for fieldId, validation, required in self.entries:
+            message = validation.validate()
+            if message:
+                failed[fieldId] = message
+
+        return failed
+
+    def valid(self):
+        """
+            Returns True if every field in the plan passes validation
+        """
+        return not self.validate()
+
+    def requiredFields(self):
+        """
+            Returns the ids of the fields that must be given a value
+        """
+        return [fieldId for fieldId, validation, required in self.entries if required]
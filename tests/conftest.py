@@ -0,0 +1,31 @@
+'''
+    conftest.py
+
+    Makes the WebElements and DynamicForm packages of the app engine template importable by the tests
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "instant_templates",
+                                "create_webbot_appengine"))
+
+# the pygments package bundled with the app engine template (imported by DynamicForm) only supports python 2
+if sys.version_info[0] > 2:
+    collect_ignore = ["test_dynamic_form.py"]
@@ -0,0 +1,584 @@
+'''
+    test_base.py
+
+    Tests building and modifying trees of WebElements
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+import copy
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from WebElements import ClientSide, Display, Inputs, Layout, UITemplate
+from WebElements.Base import Prototype, TemplateElement, TextNode, WebElement, propertySetters
+from WebElements.Containers import Tab
+from WebElements.Display import CacheElement, Label
+from WebElements.Factory import Composite
+from WebElements.Inputs import TextBox
+from WebElements.Layout import Box, Horizontal, Vertical
+from WebElements.MethodUtils import CallBack
+from WebElements.Navigation import UnrolledSelect
+from WebElements.Resources import ScriptContainer
+from WebElements.Validators import Int, NotEmpty, Validation
+
+
+def labels(*texts):
+    """
+        Returns a box containing a label for each text
+    """
+    box = Box()
+    for text in texts:
+        box.addChildElement(Label()).setText(text)
+    return box
+
+
+class Custom(WebElement):
+    """
+        An element that renders itself by overriding toHTML
+    """
+    __slots__ = ()
+
+    def toHTML(self, formatted=False, *args, **kwargs):
+        return "<b>x</b>\n<i>y</i>"
+
+
+def test_render():
+    box = Box()
+    box.addChildElement(Box()).addChildElement(Label()).setText('hi')
+    box.addChildElement(TextNode('text'))
+    assert box.toHTML() == '<div><div><label>hi</label></div>text</div>'
+    assert box.toHTML(formatted=True) == '<div>\n <div>\n  <label>\n   hi\n  </label>\n </div>\n text\n</div>'
+
+
+def test_renderElementsThatOverrideToHTML():
+    box = Box()
+    box.addChildElement(Box()).addChildElement(Custom())
+    assert box.toHTML() == '<div><div><b>x</b>\n<i>y</i></div></div>'
+    assert box.toHTML(formatted=True) == '<div>\n <div>\n  <b>x</b>\n  <i>y</i>\n </div>\n</div>'
+
+
+def test_renderLayoutsIndentLikeOtherElements():
+    horizontal = Horizontal()
+    horizontal.addChildElement(Label()).setText('a')
+    assert horizontal.toHTML() == '<div class="WClear"><label class="WBlock WLeft">a</label></div>'
+    assert horizontal.toHTML(formatted=True) == ('<div class="WClear">\n <label class="WBlock WLeft">\n  a\n'
+                                                 ' </label>\n</div>')
+
+
+def test_renderDeepTreesWithoutRecursion():
+    root = element = Box()
+    for depth in range(sys.getrecursionlimit() * 2):
+        element = element.addChildElement(Box())
+    element.addChildElement(Label()).setText('deep')
+
+    html = root.toHTML()
+    assert html.count('<div>') == sys.getrecursionlimit() * 2 + 1
+    assert '<label>deep</label>' in html
+
+
+class Counter(object):
+    """
+        Returns a higher number every time it is called
+    """
+    def __init__(self):
+        self.count = 0
+
+    def next(self):
+        self.count += 1
+        return self.count
+
+
+def test_startTagFollowsChanges():
+    label = Label()
+    assert label.startTag() == '<label>'
+    assert label.startTag() is label.startTag()
+
+    label.addClass('first')
+    label.attributes['title'] = 'Hello "you"'
+    label.style['color'] = 'red'
+    assert label.startTag() == '<label class="first" style="color:red;" title="Hello &quot;you&quot;">'
+
+    label.removeClass('first')
+    del label.attributes['title']
+    label.id = 'name'
+    assert label.startTag() == '<label id="name" style="color:red;">'
+
+    box = Box()
+    box.addChildElement(label)
+    box.setPrefix('form-')
+    assert label.startTag() == '<label id="form-name" style="color:red;">'
+
+    label._tagName = 'span'
+    assert label.startTag() == '<span id="form-name" style="color:red;">'
+
+
+def test_startTagEvaluatesCallBacksOnEveryRender():
+    label = Label()
+    label.attributes['data-count'] = CallBack(Counter(), 'next')
+    assert label.startTag() == '<label data-count="1">'
+    assert label.startTag() == '<label data-count="2">'
+
+
+def cachedForm():
+    """
+        Returns a render cached box, holding a section with a label and a text box, that has already been rendered
+    """
+    form = Box()
+    form.enableRenderCache()
+    section = form.addChildElement(Box())
+    section.addChildElement(Label()).setText('Name')
+    section.addChildElement(TextBox('name'))
+    form.toHTML()
+    return form
+
+
+def test_renderCacheIsUsedUntilChanged(monkeypatch):
+    form = cachedForm()
+    html = form.toHTML()
+    monkeypatch.setattr(Label, 'toHTML', lambda *args, **kwargs: pytest.fail("rendered a cached label"))
+    assert form.toHTML() == html
+
+
+def test_renderCacheIsClearedByChangesToDescendants():
+    changes = (lambda label, textBox: label.setText('Full Name'),
+               lambda label, textBox: label.addClass('required'),
+               lambda label, textBox: label.attributes.update({'title':'Your name'}),
+               lambda label, textBox: label.style.update({'color':'red'}),
+               lambda label, textBox: textBox.setValue('Tim'),
+               lambda label, textBox: textBox.addJavascriptEvent('onchange', 'changed();'),
+               lambda label, textBox: label.parent.addChildElement(Label()),
+               lambda label, textBox: label.remove(),
+               lambda label, textBox: label.replaceWith(Label()),
+               lambda label, textBox: label.parent.moveElement(label, textBox))
+    for change in changes:
+        form = cachedForm()
+        html = form.toHTML()
+        label, textBox = form.childElements[0].childElements
+        change(label, textBox)
+        changed = form.toHTML()
+        assert changed != html
+
+        form.disableRenderCache()
+        assert form.toHTML() == changed
+
+
+def test_renderCacheIsKeyedOnFormattingAndPrefix():
+    form = cachedForm()
+    assert form.toHTML(formatted=True) != form.toHTML()
+    assert form.toHTML() == form.toHTML()
+
+    form.setPrefix('signup-')
+    assert 'id="signup-name"' in form.toHTML()
+
+
+def test_cacheElement():
+    cache = CacheElement()
+    label = cache.addChildElement(Label())
+    label.setText('first')
+    assert cache.toHTML() == '<label>first</label>'
+
+    label.setText('second')
+    assert cache.toHTML() == '<label>second</label>'
+
+
+def test_propertySettersAreKeptPerClass():
+    assert propertySetters(Label) is propertySetters(Label)
+    assert propertySetters(Label) is not propertySetters(Box)
+    assert set(propertySetters(Label)) == set(Label.properties)
+
+
+def test_setProperties():
+    box = Box('box')
+    box.setProperties({'title':'Title', 'tabindex':'3', 'hide':'false', 'key':'a.b', 'class':'one two',
+                       'javascriptEvents':{'onclick':'clicked();'}, 'unknown':'ignored', 'style':None})
+    assert box.attributes['title'] == 'Title'
+    assert box.attributes['tabindex'] == 3
+    assert box.key == 'a.b'
+    assert list(box.classes) == ['one', 'two']
+    assert 'onclick="clicked();"' in box.toHTML()
+    assert not box.style
+    assert box.shown()
+
+    box.setProperties([('hide', 'True'), ('tabindex', 'first')])
+    assert not box.shown()
+    assert box.attributes['tabindex'] == 'first'
+
+
+def test_setPropertyOnAChildElement():
+    tab = Tab('tab')
+    tab.setProperty('text', 'Settings')
+    assert tab.tabLabel.text() == 'Settings'
+
+
+def test_setPropertiesClearsTheRenderCache():
+    form = cachedForm()
+    label = form.childElements[0].childElements[0]
+    for properties in ({'title':'Your name'}, {'hide':'true'}, {'text':'Full Name'}):
+        html = form.toHTML()
+        label.setProperties(properties)
+        assert form.toHTML() != html
+
+    html = form.toHTML()
+    label.setProperty('title', 'Name')
+    assert form.toHTML() != html
+
+
+def test_inheritedStateFollowsChangesToAncestors():
+    outer = Box()
+    inner = outer.addChildElement(Box())
+    field = inner.addChildElement(TextBox('name'))
+    assert (field.fullId(), field.editable(), field.indentationLevel()) == ('name', True, 2)
+
+    outer.setPrefix('signup-')
+    outer.setEditable(False)
+    assert (field.fullId(), field.editable()) == ('signup-name', False)
+
+    inner.setPrefix('address-')
+    assert field.fullId() == 'address-name'
+
+    outer.setEditable(True)
+    assert field.editable()
+
+
+def test_inheritedStateFollowsReparenting():
+    first = Box()
+    first.setPrefix('first-')
+    first.setEditable(False)
+    second = Box()
+    second.setPrefix('second-')
+    section = first.addChildElement(Box())
+    field = section.addChildElement(TextBox('name'))
+    assert (field.fullId(), field.editable(), field.indentationLevel()) == ('first-name', False, 2)
+
+    section.remove()
+    assert (field.fullId(), field.editable(), field.indentationLevel()) == ('name', True, 1)
+
+    second.addChildElement(Box()).addChildElement(section)
+    assert (field.fullId(), field.editable(), field.indentationLevel()) == ('second-name', True, 3)
+
+
+def test_scriptContainerIsInherited():
+    outer = Box()
+    field = outer.addChildElement(Box()).addChildElement(TextBox('name'))
+    first = ScriptContainer()
+    second = ScriptContainer()
+    outer.setScriptContainer(first)
+    assert field.scriptContainer() is first
+
+    outer.setScriptContainer(second)
+    assert field.scriptContainer() is second
+
+
+def signUpForm(indexed):
+    """
+        Returns a small form - with an element index if indexed is set. It holds no text, since searching for an
+        id that is not found stops at the first text node
+    """
+    form = Box('form')
+    if indexed:
+        form.enableIndex()
+    for fieldId in ('name', 'email'):
+        row = form.addChildElement(Horizontal())
+        row.addChildElement(Box()).addClass('caption')
+        row.addChildElement(TextBox(fieldId)).addClass('field')
+    return form
+
+
+def lookups(form):
+    """
+        Returns the result of every kind of child element lookup on form
+    """
+    return ((form.getChildElementWithId('name'), form.getChildElementWithId('email'),
+             form.getChildElementWithId('mail'), form.getChildElementWithId('phone')),
+            form.getChildElementsWithName('email'), form.getChildElementsWithName('address'),
+            form.getChildElementsWithClass('field'),
+            form.getChildElementsWithTagName('input'))
+
+
+def describe(results):
+    """
+        Replaces each element within the results of lookups with its tag name, id and classes - so results from
+        different trees can be compared
+    """
+    if isinstance(results, (list, tuple)):
+        return [describe(result) for result in results]
+    elif results is None:
+        return None
+    return (results._tagName, results.id, sorted(results.classes))
+
+
+def test_indexedLookupsMatchSearching():
+    changes = (lambda form: None,
+               lambda form: form.childElements[1].addChildElement(TextBox('phone')).addClass('field'),
+               lambda form: form.getChildElementWithId('name').addClass('required'),
+               lambda form: form.getChildElementWithId('name').removeClass('field'),
+               lambda form: setattr(form.getChildElementWithId('email'), 'name', 'address'),
+               lambda form: setattr(form.getChildElementWithId('email'), 'id', 'mail'),
+               lambda form: form.childElements[0].remove(),
+               lambda form: form.getChildElementWithId('mail').replaceWith(Box()),
+               lambda form: form.childElements[0].addChildElement(Vertical()).addChildElement(Box('caption')))
+    searched = signUpForm(False)
+    indexed = signUpForm(True)
+    assert indexed.elementIndex() is not None
+    for change in changes:
+        change(searched)
+        change(indexed)
+        assert describe(lookups(indexed)) == describe(lookups(searched))
+
+    assert indexed.toHTML() == searched.toHTML()
+    assert describe(lookups(indexed)) == describe(lookups(searched))
+
+
+def test_indexFollowsMovedSubtrees():
+    first = signUpForm(True)
+    second = Box()
+    second.enableIndex()
+    row = first.childElements[0]
+    second.addChildElement(row)
+    assert first.getChildElementWithId('name') is None
+    assert second.getChildElementWithId('name') is row.childElements[1]
+
+
+def test_indexFindsUnrolledSelectValues():
+    form = Box()
+    form.enableIndex()
+    select = form.addChildElement(UnrolledSelect('color'))
+    assert form.getChildElementWithId('color') is select.userInput
+
+
+ORDERED_ELEMENT = """
+from WebElements.Layout import Box
+from WebElements.Inputs import TextBox
+box = Box('box')
+for className in ('zeta', 'alpha', 'mid', 'beta', 'omega', 'delta'):
+    box.addClass(className)
+for attribute in ('data-z', 'data-a', 'title', 'data-m', 'lang'):
+    box.attributes[attribute] = attribute
+box.setStyleFromString('width:1px;color:red;z-index:2;margin:0;border:none')
+field = box.addChildElement(TextBox('field'))
+field.setProperties({'value':'x', 'class':'one two three', 'tabindex':'3', 'title':'t', 'lang':'en'})
+print(box.toHTML())
+"""
+
+
+def test_renderOrderDoesNotDependOnHashing():
+    html = set()
+    for seed in ('1', '2', '3'):
+        environment = dict(os.environ, PYTHONHASHSEED=seed)
+        process = subprocess.Popen([sys.executable, '-c', ORDERED_ELEMENT], stdout=subprocess.PIPE,
+                                   cwd=os.path.dirname(sys.modules['WebElements'].__path__[0]), env=environment)
+        html.add(process.communicate()[0])
+        assert process.returncode == 0
+
+    assert len(html) == 1
+    assert b'class="zeta alpha mid beta omega delta"' in html.pop()
+
+
+def test_classesAttributesAndStylesKeepTheirOrder():
+    label = Label()
+    for className in ('zeta', 'alpha', 'mid'):
+        label.addClass(className)
+    label.attributes['data-z'] = 'z'
+    label.attributes['data-a'] = 'a'
+    label.style['width'] = '1px'
+    label.style['color'] = 'red'
+    startTag = '<label class="zeta alpha mid" style="width:1px;color:red;" data-z="z" data-a="a">'
+    assert label.startTag() == startTag
+
+    label.removeClass('alpha')
+    label.addClass('alpha')
+    assert 'class="zeta mid alpha"' in label.startTag()
+
+    assert copy.deepcopy(label).startTag() == label.startTag()
+    assert list(pickle.loads(pickle.dumps(label.classes.copy()))) == ['zeta', 'mid', 'alpha']
+
+
+def contactForm():
+    """
+        Returns a form with fields bound by id, by a shared name, and by key
+    """
+    form = Box('form')
+    form.addChildElement(TextBox('email'))
+    section = form.addChildElement(Box())
+    for fieldId in ('phone1', 'phone2', 'phone3'):
+        section.addChildElement(TextBox(fieldId, 'phone'))
+    city = form.addChildElement(TextBox('city'))
+    city.key = 'address.city'
+    return form
+
+
+def values(form):
+    return [field.value() for field in form.getChildElementsWithTagName('input')]
+
+
+def test_insertVariables():
+    form = contactForm()
+    form.insertVariables({'email':'tim@example.com', 'phone':['1', '2', '3'], 'address':{'city':'Boston'}})
+    assert values(form) == ['tim@example.com', '1', '2', '3', 'Boston']
+
+    form.insertVariables({'phone3':'4', 'unrelated':'value'})
+    assert values(form) == ['tim@example.com', '1', '2', '4', 'Boston']
+
+
+def test_insertVariablesUsingPrefixes():
+    form = contactForm()
+    form.setPrefix('contact-')
+    form.insertVariables({'contact-email':'tim@example.com', 'phone1':'1'})
+    assert values(form)[:2] == ['tim@example.com', '1']
+
+
+def test_exportVariables():
+    form = contactForm()
+    form.insertVariables({'email':'tim@example.com', 'phone':['1', '2', '3'], 'address':{'city':'Boston'}})
+    assert form.exportVariables() == {'address':{'city':'Boston'}}
+    assert form.exportVariables(flat=True) == {'email':'tim@example.com', 'phone':['1', '2', '3'],
+                                               'city':'Boston'}
+
+
+def test_variableBindingsAreKeptUntilTheTreeChanges():
+    form = contactForm()
+    bindings = form.variableBindings()
+    form.insertVariables({'email':'tim@example.com'})
+    assert form.variableBindings() is bindings
+
+    fax = form.childElements[1].addChildElement(TextBox('fax'))
+    assert form.variableBindings() is not bindings
+    form.insertVariables({'fax':'5'})
+    assert fax.value() == '5'
+
+    fax.id = 'telefax'
+    form.insertVariables({'telefax':'6'})
+    assert fax.value() == '6'
+
+    form.childElements[1].removeChild(fax)
+    form.insertVariables({'telefax':'7'})
+    assert fax.value() == '6'
+
+
+def test_moveElementPlacesTheChildAfterPutAfter():
+    box = labels('a', 'b', 'c', 'd')
+    a, b, c, d = box.childElements
+    box.moveElement(a, c)
+    assert box.childElements == [b, c, a, d]
+
+    box.moveElement(d, b)
+    assert box.childElements == [b, d, c, a]
+    assert box.toHTML() == '<div><label>b</label><label>d</label><label>c</label><label>a</label></div>'
+
+
+def test_moveElementClearsTheRenderCache():
+    box = labels('a', 'b')
+    box.enableRenderCache()
+    box.toHTML()
+
+    box.moveElement(box.childElements[0], box.childElements[1])
+    assert box.toHTML() == '<div><label>b</label><label>a</label></div>'
+
+
+def test_moveElementReordersValidators():
+    validation = Validation()
+    validation.addChildElement(Int())
+    validation.addChildElement(NotEmpty())
+    assert [type(validator) for validator in validation.chain()] == [Int, NotEmpty]
+
+    integer, notEmpty = validation.chain()
+    validation.moveElement(notEmpty, validation.childElements[0])
+    assert [type(validator) for validator in validation.chain()] == [NotEmpty, Int]
+
+
+def signUpTemplate():
+    """
+        Returns the element tree built from a small sign up template
+    """
+    template = UITemplate.fromSHPAML("box#form\n > label#title text=Welcome\n > textbox#email\n")
+    return TemplateElement(template=template, factory=Composite((Layout.Factory, Display.Factory, Inputs.Factory)))
+
+
+def test_prototypeClonesMatchTheOriginal():
+    form = signUpTemplate()
+    clone = Prototype(form).clone()
+    assert clone is not form
+    assert clone.toHTML() == form.toHTML()
+    assert clone.toHTML(formatted=True) == form.toHTML(formatted=True)
+    assert clone.exportVariables(flat=True) == form.exportVariables(flat=True)
+
+
+def test_prototypeClonesPointToTheirOwnElements():
+    form = signUpTemplate()
+    clone = Prototype(form).clone()
+    assert clone.email is not form.email
+    assert clone.email.parent.parent is clone
+    assert clone.childElements[0].childElements[0] is clone.title
+    assert clone.parent is None
+
+
+def test_prototypeClonesAreIndependent():
+    form = signUpTemplate()
+    html = form.toHTML()
+    prototype = Prototype(form)
+    first = prototype.clone()
+    first.title.setText('Changed')
+    first.email.setValue('tim@example.com')
+    first.email.addClass('required')
+    first.email.attributes['title'] = 'Email'
+    first.email.style['color'] = 'red'
+
+    second = prototype.clone()
+    assert form.toHTML() == html
+    assert second.toHTML() == html
+    assert 'Changed' in first.toHTML() and 'class="required"' in first.toHTML()
+
+
+def test_prototypeClonesRemapConnections():
+    form = signUpTemplate()
+    form.email.connect('valueChanged', None, form.title, 'setText')
+    clone = Prototype(form).clone()
+    clone.email.emit('valueChanged', 'Hello')
+    assert clone.title.text() == 'Hello'
+    assert form.title.text() == 'Welcome'
+
+
+def test_cloneElement():
+    box = Box('box')
+    label = box.addChildElement(Label())
+    label.setText('text')
+    clone = box.clone()
+    assert clone.toHTML() == box.toHTML()
+    assert clone.childElements[0].parent is clone
+
+    parent = Box()
+    labelClone = label.clone(parent)
+    assert labelClone.parent is parent
+    assert label.parent is box
+    assert copy.deepcopy(label).parent is not box
+
+
+def test_deepcopyScripts():
+    container = ScriptContainer()
+    script = ClientSide.Script("a()", container)
+    script(ClientSide.Script("b()"))
+    copied = copy.deepcopy(script)
+    copied(ClientSide.Script("c()"))
+    assert str(script) == "a();b()"
+    assert str(copied) == "a();b();c()"
+    assert copied.container is not container
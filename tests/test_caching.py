@@ -0,0 +1,182 @@
+'''
+    test_caching.py
+
+    Tests the in-process cache backend and the cache policies of DynamicForm/Caching.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+import pytest
+
+from DynamicForm import Caching
+from DynamicForm.Caching import CachePolicy, LocalCache
+from DynamicForm.HTTP import Request
+from WebElements.Layout import Box
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+        Replaces the time seen by the cache with one that only moves when told to
+    """
+    now = [1000.0]
+    monkeypatch.setattr(Caching.time, 'time', lambda: now[0])
+    return now
+
+
+class Renderer(object):
+    """
+        Stands in for a controls renderResponse - counting how often it is called
+    """
+    def __init__(self, html='<div>nav</div>', script='alert(1);'):
+        self.html = html
+        self.script = script
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        request.response.scripts.addScript(self.script)
+        return self.html
+
+
+def test_localCacheGetSetDelete():
+    cache = LocalCache()
+    assert cache.get('key') is None
+
+    assert cache.set('key', 'value')
+    assert cache.get('key') == 'value'
+
+    assert cache.delete('key')
+    assert not cache.delete('key')
+    assert cache.get('key') is None
+
+
+def test_localCacheEvictsLeastRecentlyUsed():
+    cache = LocalCache(maxSize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_localCacheExpires(clock):
+    cache = LocalCache()
+    cache.set('short', 1, ttl=10)
+    cache.set('forever', 2)
+
+    clock[0] += 9
+    assert cache.get('short') == 1
+
+    clock[0] += 1
+    assert cache.get('short') is None
+    assert cache.get('forever') == 2
+
+
+def test_localCacheAdd(clock):
+    cache = LocalCache()
+    assert cache.add('lock', True, ttl=5)
+    assert not cache.add('lock', True, ttl=5)
+
+    clock[0] += 5
+    assert cache.add('lock', True, ttl=5)
+
+
+def test_policyKeyVariesOnFields():
+    policy = CachePolicy(varyOn=('page', ))
+    control = Box('nav')
+
+    firstPage = policy.key(control, Request(method='GET', fields={'page': '1'}))
+    assert firstPage == policy.key(control, Request(method='GET', fields={'page': '1', 'other': 'ignored'}))
+    assert firstPage != policy.key(control, Request(method='GET', fields={'page': '2'}))
+    assert firstPage != policy.key(Box('sidebar'), Request(method='GET', fields={'page': '1'}))
+
+
+def test_policyKeyVariesOnUser():
+    control = Box('nav')
+    sharedPolicy = CachePolicy()
+    userPolicy = CachePolicy(varyOnUser=True)
+
+    assert (sharedPolicy.key(control, Request(method='GET', user='tim')) ==
+            sharedPolicy.key(control, Request(method='GET', user='bob')))
+    assert (userPolicy.key(control, Request(method='GET', user='tim')) !=
+            userPolicy.key(control, Request(method='GET', user='bob')))
+
+
+def test_policyOnlyCachesGivenMethods():
+    policy = CachePolicy()
+    assert policy.caches(Request(method='GET'))
+    assert not policy.caches(Request(method='POST'))
+
+
+def test_policyRendersOnceAndReplaysScripts(clock):
+    policy = CachePolicy(ttl=60, backend=LocalCache())
+    control = Box('nav')
+    renderer = Renderer()
+
+    first = policy.render(control, Request(method='GET'), renderer)
+    second = policy.render(control, Request(method='GET'), renderer)
+
+    assert renderer.calls == 1
+    assert first == second
+    assert first.startswith('<div>nav</div>')
+    assert 'alert(1);' in second
+
+
+def test_policyAddsScriptsToExistingContainer(clock):
+    policy = CachePolicy(ttl=60, backend=LocalCache())
+    control = Box('nav')
+    policy.render(control, Request(method='GET'), Renderer())
+
+    request = Request(method='GET')
+    request.response.scripts = Caching.ScriptContainer()
+    assert policy.render(control, request, Renderer()) == '<div>nav</div>'
+    assert [script for script in request.response.scripts.scripts() if 'alert(1);' in script]
+
+
+def test_policyRendersAgainOnceExpired(clock):
+    policy = CachePolicy(ttl=60, backend=LocalCache())
+    control = Box('nav')
+    renderer = Renderer()
+
+    policy.render(control, Request(method='GET'), renderer)
+    clock[0] += 61
+    policy.render(control, Request(method='GET'), renderer)
+    assert renderer.calls == 2
+
+
+def test_policyServesStaleWhileRevalidating(clock):
+    backend = LocalCache()
+    policy = CachePolicy(ttl=60, staleWhileRevalidate=60, backend=backend)
+    control = Box('nav')
+    policy.render(control, Request(method='GET'), Renderer('old'))
+
+    clock[0] += 61
+    key = policy.key(control, Request(method='GET'))
+    assert backend.add(key + ":revalidating", True, 30) # another request is already rendering a fresh copy
+
+    renderer = Renderer('new')
+    assert policy.render(control, Request(method='GET'), renderer).startswith('old')
+    assert renderer.calls == 0
+
+    backend.delete(key + ":revalidating")
+    assert policy.render(control, Request(method='GET'), renderer).startswith('new')
+    assert renderer.calls == 1
+    assert backend.get(key + ":revalidating") is None
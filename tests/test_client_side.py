@@ -0,0 +1,103 @@
+'''
+    test_client_side.py
+
+    Tests building client side javascript out of Script fragments using WebElements/ClientSide.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+from WebElements.ClientSide import Script, call, eventHandler, inlineFunction
+
+
+def test_appendingKeepsFragments():
+    script = Script("a()")
+    script(Script("b()"))
+    script("c")
+    assert script.fragments() == ["a()", ";", "b()", ";", '"c"']
+    assert script.content == 'a();b();"c"'
+    assert script.fragments() == ['a();b();"c"']
+
+
+def test_blocks():
+    script = Script("if(a)")
+    with script:
+        script(call("b", 1))
+        script(call("c"))
+    assert str(script) == "if(a){b(1);c();}"
+
+    empty = Script("if(a)")
+    with empty:
+        pass
+    assert str(empty) == "if(a){}"
+
+
+def test_settingContent():
+    script = Script("a()")
+    script(Script("b()"))
+    script.content = "c()"
+    assert script.fragments() == ["c()"]
+
+    script.value = 1
+    assert str(script) == "c().value = 1"
+
+
+def test_return():
+    script = Script("a")
+    script(Script("b"))
+    assert str(script.RETURN()) == "return a;b"
+    assert str(Script("a").RETURN(1)) == "a;return 1"
+
+
+def test_inlineFunctionsUseTheFragmentsOfScripts():
+    body = Script("a()")
+    body(Script("b()"))
+    function = inlineFunction(body, ("x", "y"))
+    assert function.fragments() == ["function(x,y){", "a()", ";", "b()", "}"]
+    assert str(function) == "function(x,y){a();b()}"
+    assert str(eventHandler("text")) == 'function(evt){"text"}'
+
+
+class Container(object):
+    """
+        Records the scripts claimed from it
+    """
+    def __init__(self):
+        self.removed = []
+
+    def removeScript(self, script):
+        self.removed.append(script)
+
+
+def test_usingAScriptClaimsIt():
+    container = Container()
+    claimed = Script("a()", container)
+    Script("b()")(claimed)
+    inlineFunction(claimed)
+    assert container.removed == [claimed, claimed]
+
+    assert str(claimed.copy()) == "a()"
+    assert claimed.copy().container is None
+
+
+def test_longChainsMatchJoinedContent():
+    script = Script("start()")
+    expected = ["start()"]
+    for index in range(1000):
+        script(call("step", index))
+        expected.append("step(%d)" % index)
+    assert len(script.fragments()) == 2001
+    assert str(script) == ";".join(expected)
@@ -0,0 +1,110 @@
+'''
+    test_connectable.py
+
+    Tests connecting signals to slots and emitting them using WebElements/Connectable.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+from WebElements.Connectable import Connectable
+
+
+class Emitter(Connectable):
+    signals = ['changed']
+
+
+class Quiet(Connectable):
+    signals = ['changed']
+
+
+class Receiver(object):
+    """
+        Records every call made to its slots
+    """
+    def __init__(self):
+        self.calls = []
+
+    def set(self, value):
+        self.calls.append(('set', value))
+        return value
+
+    def clear(self):
+        self.calls.append(('clear', ))
+        return 'cleared'
+
+
+def test_emitWithoutConnections():
+    assert Quiet().emit('changed', 1) == []
+    assert not Quiet.hasListeners
+    assert Emitter().emit('changed', 1) == []
+
+
+def test_emitCallsSlots():
+    emitter = Emitter()
+    receiver = Receiver()
+    emitter.connect('changed', None, receiver, 'set')
+    emitter.connect('changed', 'reset', receiver, 'clear')
+    emitter.connect('changed', None, receiver, 'set', 'was ${value}')
+    assert Emitter.hasListeners
+
+    assert emitter.emit('changed', 1) == [1, 'was 1']
+    assert emitter.emit('changed', 'reset') == ['reset', 'was reset', 'cleared'] # grouped by condition
+    assert receiver.calls[-3:] == [('set', 'reset'), ('set', 'was reset'), ('clear', )]
+
+
+def test_slotsAreBoundOnce(monkeypatch):
+    emitter = Emitter()
+    receiver = Receiver()
+    emitter.connect('changed', None, receiver, 'set')
+    emitter.emit('changed', 1)
+
+    lookups = []
+    monkeypatch.setattr(Receiver, '__getattribute__',
+                        lambda self, name: lookups.append(name) or object.__getattribute__(self, name))
+    assert emitter.emit('changed', 2) == [2]
+    assert 'set' not in lookups
+
+
+def test_disconnect():
+    emitter = Emitter()
+    receiver = Receiver()
+    emitter.connect('changed', None, receiver, 'set')
+    emitter.connect('changed', None, receiver, 'clear')
+    emitter.emit('changed', 1)
+
+    emitter.disconnect('changed', None, receiver, 'clear')
+    assert emitter.emit('changed', 2) == [2]
+
+    emitter.disconnect()
+    assert emitter.emit('changed', 3) == []
+
+
+def test_replacedSlotsAreBoundAgain():
+    emitter = Emitter()
+    receiver = Receiver()
+    emitter.connect('changed', None, receiver, 'set')
+    emitter.connect('changed', None, receiver, 'added')
+    assert emitter.emit('changed', 1) is False # added is not defined yet
+
+    receiver.added = lambda value: 'added %s' % value
+    assert emitter.emit('changed', 2) == [2, 'added 2']
+
+    receiver.set = lambda: 'replaced'
+    assert emitter.emit('changed', 3) == [3, 'added 3']
+    emitter.rebindSlots()
+    assert emitter.emit('changed', 4) == ['replaced', 'added 4']
@@ -0,0 +1,79 @@
+'''
+    test_data_views.py
+
+    Tests filling tables with data - including the columnar mode - using WebElements/DataViews.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+from WebElements.DataViews import Row, Table
+
+DATA = [{'name':'Tim', 'age':30}, (('name', 'Bob'), ('age', 40)), {'name':'Sue <admin>'}]
+
+
+def table(columnar, separator=False):
+    """
+        Returns a table filled with DATA - stored as plain values if columnar is set
+    """
+    table = Table('people')
+    table.columnar = columnar
+    table.addColumns(('name', 'age'))
+    table.addRows(DATA[:2])
+    if separator:
+        table.addSeparator('Admins')
+    table.addRows(DATA[2:])
+    return table
+
+
+def test_columnarTablesRenderTheSame():
+    for separator in (False, True):
+        for formatted in (False, True):
+            assert (table(True, separator).toHTML(formatted=formatted) ==
+                    table(False, separator).toHTML(formatted=formatted))
+
+
+def test_columnarRowsAreCreatedWhenAccessed():
+    columnar = table(True)
+    rowCount = len(columnar.childElements)
+    assert len(columnar.rows) == 3
+    assert len(columnar.childElements) == rowCount
+
+    assert columnar.cell(1, 'name').text() == 'Bob'
+    assert len(columnar.childElements) == rowCount + 1
+    assert columnar.toHTML() == table(False).toHTML()
+
+
+def test_rowsAreAlwaysRowElements():
+    for columnar in (True, False):
+        rows = table(columnar).rows
+        assert all(isinstance(row, Row) for row in rows)
+        assert [row.cell('name').text() for row in rows] == ['Tim', 'Bob', 'Sue &lt;admin&gt;']
+        assert rows[-1] is rows[2]
+        assert rows[1:] == [rows[1], rows[2]]
+        assert 'rowlight' in rows[-2].classes
+
+
+def test_reorderColumns():
+    html = []
+    for columnar in (True, False):
+        reordered = table(columnar)
+        reordered.columns = ['age', 'name']
+        html.append(reordered.toHTML())
+        assert [column.element.text() for column in reordered.rows[0].childElements] == [30, 'Tim']
+
+    assert html[0] == html[1]
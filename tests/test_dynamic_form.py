@@ -0,0 +1,184 @@
+'''
+    test_dynamic_form.py
+
+    Tests rendering whole pages through DynamicForm
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+from DynamicForm.DynamicForm import DynamicForm
+from DynamicForm.HTTP import Request, Response
+from DynamicForm.PageControls import ElementControl, TemplateControl
+from WebElements import All, Factory, UITemplate
+from WebElements.Base import StaticHTML
+from WebElements.Containers import Accordion
+from WebElements.Display import Label
+from WebElements.Inputs import TextBox
+from WebElements.Resources import ScriptBundle
+from WebElements.Validators import NotEmpty, Validation, ValidationPlan
+
+
+class Page(DynamicForm):
+    """
+        A page with a single label - that fails to render when asked to
+    """
+    class MainControl(ElementControl):
+        def initUI(self, ui, request):
+            ui.addChildElement(Label()).setText('hello')
+            if request.fields.get('failBody'):
+                raise ValueError('failed rendering the body')
+
+    def title(self, request):
+        if request.fields.get('failHead'):
+            raise ValueError('failed rendering the head')
+        return 'Page'
+
+
+class StreamedPage(Page):
+    streamed = True
+
+
+def test_streamedPageMatchesWholePage():
+    page = Page()
+    whole = page.handleRequest(Request(method='GET'))
+    page.streamed = True
+    streamed = page.handleRequest(Request(method='GET'))
+    assert not whole.isStreamed()
+    assert streamed.isStreamed()
+    assert streamed.status == Response.Status.OK
+    assert streamed.fullContent() == whole.content
+
+
+def test_streamedPageHeadErrorsSetTheStatus():
+    response = StreamedPage().handleRequest(Request(method='GET', fields={'failHead': '1'}))
+    assert response.status == Response.Status.INTERNAL_SERVER_ERROR
+    assert not response.isStreamed()
+    assert 'failed rendering the head' in response.content
+
+
+def test_streamedPageBodyErrorsAreReported():
+    response = StreamedPage().handleRequest(Request(method='GET', fields={'failBody': '1'}))
+    assert response.isStreamed()
+    content = response.fullContent()
+    assert content.startswith("<!DOCTYPE html>")
+    assert 'Internal Server Error: failed rendering the body' in content
+
+
+class BundledPage(Page):
+    scriptBundleURL = "?scriptBundle=%s"
+
+
+def test_scriptBundlesAreServedByName():
+    bundle = ScriptBundle.register((Accordion, ))
+    ScriptBundle.bundles.clear()
+
+    response = BundledPage().handleRequest(Request(method='GET', fields={'scriptBundle': bundle.fileName}))
+    assert response.status == Response.Status.OK
+    assert response.contentType == Response.ContentType.JAVASCRIPT
+    assert response['Cache-Control'].startswith('public')
+    assert response.content == bundle.content
+
+    response = BundledPage().handleRequest(Request(method='GET', fields={'scriptBundle': "unknown.js"}))
+    assert response.status == Response.Status.NOT_FOUND
+
+
+class SignUp(TemplateControl):
+    """
+        A form with a single required field - adding its validation on every request
+    """
+    template = UITemplate.fromSHPAML("> box")
+    validateFields = True
+    cacheValidationPlan = True
+    processed = []
+
+    def initUI(self, ui, request):
+        field = ui.addChildElement(TextBox('email'))
+        field.setValue(request.fields.get('email', ''))
+        validation = ui.addChildElement(Validation('emailValidation'))
+        validation.forElement = field
+        validation.addChildElement(NotEmpty())
+
+    def processPost(self, ui, request):
+        self.processed.append(request.fields.get('email'))
+
+
+def test_fieldsAreValidatedThroughACachedPlan(monkeypatch):
+    SignUp.invalidateValidationPlan()
+    control = SignUp()
+    control.handleRequest(Request(method='POST', fields={'email': ''}))
+    assert SignUp.processed == []
+    assert SignUp in TemplateControl._validationPositions
+
+    def walk(cls, element):
+        raise AssertionError("the cached positions should be used")
+    monkeypatch.setattr(ValidationPlan, 'fromElement', classmethod(walk))
+    control.handleRequest(Request(method='POST', fields={'email': 'a@b.c'}))
+    assert SignUp.processed == ['a@b.c']
+
+    SignUp.invalidateValidationPlan()
+    assert SignUp not in TemplateControl._validationPositions
+
+
+class Welcome(TemplateControl):
+    """
+        A control that copies its ui from a prototype built once
+    """
+    template = UITemplate.fromSHPAML("box#welcome\n > label#greeting text=Hello\n")
+    cloneUI = True
+
+    def initUI(self, ui, request):
+        ui.greeting.setText("Hello %s" % request.fields.get('name', ''))
+
+
+def test_uiIsCopiedFromAPrototype():
+    control = Welcome()
+    first = control.buildUI(Request(method='GET'))
+    second = control.buildUI(Request(method='GET'))
+    assert first is not second
+    assert control.prototype() is Welcome().prototype()
+    assert first.toHTML() == control.prototype().element.toHTML()
+
+    assert 'Hello Tim' in Welcome().renderResponse(Request(method='GET', fields={'name': 'Tim'}))
+    assert 'Hello Sue' in Welcome().renderResponse(Request(method='GET', fields={'name': 'Sue'}))
+    assert control.prototype().element.greeting.text() == 'Hello'
+
+
+def test_uiWithPageControlsIsNotCopied():
+    controls = Factory.Factory("Controls")
+    controls.addProduct(Welcome)
+
+    class Page(TemplateControl):
+        template = UITemplate.fromSHPAML("box\n > welcome#inner\n")
+        elementFactory = Factory.Composite((All.Factory, controls))
+        cloneUI = True
+
+    assert Page().prototype() is None
+    first = Page().buildUI(Request(method='GET'))
+    second = Page().buildUI(Request(method='GET'))
+    assert isinstance(first.inner, Welcome)
+    assert first.inner is not second.inner
+
+
+def test_staticPartsOfTheUIAreHoistedWhenSet():
+    class Hoisted(Welcome):
+        template = UITemplate.fromSHPAML("box#welcome\n > label#greeting text=Hello\n box\n  > label text=Static\n")
+        hoistStatic = True
+
+    ui = Hoisted().buildUI(Request(method='GET'))
+    assert type(ui.welcome.childElements[1]) is StaticHTML
+    assert '<div><label>Static</label></div>' in Hoisted().renderResponse(Request(method='GET'))
@@ -0,0 +1,142 @@
+'''
+    test_factory.py
+
+    Tests building trees of elements from templates using WebElements/Factory.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+from WebElements import Display, Layout, UITemplate
+from WebElements.Base import StaticHTML, TemplateElement
+from WebElements.Factory import Composite, Factory
+
+TEMPLATE = """box#form
+ > label#title text=Welcome
+ box
+  > label text=Static
+"""
+
+
+class Title(Display.Label):
+    """
+        A label that renders its text in upper case
+    """
+    __slots__ = ()
+
+    def setText(self, text):
+        Display.Label.setText(self, text.upper())
+
+
+def factory():
+    """
+        Returns a new factory that can build boxes and labels
+    """
+    return Composite((Layout.Factory, Display.Factory))
+
+
+def test_buildFromTemplate():
+    template = UITemplate.fromSHPAML(TEMPLATE)
+    accessors = {}
+    form = factory().buildFromTemplate(template, accessors=accessors)
+    assert form.id == 'form'
+    assert accessors['title'].text() == 'Welcome'
+    assert form.toHTML().endswith('<div><label>Static</label></div></div>')
+
+
+def test_buildersAreKeptOnTheTemplate():
+    template = UITemplate.fromSHPAML(TEMPLATE)
+    first = factory()
+    second = factory()
+    assert first.builder(template) is first.builder(template)
+    assert first.builder(template) is not first.builder(template, hoistStatic=True)
+    assert first.builder(template) is not second.builder(template)
+    assert set(template.builders) == set(((first, False), (first, True), (second, False)))
+
+
+def test_changingProductsCompilesAgain():
+    template = UITemplate.fromSHPAML(TEMPLATE)
+    labels = factory()
+    build = labels.builder(template)
+    assert 'Welcome' in labels.buildFromTemplate(template).toHTML()
+
+    labels.products['label'] = Title
+    assert labels.builder(template) is not build
+    assert 'WELCOME' in labels.buildFromTemplate(template).toHTML()
+
+    build = labels.builder(template)
+    labels.addProduct(Display.Label)
+    assert labels.builder(template) is not build
+    assert 'Welcome' in labels.buildFromTemplate(template).toHTML()
+
+
+def test_emptyFactory():
+    empty = Factory("Empty")
+    empty.addProduct(Layout.Box)
+    assert empty.build('box').toHTML() == '<div></div>'
+    assert 'Invalid Element' in empty.build('label').toHTML()
+
+
+STATIC_TEMPLATE = """box#form
+ > label#title text=Welcome
+ box
+  > label text=Static
+  box
+   > label text=Nested
+ horizontal
+  > label text=Side
+  > label text=BySide
+ box
+  > label key=a.b text=Keyed
+"""
+
+
+def childTypes(element):
+    return [type(child) for child in element.childElements]
+
+
+def test_staticPartsAreOnlyHoistedWhenAsked():
+    template = UITemplate.fromSHPAML(STATIC_TEMPLATE)
+    built = factory().buildFromTemplate(template)
+    assert StaticHTML not in childTypes(built)
+
+    nested = built.childElements[1].childElements[1].childElements[0]
+    nested.addClass('changed')
+    assert '<label class="changed">Nested</label>' in built.toHTML()
+
+
+def test_hoistedStaticPartsRenderTheSame():
+    template = UITemplate.fromSHPAML(STATIC_TEMPLATE)
+    built = factory().buildFromTemplate(template)
+    hoisted = factory().buildFromTemplate(template, hoistStatic=True)
+    assert childTypes(hoisted) == [Display.Label, StaticHTML, Layout.Horizontal, Layout.Box]
+    assert hoisted.toHTML() == built.toHTML()
+    assert hoisted.toHTML(formatted=True) == built.toHTML(formatted=True)
+
+
+def test_childrenOfRewritingParentsAreNotHoisted():
+    template = UITemplate.fromSHPAML(STATIC_TEMPLATE)
+    horizontal = factory().buildFromTemplate(template, hoistStatic=True).childElements[2]
+    assert childTypes(horizontal) == [Display.Label, Display.Label]
+
+
+def test_templateElementsHoistWhenSet():
+    template = UITemplate.fromSHPAML(STATIC_TEMPLATE)
+    assert StaticHTML not in childTypes(TemplateElement(template=template, factory=factory()).form)
+    hoisted = TemplateElement(template=template, factory=factory(), hoistStatic=True)
+    assert StaticHTML in childTypes(hoisted.form)
+    assert hoisted.title.text() == 'Welcome'
@@ -0,0 +1,196 @@
+'''
+    test_iterator_utils.py
+
+    Tests slicing iterable collections and querying lists using WebElements/IteratorUtils.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+import pytest
+
+from WebElements.IteratorUtils import IterableCollection, IterableCollectionList, IterableCollectionSlice, Queryable
+
+
+@pytest.fixture
+def collection():
+    """
+        The numbers 0 through 9 spread across three lists
+    """
+    collection = IterableCollectionList()
+    collection.extend([0, 1, 2])
+    collection.extend([3, 4, 5, 6])
+    collection.extend([7, 8, 9])
+    return collection
+
+
+def test_sliceIsAList(collection):
+    assert collection[2:8] == [2, 3, 4, 5, 6, 7]
+    assert type(collection[2:8]) == list
+    assert collection[:] == list(range(10))
+    assert collection[-5:3] == [0, 1, 2] # negative starts count from the start of the collection
+    assert collection[8:100] == [8, 9]
+    assert collection[6:2] == []
+
+
+def test_slicePairsIdentifiers():
+    collection = IterableCollection()
+    collection.extend(['a', 'b'], 'letters')
+    collection.extend([1, 2], 'numbers')
+    assert collection[1:3] == [('letters', 'b'), ('numbers', 1)]
+    assert list(collection.lazySlice(1, 3)) == [('letters', 'b'), ('numbers', 1)]
+
+
+def test_sliceIsLazy(collection):
+    view = collection.lazySlice(2, 8)
+    assert isinstance(view, IterableCollectionSlice)
+    assert len(view) == 6
+    assert list(view) == [2, 3, 4, 5, 6, 7]
+
+
+def test_sliceIndexes(collection):
+    view = collection.lazySlice(2, 8)
+    assert view[0] == 2
+    assert view[5] == 7
+    assert view[-1] == 7
+    assert view[-6] == 2
+
+    for index in (6, -7):
+        with pytest.raises(IndexError):
+            view[index]
+
+
+def test_sliceOfSlice(collection):
+    view = collection.lazySlice(2, 8)
+    assert isinstance(view[1:3], IterableCollectionSlice)
+    assert list(view[1:3]) == [3, 4]
+    assert list(view[4:100]) == [6, 7]
+    assert list(view[3:1]) == []
+
+
+def test_sliceOfSliceWithNegativeBounds(collection):
+    view = collection.lazySlice(2, 8)
+    assert list(view[-2:]) == [6, 7]
+    assert list(view[:-2]) == [2, 3, 4, 5]
+    assert list(view[1:-1]) == [3, 4, 5, 6]
+    assert list(view[-100:2]) == [2, 3]
+    assert list(view[-1:-3]) == []
+
+
+def test_sliceOfSliceWithStep(collection):
+    view = collection.lazySlice(2, 8)
+    assert view[::2] == [2, 4, 6]
+    assert view[::-1] == [7, 6, 5, 4, 3, 2]
+    assert view[-1:0:-2] == [7, 5, 3]
+
+
+def test_sliceEndsWithCollection(collection):
+    view = collection.lazySlice(7)
+    assert len(view) == 3
+    assert list(view) == [7, 8, 9]
+
+    collection.extend([10])
+    assert list(view) == [7, 8, 9, 10]
+
+
+class Person(object):
+    """
+        A simple model to query
+    """
+    checks = 0
+
+    def __init__(self, name, age, city):
+        self._name = name
+        self.age = age
+        self.address = {'city':city}
+
+    @property
+    def name(self):
+        Person.checks += 1
+        return self._name
+
+    def initials(self):
+        return self._name[0]
+
+    def __repr__(self):
+        return self._name
+
+
+@pytest.fixture
+def people():
+    return Queryable([Person('Tim', 30, 'Boston'), Person('bob', 25, 'Austin'), Person('Sue', 41, 'boston'),
+                      Person('Al', 9, 'Denver')])
+
+
+def names(models):
+    return [model._name for model in models]
+
+
+def test_filter(people):
+    assert names(people.filter(name='Tim')) == ['Tim']
+    assert names(people.filter(name__icontains='B')) == ['bob']
+    assert names(people.filter(age__gte=30, age__lt=40)) == ['Tim']
+    assert names(people.filter(name__in=('Sue', 'Al'))) == ['Sue', 'Al']
+    assert names(people.filter(name__istartswith='S')) == ['Sue']
+    assert names(people.filter(address__city__iexact='BOSTON')) == ['Tim', 'Sue']
+    assert names(people.filter(initials='b')) == ['bob']
+    assert names(people.filter(className='person')) == names(people)
+    assert names(people.exclude(address__city__iexact='boston')) == ['bob', 'Al']
+    assert people.filter() == []
+
+
+def test_filterDictionaries():
+    rows = Queryable([{'name':'Tim', 'age':30}, {'name':'Sue', 'age':41}])
+    assert rows.filter(age__gt=35) == [{'name':'Sue', 'age':41}]
+    assert rows.get(name='Tim') == {'name':'Tim', 'age':30}
+    assert rows.get(name='Bob') is None
+
+
+def test_getStopsAtTheFirstMatch(people):
+    Person.checks = 0
+    assert people.get(name='Tim') is people[0]
+    assert Person.checks == 1
+
+
+def test_orderBy(people):
+    assert names(people.order_by('name')) == ['Al', 'bob', 'Sue', 'Tim']
+    assert names(people.order_by('age')) == ['Al', 'bob', 'Tim', 'Sue']
+    assert names(people.order_by('-age')) == ['Sue', 'Tim', 'bob', 'Al']
+
+    numbered = Queryable([Person('10', 1, ''), Person('9', 2, ''), Person('a', 2, ''), Person('B', 1, '')])
+    assert names(numbered.order_by('name')) == ['9', '10', 'a', 'B'] # digit strings sort numerically
+    assert names(numbered.order_by('-age', 'name')) == ['9', 'a', '10', 'B']
+
+
+def test_indexBy(people):
+    unindexed = Queryable(people)
+    people.indexBy('age', 'name')
+    for query in ({'age':30}, {'name':'Sue'}, {'name':'Nobody'}, {'age':30, 'name':'Tim'}, {'age__gte':30}):
+        assert names(people.filter(**query)) == names(unindexed.filter(**query))
+
+    Person.checks = 0
+    assert names(people.filter(name='Sue')) == ['Sue']
+    assert Person.checks == 1
+
+    people.append(Person('Sue', 50, 'Miami'))
+    assert names(people.filter(name='Sue')) == ['Sue', 'Sue']
+
+
+def test_combine(people):
+    first = Queryable(people[:2])
+    last = Queryable(people[1:])
+    assert names(first & last) == ['bob']
+    assert sorted(names(first | last)) == sorted(names(people))
@@ -0,0 +1,112 @@
+'''
+    test_models_utils.py
+
+    Tests joining and paging through several queries using Models/Utils.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+from Models.Utils import QueryJoin
+from WebElements.PositionController import PositionController
+
+
+class Item(object):
+    """
+        A stored item with a rank and the name of the query it came from
+    """
+    def __init__(self, rank, source):
+        self.rank = rank
+        self.source = source
+
+    def __repr__(self):
+        return "%s%d" % (self.source, self.rank)
+
+
+class Query(object):
+    """
+        Stands in for a datastore query - recording the largest number of items requested from it at once
+    """
+    def __init__(self, source, ranks):
+        self.items = [Item(rank, source) for rank in ranks]
+        self.fetched = 0
+
+    def __getitem__(self, index):
+        if type(index) == slice:
+            self.fetched = max(self.fetched, (index.stop or len(self.items)) - (index.start or 0))
+        return self.items[index]
+
+    def __iter__(self):
+        self.fetched = len(self.items)
+        return iter(self.items)
+
+    def count(self):
+        return len(self.items)
+
+    def order(self, by):
+        self.items.sort(key=lambda item: getattr(item, by.lstrip('-')), reverse=by.startswith('-'))
+
+
+def queries():
+    return [Query('a', [1, 4, 7, 10]), Query('b', [2, 3, 9]), Query('c', [4, 5, 6, 8])]
+
+
+def test_joinWithoutMerging():
+    join = QueryJoin(queries())
+    assert [repr(item) for item in join] == ['a1', 'a4', 'a7', 'a10', 'b2', 'b3', 'b9', 'c4', 'c5', 'c6', 'c8']
+    assert len(join) == 11
+
+
+def test_mergedJoinIsOrdered():
+    join = QueryJoin(queries(), mergeOn='rank')
+    assert [repr(item) for item in join] == ['a1', 'b2', 'b3', 'a4', 'c4', 'c5', 'c6', 'a7', 'c8', 'b9', 'a10']
+    assert repr(join[3]) == 'a4'
+    assert [repr(item) for item in join[2:5]] == ['b3', 'a4', 'c4']
+
+
+def test_orderMergesInEitherDirection():
+    join = QueryJoin([Query('a', [7, 1, 4]), Query('b', [3, 9])])
+    join.order('-rank')
+    assert [item.rank for item in join] == [9, 7, 4, 3, 1]
+
+    join.order('rank')
+    assert [item.rank for item in join] == [1, 3, 4, 7, 9]
+
+
+def test_mergedRangesOnlyFetchWhatIsNeeded():
+    sources = queries()
+    join = QueryJoin(sources, mergeOn='rank')
+    assert [repr(item) for item in join[0:3]] == ['a1', 'b2', 'b3']
+    assert max(source.fetched for source in sources) == 3
+
+
+def test_pageSourceCursors():
+    sources = queries()
+    join = QueryJoin(sources, mergeOn='rank')
+    controller = PositionController(join.pageSource(), itemsPerPage=4)
+    pages = [[repr(item) for item in controller.currentPageItems]]
+    while controller.areMore:
+        for source in sources:
+            source.fetched = 0
+        controller.nextPage()
+        pages.append([repr(item) for item in controller.currentPageItems])
+        assert max(source.fetched for source in sources) <= 4 # the cursor lets each query skip what was used
+
+    assert pages == [['a1', 'b2', 'b3', 'a4'], ['c4', 'c5', 'c6', 'a7'], ['c8', 'b9', 'a10']]
+
+    controller.setIndex(4)
+    assert [repr(item) for item in controller.currentPageItems] == ['c4', 'c5', 'c6', 'a7']
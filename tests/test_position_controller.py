@@ -0,0 +1,178 @@
+'''
+    test_position_controller.py
+
+    Tests paging through lists and page sources using WebElements/PositionController.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+from WebElements.Navigation import ItemPager
+from WebElements.PositionController import PageSource, PositionController
+
+
+class UncountedSource(PageSource):
+    """
+        A page source that can not tell how many items it holds (like a large query) - recording every page requested
+    """
+    def __init__(self, items):
+        PageSource.__init__(self, items)
+        self.requests = []
+
+    def page(self, offset, limit, cursor=None):
+        self.requests.append((offset, limit, cursor))
+        return (self.items[offset:offset + limit], "cursor%d" % (offset + limit), None)
+
+    def count(self):
+        return (None, False)
+
+
+def test_firstPage():
+    controller = PositionController(list(range(100)), itemsPerPage=10)
+    assert controller.currentPageItems == list(range(10))
+    assert controller.numberOfPages == 10
+    assert controller.lastPageIndex == 90
+    assert controller.areMore
+    assert not controller.arePrev
+    assert controller.nextPageIndex == 10
+    assert controller.prevPageIndex == 0
+    assert controller.pageNumber == 1
+
+
+def test_lastPage():
+    controller = PositionController(list(range(95)), startIndex=90, itemsPerPage=10)
+    assert controller.currentPageItems == list(range(90, 95))
+    assert controller.numberOfPages == 10
+    assert not controller.areMore
+    assert controller.arePrev
+    assert controller.nextPageIndex == 95
+    assert controller.prevPageIndex == 80
+    assert controller.pageNumber == 10
+
+
+def test_indexPastTheEndStartsOver():
+    controller = PositionController(list(range(20)), startIndex=500, itemsPerPage=10)
+    assert controller.startIndex == 0
+    assert controller.currentPageItems == list(range(10))
+
+
+def test_empty():
+    controller = PositionController([], itemsPerPage=10)
+    assert controller.empty
+    assert controller.pageNumber == 0
+    assert controller.numberOfPages == 0
+    assert controller.currentPageItems == []
+    assert not controller.areMore
+    assert not controller.arePrev
+
+
+def test_setPageIsLimitedToExistingPages():
+    controller = PositionController(list(range(30)), itemsPerPage=10)
+    controller.setPage(7)
+    assert controller.startIndex == 20
+
+    controller.setPage(-1)
+    assert controller.startIndex == 0
+
+
+def test_pageList():
+    controller = PositionController(list(range(1000)), startIndex=500, itemsPerPage=10, pagesShownAtOnce=5)
+    assert controller.pageList() == [480, 490, 500, 510, 520]
+
+    controller.setIndex(0)
+    assert controller.pageList() == [0, 10, 20, 30, 40]
+
+    controller.setIndex(990)
+    assert controller.pageList() == [950, 960, 970, 980, 990]
+
+
+def test_uncountedSourceOnlyKnowsOfTheNextPage():
+    source = UncountedSource(list(range(35)))
+    controller = PositionController(source, itemsPerPage=10)
+    assert controller.currentPageItems == list(range(10))
+    assert not controller.exactLength
+    assert controller.length == 11
+    assert controller.areMore
+
+    while controller.areMore:
+        controller.nextPage()
+
+    assert controller.currentPageItems == list(range(30, 35))
+    assert controller.exactLength
+    assert controller.length == 35
+
+
+def test_uncountedSourcePassesCursorsForward():
+    source = UncountedSource(list(range(35)))
+    controller = PositionController(source, itemsPerPage=10)
+    controller.nextPage()
+    assert source.requests[-1] == (10, 10, "cursor10")
+
+    controller.prevPage()
+    assert source.requests[-1] == (0, 10, None)
+
+
+def test_uncountedSourceIndexPastTheEndSettlesOnTheLastPage():
+    source = UncountedSource(list(range(25)))
+    controller = PositionController(source, startIndex=100, itemsPerPage=10, cursor="stale")
+    assert controller.startIndex == 20
+    assert controller.currentPageItems == list(range(20, 25))
+    assert controller.cursor is None
+    assert controller.exactLength
+    assert controller.length == 25
+    assert not controller.areMore
+
+    requestsMade = len(source.requests)
+    controller.setIndex(controller.nextPageIndex)
+    assert len(source.requests) == requestsMade + 1
+
+
+def test_pagesOfExactlyItemsPerPage():
+    controller = PositionController(list(range(30)), itemsPerPage=10)
+    assert controller.numberOfPages == 3
+    assert controller.lastPageIndex == 20
+    assert controller.allPages == [0, 10, 20]
+
+    controller.setPage(2)
+    assert controller.currentPageItems == list(range(20, 30))
+    assert not controller.areMore
+
+
+def test_partlyFilledLastPageIsAPage():
+    controller = PositionController(list(range(31)), itemsPerPage=10)
+    assert controller.numberOfPages == 4
+    assert controller.lastPageIndex == 30
+    assert controller.allPages == [0, 10, 20, 30]
+
+    controller.setPage(3)
+    assert controller.currentPageItems == [30]
+
+    single = PositionController(list(range(5)), itemsPerPage=10)
+    assert (single.numberOfPages, single.lastPageIndex, single.allPages) == (1, 0, [0])
+
+
+def test_pageCountsAreAttributes():
+    controller = PositionController(list(range(25)), itemsPerPage=10)
+    assert type(controller.numberOfPages) == int
+    assert type(controller.lastPageIndex) == int
+    assert vars(controller)['numberOfPages'] == 3
+
+
+def test_itemPagerLinksToThePartlyFilledLastPage():
+    pager = ItemPager('pager')
+    pager.itemsPerPage = 10
+    pager.setItems(list(range(95)))
+    assert "WebElements.get('pagerIndex').value = '90'" in pager.toHTML()
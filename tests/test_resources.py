@@ -0,0 +1,121 @@
+'''
+    test_resources.py
+
+    Tests collecting scripts in ScriptContainers and bundling the javascript of element classes
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+import pytest
+
+from WebElements import ClientSide
+from WebElements.Containers import Accordion
+from WebElements.Display import Label
+from WebElements.Fields import Filter
+from WebElements.Layout import Box
+from WebElements.Resources import ScriptBundle, ScriptContainer
+
+
+@pytest.fixture
+def container():
+    """
+        A script container that bundles the jsFunctions of the classes used within it
+    """
+    container = ScriptContainer()
+    container.bundleURL = "/bundles/%s"
+    container.addJSFunctions(Label)
+    container.addJSFunctions(Filter)
+    container.addJSFunctions(Accordion)
+    container.addScript("start();")
+    return container
+
+
+def test_scriptsKeepTheirFirstPosition():
+    container = ScriptContainer()
+    for script in ("a();", "b();", "a();", "c();", "b();"):
+        container.addScript(script)
+
+    assert container.content() == "a();;b();;c();"
+
+    container.removeScript("b();")
+    container.removeScript("missing();")
+    assert container.content() == "a();;c();"
+
+
+def test_scriptsAreWrittenFragmentByFragment():
+    container = ScriptContainer()
+    script = ClientSide.Script("a()", container)
+    script(ClientSide.Script("b()"))
+    container.addScript(script)
+    container.addScript("c();")
+    assert list(container.contentFragments()) == ["a()", ";", "b()", ";", "c();"]
+    assert script.fragments() == ["a()", ";", "b()"]
+
+    page = Box()
+    page.addChildElement(container)
+    assert page.toHTML() == '<div><script language="javascript" type="text/javascript">a();b();c();</script></div>'
+    assert "a();b();c();" in page.toHTML(formatted=True)
+
+    script.claim()
+    assert container.content() == "c();"
+
+
+def test_functionsAreInlinedWithoutABundleURL():
+    container = ScriptContainer()
+    container.addJSFunctions(Accordion)
+    assert container.bundle() is None
+    assert "function toggleAccordion" in container.content()
+
+
+def test_bundleIsReferencedInsteadOfInlined(container):
+    bundle = container.bundle()
+    html = container.toHTML()
+    assert html.startswith('<script src="/bundles/%s" type="text/javascript"></script><script' % bundle.fileName)
+    assert "function toggleAccordion" not in html
+    assert "function toggleAccordion" in bundle.content
+    assert "function javascriptAddFilter" in bundle.content
+
+
+def test_bundleIsBuiltOncePerSetOfClasses(container):
+    assert container.bundle() is container.bundle()
+    assert container.bundle().objectTypes == (Accordion, Filter)
+
+
+def test_noBundleWithoutFunctions():
+    container = ScriptContainer()
+    container.bundleURL = "/bundles/%s"
+    container.addJSFunctions(Label)
+    assert container.bundle() is None
+
+
+def test_bundleIsRebuiltFromItsFileName(container):
+    bundle = container.bundle()
+    ScriptBundle.bundles.clear() # as in a process that has not rendered the page
+
+    rebuilt = ScriptBundle.fromFileName(bundle.fileName)
+    assert rebuilt.fileName == bundle.fileName
+    assert rebuilt.content == bundle.content
+
+
+def test_invalidFileNames(container):
+    classNames = container.bundle().fileName.split("-", 1)[1]
+    assert ScriptBundle.fromFileName("0" * 16 + "-" + classNames) is None # content changed since named
+    assert ScriptBundle.fromFileName("abc.js") is None
+    assert ScriptBundle.fromFileName("abc-os:path.js") is None
+    assert ScriptBundle.fromFileName("abc-WebElements.Display:Label.js") is None
+    assert ScriptBundle.fromFileName("abc-not.imported.module:Accordion.js") is None
@@ -0,0 +1,130 @@
+'''
+    test_streaming.py
+
+    Tests rendering element trees as a stream of chunks and returning streamed HTTP responses
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+from DynamicForm.HTTP import Response
+from WebElements import Base
+from WebElements.Display import Label
+from WebElements.Document import Document
+from WebElements.Layout import Box
+
+
+def page(labels=3):
+    """
+        Returns a document with a number of labels in its body
+    """
+    document = Document()
+    for number in range(labels):
+        document.addChildElement(Label()).setText("label %d" % number)
+    return document
+
+
+class FakeDjangoResponse(object):
+    """
+        Records what a django HttpResponse (or StreamingHttpResponse) would be created with
+    """
+    def __init__(self, content, contentType, status):
+        self.content = content
+        self.contentType = contentType
+        self.status = status
+        self.headers = {}
+        self.cookies = []
+
+    def __setitem__(self, header, value):
+        self.headers[header] = value
+
+    def set_cookie(self, *cookie):
+        self.cookies.append(cookie)
+
+
+class FakeStreamingResponse(FakeDjangoResponse):
+    pass
+
+
+def test_iterHTMLMatchesToHTML():
+    box = Box()
+    for number in range(50):
+        box.addChildElement(Label()).setText("label %d" % number)
+
+    assert b"".join(box.iterHTML()) == box.toHTML().encode("utf-8")
+
+
+def test_iterHTMLYieldsChunks(monkeypatch):
+    monkeypatch.setattr(Base.Settings, 'STREAM_CHUNK_SIZE', 64)
+    box = Box()
+    for number in range(50):
+        box.addChildElement(Label()).setText("label %d" % number)
+
+    chunks = list(box.iterHTML())
+    assert len(chunks) > 1
+    assert b"".join(chunks) == box.toHTML().encode("utf-8")
+
+
+def test_documentFlushesTheHead():
+    document = page()
+    chunks = list(document.iterHTML())
+    assert chunks[0].startswith(b"<!DOCTYPE html>")
+    assert chunks[0].endswith(b"</head>")
+    assert b"".join(chunks) == document.toHTML().encode("utf-8")
+
+
+def test_iterHTMLRendersLazily():
+    document = page()
+    label = document.body.childElements[-1]
+    chunks = document.iterHTML()
+    next(chunks)
+    label.setText("changed after the head was sent")
+
+    assert b"changed after the head was sent" in b"".join(chunks)
+
+
+def test_onlyIteratorsAreStreamed():
+    assert not Response(None).isStreamed()
+    assert not Response("content").isStreamed()
+    assert not Response(b"content").isStreamed()
+    assert not Response(["content"]).isStreamed()
+    assert Response(iter([b"content"])).isStreamed()
+    assert Response(page().iterHTML()).isStreamed()
+
+
+def test_fullContentJoinsStreams():
+    response = Response(iter([b"<b>", b"streamed", b"</b>"]))
+    assert response.fullContent() == "<b>streamed</b>"
+    assert not response.isStreamed()
+    assert response.serialize()['responseText'] == "<b>streamed</b>"
+
+
+def test_djangoResponses():
+    response = Response(iter([b"chunk"]))
+    response['X-Test'] = 'yes'
+    converted = response.toDjangoResponse(FakeDjangoResponse, FakeStreamingResponse)
+    assert type(converted) == FakeStreamingResponse
+    assert list(converted.content) == [b"chunk"]
+    assert converted.headers['X-Test'] == 'yes'
+
+    converted = Response("whole").toDjangoResponse(FakeDjangoResponse, FakeStreamingResponse)
+    assert type(converted) == FakeDjangoResponse
+    assert converted.content == "whole"
+
+    converted = Response(iter([b"joined ", b"content"])).toDjangoResponse(FakeDjangoResponse, None)
+    assert type(converted) == FakeDjangoResponse
+    assert converted.content == "joined content"
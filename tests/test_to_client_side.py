@@ -0,0 +1,125 @@
+'''
+    test_to_client_side.py
+
+    Tests the in-process and on-disk caches of python to javascript translation in WebElements/ToClientSide.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+import hashlib
+import inspect
+import os
+
+import pytest
+
+from WebElements import ToClientSide
+from WebElements.ToClientSide import Convert
+
+
+@pytest.fixture
+def translations(monkeypatch, tmpdir):
+    """
+        Starts from empty caches (with the disk cache in a temporary directory) - recording every translation made
+    """
+    made = []
+    translate = ToClientSide.translate
+
+    def countingTranslate(source):
+        made.append(source)
+        return translate(source)
+
+    monkeypatch.setattr(ToClientSide, 'translate', countingTranslate)
+    monkeypatch.setattr(ToClientSide, 'cacheDirectory', str(tmpdir))
+    monkeypatch.setattr(ToClientSide, '_memo', ToClientSide.OrderedDict())
+    monkeypatch.setattr(Convert, 'converted', [])
+    return made
+
+
+def test_convertMatchesTranslate(translations):
+    assert ToClientSide.convert("x = 1\n") == ToClientSide.translate("x = 1\n") == "var x = 1;\n"
+
+
+def test_convertRemembersTranslations(translations):
+    ToClientSide.convert("x = 1\n")
+    ToClientSide.convert("x = 1\n")
+    assert translations == ["x = 1\n"]
+
+    ToClientSide.convert("y = 2\n")
+    assert translations == ["x = 1\n", "y = 2\n"]
+
+
+def test_memoDropsTheLeastRecentlyUsed(translations, monkeypatch):
+    monkeypatch.setattr(ToClientSide, 'MEMO_SIZE', 2)
+    monkeypatch.setattr(ToClientSide, 'cacheDirectory', None)
+    for source in ("a = 1\n", "b = 1\n", "a = 1\n", "c = 1\n"):
+        ToClientSide.convert(source)
+    assert list(ToClientSide._memo) == ["a = 1\n", "c = 1\n"]
+
+    ToClientSide.convert("b = 1\n")
+    assert translations.count("b = 1\n") == 2
+
+
+def test_diskCacheIsSharedAcrossProcesses(translations, monkeypatch, tmpdir):
+    javascript = ToClientSide.convert("x = 1\n")
+    assert tmpdir.join(ToClientSide.cacheKey("x = 1\n") + ".js").read() == javascript
+
+    monkeypatch.setattr(ToClientSide, '_memo', ToClientSide.OrderedDict()) # as a new process would start
+    assert ToClientSide.convert("x = 1\n") == javascript
+    assert translations == ["x = 1\n"]
+
+
+def test_diskCacheIsInvalidatedByANewVersion(translations, monkeypatch):
+    ToClientSide.convert("x = 1\n")
+    monkeypatch.setattr(ToClientSide, '_memo', ToClientSide.OrderedDict())
+    monkeypatch.setattr(ToClientSide, 'VERSION', ToClientSide.VERSION + 1)
+    ToClientSide.convert("x = 1\n")
+    assert translations == ["x = 1\n", "x = 1\n"]
+
+
+def test_unwritableCacheIsIgnored(translations, monkeypatch, tmpdir):
+    notADirectory = tmpdir.join("file")
+    notADirectory.write("")
+    monkeypatch.setattr(ToClientSide, 'cacheDirectory', str(notADirectory))
+    assert ToClientSide.convert("x = 1\n") == "var x = 1;\n"
+    assert ToClientSide.readCache(ToClientSide.cacheKey("x = 1\n")) is None
+
+
+def defined():
+    pass
+
+
+def test_convertedObjectsAreTranslatedOnFirstUse(translations, monkeypatch):
+    monkeypatch.setattr(ToClientSide, 'convert', lambda source: "translated")
+    converted = Convert(defined)
+    assert converted in Convert.converted
+    assert str(converted) == "translated"
+
+
+def test_convertedObjectsAreFoundWithoutTheirSource(translations, monkeypatch):
+    monkeypatch.setattr(ToClientSide, 'convert', lambda source: "translated")
+    str(Convert(defined))
+
+    with open(inspect.getsourcefile(defined), 'rb') as sourceFile:
+        sourceHash = hashlib.sha1(sourceFile.read()).hexdigest()
+    sourceKey = Convert(defined).sourceKey()
+    assert sourceKey == ToClientSide.cacheKey(__name__, 'defined', sourceHash)
+    assert os.path.exists(os.path.join(ToClientSide.cacheDirectory, sourceKey + ".js"))
+
+    def getsource(obj):
+        raise AssertionError("the source should not be read")
+    monkeypatch.setattr(inspect, 'getsource', getsource)
+    assert str(Convert(defined)) == "translated"
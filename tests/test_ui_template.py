@@ -0,0 +1,103 @@
+'''
+    test_ui_template.py
+
+    Tests compiling templates and caching them on disk using WebElements/UITemplate.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+
+import os
+
+import pytest
+
+from WebElements import UITemplate
+
+SOURCE = """box#form
+ > textbox#name
+ > button#save text=Save
+"""
+
+
+@pytest.fixture
+def cache(tmpdir, monkeypatch):
+    """
+        Points the template disk cache at an empty directory
+    """
+    directory = tmpdir.mkdir('cache')
+    monkeypatch.setattr(UITemplate, 'cacheDirectory', str(directory))
+    return directory
+
+
+def writeTemplate(directory, name, source=SOURCE):
+    """
+        Writes source to a template file called name within directory
+    """
+    templateFile = directory.join(name)
+    templateFile.write(source)
+    return str(templateFile)
+
+
+def test_compile():
+    template = UITemplate.fromSHPAML(SOURCE)
+    assert (template.create, template.id) == ('box', 'form')
+    assert [(child.create, child.id) for child in template.childElements] == [('textbox', 'name'), ('button', 'save')]
+    assert template == UITemplate.compileTemplate(SOURCE)
+
+
+def test_noKeyIsComputedWithoutACache(monkeypatch):
+    monkeypatch.setattr(UITemplate, 'cacheDirectory', None)
+    monkeypatch.setattr(UITemplate, 'cacheKey', lambda *parts: pytest.fail("hashed without a cache"))
+    assert UITemplate.fromSHPAML(SOURCE) == UITemplate.compileTemplate(SOURCE)
+
+
+def test_cachedTemplatesAreReused(cache, tmpdir, monkeypatch):
+    templateFile = writeTemplate(tmpdir, 'form.wui')
+    template = UITemplate.fromFile(templateFile)
+    assert len(cache.listdir()) == 1
+
+    monkeypatch.setattr(UITemplate, 'compileTemplate', lambda *args: pytest.fail("compiled a cached template"))
+    assert UITemplate.fromFile(templateFile) == template
+    assert UITemplate.fromSHPAML(SOURCE) == template
+
+
+def test_cacheIsKeyedOnContent(cache, tmpdir):
+    template = UITemplate.fromFile(writeTemplate(tmpdir, 'form.wui'))
+    copy = writeTemplate(tmpdir.mkdir('deployed'), 'form.wui')
+    os.utime(copy, (0, 0))
+    assert UITemplate.fromFile(copy) == template
+    assert len(cache.listdir()) == 1
+
+    changed = UITemplate.fromFile(writeTemplate(tmpdir, 'form.wui', SOURCE.replace('Save', 'Send')))
+    assert changed.childElements[1].properties == (('text', 'Send'), )
+    assert len(cache.listdir()) == 2
+
+
+def test_brokenEntriesAreCompiledAgain(cache):
+    template = UITemplate.fromSHPAML(SOURCE)
+    for garbage in (b"", b"not a pickle", b"\x80\x02cmissing.module\nTemplate\nq\x00."):
+        cache.listdir()[0].write(garbage, mode='wb')
+        assert UITemplate.fromSHPAML(SOURCE) == template
+
+
+def test_build(cache, tmpdir):
+    app = tmpdir.mkdir('app')
+    writeTemplate(app, 'form.wui')
+    writeTemplate(app.mkdir('views'), 'other.wui', "> box#other")
+    writeTemplate(app, 'readme.txt', "not a template")
+    assert UITemplate.build(str(cache), (str(app), )) == 2
+    assert len(cache.listdir()) == 2
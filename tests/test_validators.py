@@ -0,0 +1,143 @@
+'''
+    test_validators.py
+
+    Tests collecting and running every validation of an element tree using the ValidationPlan in
+    WebElements/Validators.py
+
+    Copyright (C) 2013  Timothy Edmund Crosley
+
+    This program is free software; you can redistribute it and/or
+    modify it under the terms of the GNU General Public License
+    as published by the Free Software Foundation; either version 2
+    of the License, or (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program; if not, write to the Free Software
+    Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+'''
+
+from WebElements.Inputs import TextBox
+from WebElements.Layout import Box
+from WebElements.Validators import Int, NotEmpty, Validation, ValidationPlan
+
+
+def addField(form, fieldId, *validators):
+    """
+        Adds a text box to form along with a validation of it made up of validators
+    """
+    field = form.addChildElement(TextBox(fieldId))
+    validation = Validation(fieldId)
+    validation.forElement = field
+    for validator in validators:
+        validation.addChildElement(validator)
+    form.addChildElement(validation)
+    return field, validation
+
+
+def test_planCollectsEveryValidation():
+    form = Box('form')
+    addField(form, 'age', NotEmpty(), Int())
+    section = form.addChildElement(Box('section'))
+    addField(section, 'count', Int())
+
+    plan = ValidationPlan.fromElement(form)
+    assert [fieldId for fieldId, validation, required in plan.entries] == ['age', 'count']
+    assert plan.requiredFields() == ['age']
+
+
+def test_planIgnoresValidationsWithoutAField():
+    form = Box('form')
+    form.addChildElement(Validation()).addChildElement(NotEmpty())
+    assert ValidationPlan.fromElement(form).entries == []
+
+
+def test_planValidates():
+    form = Box('form')
+    age, ageValidation = addField(form, 'age', NotEmpty(), Int())
+    count, countValidation = addField(form, 'count', Int())
+    plan = ValidationPlan.fromElement(form)
+
+    assert plan.validate() == {'age': ('error', 'Please enter a value')}
+    assert not plan.valid()
+
+    age.setValue('old')
+    count.setValue('many')
+    assert plan.validate() == {'age': ('error', 'Please enter an integer value'),
+                               'count': ('error', 'Please enter an integer value')}
+
+    age.setValue('30')
+    count.setValue('')
+    assert plan.valid()
+
+
+def test_planIncludesValidationsAddedLater():
+    form = Box('form')
+    addField(form, 'age', Int())
+    assert ValidationPlan.fromElement(form).requiredFields() == []
+
+    addField(form, 'name', NotEmpty())
+    assert ValidationPlan.fromElement(form).requiredFields() == ['name']
+    assert ValidationPlan.fromElement(form).validate() == {'name': ('error', 'Please enter a value')}
+
+
+def test_chainFollowsChanges():
+    form = Box('form')
+    field, validation = addField(form, 'age', Int())
+    assert ValidationPlan.fromElement(form).requiredFields() == []
+
+    validation.addChildElement(NotEmpty())
+    assert ValidationPlan.fromElement(form).requiredFields() == ['age']
+
+    assert [type(validator) for validator in validation.chain()] == [Int, NotEmpty]
+
+    validation.removeChild(validation.chain()[0])
+    assert [type(validator) for validator in validation.chain()] == [NotEmpty]
+
+
+def test_planFromPositions():
+    def form():
+        form = Box('form')
+        addField(form, 'age', NotEmpty(), Int())
+        section = form.addChildElement(Box('section'))
+        addField(section, 'count', Int())
+        return form
+
+    first = form()
+    positions = ValidationPlan.fromElement(first).positions(first)
+    second = form()
+    plan = ValidationPlan.fromPositions(second, positions)
+    assert [fieldId for fieldId, validation, required in plan.entries] == ['age', 'count']
+    assert plan.entries[1][1] is second.childElements[2].childElements[1]
+    assert plan.validate() == {'age': ('error', 'Please enter a value')}
+
+    changed = form()
+    changed.removeChild(changed.childElements[1])
+    assert ValidationPlan.fromPositions(changed, positions) is None
+
+
+def test_clientScriptOnlySubstitutesIds():
+    Validation._scriptTemplates.clear()
+    form = Box('form')
+    addField(form, 'field', NotEmpty())
+    field, validation = addField(form, 'beta', NotEmpty())
+
+    form.childElements[1].clientScript() # caches the template while a field id matches the scripts own "field" key
+    script = validation.clientScript()
+    assert len(Validation._scriptTemplates) == 1
+    assert '{"field":value' in script
+    assert '"beta"' in script and '"betaMessage"' in script
+    assert '"field"' not in script.replace('{"field":value', '')
+
+
+def test_clientScriptEscapesIds():
+    Validation._scriptTemplates.clear()
+    form = Box('form')
+    form.setPrefix('a"b-')
+    field, validation = addField(form, 'age', Int())
+
+    assert 'WebElements.getValue("a\\"b-age")' in validation.clientScript()